@@ -0,0 +1,696 @@
+"""Offline benchmarks against a local YNAB stand-in server.
+
+Starts an HTTP server on 127.0.0.1 that serves a YNAB-shaped OpenAPI spec and
+large generated fixtures, points `create_server` at it and measures:
+
+- import time of `ynab_mcp_server.server` (fresh interpreter)
+- `create_server` cold (no spec cache) and warm (304 + compiled spec artifact)
+- `list_tools` latency
+- per-call overhead: a tiny tool call vs. the same raw httpx request
+- a large `get_transactions` call (10k-100k transactions)
+- peak traced memory of startup and of the large call (tracemalloc, separate pass)
+
+No network access is needed. Use `--json` to save results and `--baseline` to
+fail (exit 1) when a metric regresses beyond `--tolerance`:
+
+    python scripts/bench.py --transactions 100000 --json bench.json
+    python scripts/bench.py --baseline bench.json --tolerance 0.25
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+# Benchmark the production OpenAPI parser: fastmcp reads this at import time
+os.environ.setdefault("FASTMCP_EXPERIMENTAL_ENABLE_NEW_OPENAPI_PARSER", "true")
+
+import httpx  # noqa: E402
+from fastmcp import Client  # noqa: E402
+
+from ynab_mcp_server.server import create_server  # noqa: E402
+
+# (method, path, operationId, tag, response data key or None)
+OPERATIONS: list[tuple[str, str, str, str, str | None]] = [
+    ("get", "/user", "getUser", "User", "user"),
+    ("get", "/budgets", "getBudgets", "Budgets", "budgets"),
+    ("get", "/budgets/{budget_id}", "getBudgetById", "Budgets", "budget"),
+    ("get", "/budgets/{budget_id}/settings", "getBudgetSettingsById", "Budgets", "settings"),
+    ("get", "/budgets/{budget_id}/accounts", "getAccounts", "Accounts", "accounts"),
+    ("post", "/budgets/{budget_id}/accounts", "createAccount", "Accounts", "account"),
+    ("get", "/budgets/{budget_id}/accounts/{account_id}", "getAccountById", "Accounts", "account"),
+    ("get", "/budgets/{budget_id}/categories", "getCategories", "Categories", "category_groups"),
+    (
+        "get",
+        "/budgets/{budget_id}/categories/{category_id}",
+        "getCategoryById",
+        "Categories",
+        "category",
+    ),
+    (
+        "patch",
+        "/budgets/{budget_id}/categories/{category_id}",
+        "updateCategory",
+        "Categories",
+        "category",
+    ),
+    (
+        "get",
+        "/budgets/{budget_id}/months/{month}/categories/{category_id}",
+        "getMonthCategoryById",
+        "Categories",
+        "category",
+    ),
+    (
+        "patch",
+        "/budgets/{budget_id}/months/{month}/categories/{category_id}",
+        "updateMonthCategory",
+        "Categories",
+        "category",
+    ),
+    ("get", "/budgets/{budget_id}/payees", "getPayees", "Payees", "payees"),
+    ("get", "/budgets/{budget_id}/payees/{payee_id}", "getPayeeById", "Payees", "payee"),
+    ("patch", "/budgets/{budget_id}/payees/{payee_id}", "updatePayee", "Payees", "payee"),
+    (
+        "get",
+        "/budgets/{budget_id}/payee_locations",
+        "getPayeeLocations",
+        "Payee Locations",
+        "payee_locations",
+    ),
+    (
+        "get",
+        "/budgets/{budget_id}/payees/{payee_id}/payee_locations",
+        "getPayeeLocationsByPayee",
+        "Payee Locations",
+        "payee_locations",
+    ),
+    ("get", "/budgets/{budget_id}/months", "getBudgetMonths", "Months", "months"),
+    ("get", "/budgets/{budget_id}/months/{month}", "getBudgetMonth", "Months", "month"),
+    ("get", "/budgets/{budget_id}/transactions", "getTransactions", "Transactions", "transactions"),
+    (
+        "post",
+        "/budgets/{budget_id}/transactions",
+        "createTransaction",
+        "Transactions",
+        "transactions",
+    ),
+    (
+        "patch",
+        "/budgets/{budget_id}/transactions",
+        "updateTransactions",
+        "Transactions",
+        "transactions",
+    ),
+    (
+        "post",
+        "/budgets/{budget_id}/transactions/import",
+        "importTransactions",
+        "Transactions",
+        "transaction_ids",
+    ),
+    (
+        "get",
+        "/budgets/{budget_id}/transactions/{transaction_id}",
+        "getTransactionById",
+        "Transactions",
+        "transaction",
+    ),
+    (
+        "put",
+        "/budgets/{budget_id}/transactions/{transaction_id}",
+        "updateTransaction",
+        "Transactions",
+        "transaction",
+    ),
+    (
+        "delete",
+        "/budgets/{budget_id}/transactions/{transaction_id}",
+        "deleteTransaction",
+        "Transactions",
+        "transaction",
+    ),
+    (
+        "get",
+        "/budgets/{budget_id}/accounts/{account_id}/transactions",
+        "getTransactionsByAccount",
+        "Transactions",
+        "transactions",
+    ),
+    (
+        "get",
+        "/budgets/{budget_id}/categories/{category_id}/transactions",
+        "getTransactionsByCategory",
+        "Transactions",
+        "transactions",
+    ),
+    (
+        "get",
+        "/budgets/{budget_id}/payees/{payee_id}/transactions",
+        "getTransactionsByPayee",
+        "Transactions",
+        "transactions",
+    ),
+    (
+        "get",
+        "/budgets/{budget_id}/months/{month}/transactions",
+        "getTransactionsByMonth",
+        "Transactions",
+        "transactions",
+    ),
+    (
+        "get",
+        "/budgets/{budget_id}/scheduled_transactions",
+        "getScheduledTransactions",
+        "Scheduled Transactions",
+        "scheduled_transactions",
+    ),
+    (
+        "post",
+        "/budgets/{budget_id}/scheduled_transactions",
+        "createScheduledTransaction",
+        "Scheduled Transactions",
+        "scheduled_transaction",
+    ),
+    (
+        "get",
+        "/budgets/{budget_id}/scheduled_transactions/{scheduled_transaction_id}",
+        "getScheduledTransactionById",
+        "Scheduled Transactions",
+        "scheduled_transaction",
+    ),
+    (
+        "put",
+        "/budgets/{budget_id}/scheduled_transactions/{scheduled_transaction_id}",
+        "updateScheduledTransaction",
+        "Scheduled Transactions",
+        "scheduled_transaction",
+    ),
+    (
+        "delete",
+        "/budgets/{budget_id}/scheduled_transactions/{scheduled_transaction_id}",
+        "deleteScheduledTransaction",
+        "Scheduled Transactions",
+        "scheduled_transaction",
+    ),
+]
+
+_STR = {"type": "string"}
+_NULLABLE_STR = {"type": "string", "nullable": True}
+_INT = {"type": "integer", "format": "int64"}
+_BOOL = {"type": "boolean"}
+
+# Inlined: FastMCP 2.12 drops $defs reached only through another $ref from
+# generated output schemas
+_SUBTRANSACTION = {
+    "type": "object",
+    "required": ["id", "transaction_id", "amount", "deleted"],
+    "properties": {
+        "id": _STR,
+        "transaction_id": _STR,
+        "amount": {**_INT, "description": "The amount in milliunits format"},
+        "memo": _NULLABLE_STR,
+        "payee_id": _NULLABLE_STR,
+        "payee_name": _NULLABLE_STR,
+        "category_id": _NULLABLE_STR,
+        "category_name": _NULLABLE_STR,
+        "transfer_account_id": _NULLABLE_STR,
+        "deleted": _BOOL,
+    },
+}
+
+SCHEMAS: dict[str, Any] = {
+    "TransactionDetail": {
+        "type": "object",
+        "required": ["id", "date", "amount", "cleared", "approved", "account_id", "deleted"],
+        "properties": {
+            "id": _STR,
+            "date": {"type": "string", "format": "date"},
+            "amount": {**_INT, "description": "The transaction amount in milliunits format"},
+            "memo": _NULLABLE_STR,
+            "cleared": {"type": "string", "enum": ["cleared", "uncleared", "reconciled"]},
+            "approved": _BOOL,
+            "flag_color": {**_NULLABLE_STR, "enum": ["red", "orange", "yellow", None]},
+            "account_id": _STR,
+            "account_name": _STR,
+            "payee_id": _NULLABLE_STR,
+            "payee_name": _NULLABLE_STR,
+            "category_id": _NULLABLE_STR,
+            "category_name": _NULLABLE_STR,
+            "transfer_account_id": _NULLABLE_STR,
+            "import_id": _NULLABLE_STR,
+            "deleted": _BOOL,
+            "subtransactions": {
+                "type": "array",
+                "items": _SUBTRANSACTION,
+            },
+        },
+    },
+    "Entity": {
+        "type": "object",
+        "required": ["id"],
+        "properties": {
+            "id": _STR,
+            "name": _STR,
+            "deleted": _BOOL,
+            "note": _NULLABLE_STR,
+            "balance": _INT,
+        },
+    },
+    "ErrorResponse": {
+        "type": "object",
+        "properties": {
+            "error": {
+                "type": "object",
+                "properties": {"id": _STR, "name": _STR, "detail": _STR},
+            }
+        },
+    },
+}
+
+# Path parameters and their schemas
+_PARAMS = {
+    "budget_id": "The id of the budget. 'last-used' can be used to specify the last used budget",
+    "account_id": "The id of the account",
+    "category_id": "The id of the category",
+    "payee_id": "The id of the payee",
+    "month": "The budget month in ISO format (e.g. 2016-12-01)",
+    "transaction_id": "The id of the transaction",
+    "scheduled_transaction_id": "The id of the scheduled transaction",
+}
+_QUERY = [
+    {
+        "name": "since_date",
+        "in": "query",
+        "description": "If specified, only transactions on or after this date will be included.",
+        "schema": {"type": "string", "format": "date"},
+    },
+    {
+        "name": "last_knowledge_of_server",
+        "in": "query",
+        "description": "The starting server knowledge. If provided, only entities that have "
+        "changed since last_knowledge_of_server will be included.",
+        "schema": _INT,
+    },
+]
+
+
+def synthetic_spec(server_url: str) -> dict[str, Any]:
+    """A YNAB-shaped OpenAPI 3 document covering the v1 endpoints."""
+    paths: dict[str, Any] = {}
+    for method, path, operation_id, tag, key in OPERATIONS:
+        item = paths.setdefault(path, {})
+        names = re.findall(r"{(\w+)}", path)
+        if names and "parameters" not in item:
+            item["parameters"] = [
+                {
+                    "name": n,
+                    "in": "path",
+                    "required": True,
+                    "description": _PARAMS[n],
+                    "schema": _STR,
+                }
+                for n in names
+            ]
+        if key in ("transactions", "scheduled_transactions"):
+            value: dict[str, Any] = {
+                "type": "array",
+                "items": {"$ref": "#/components/schemas/TransactionDetail"},
+            }
+        elif key and key.endswith("s"):
+            value = {"type": "array", "items": {"$ref": "#/components/schemas/Entity"}}
+        else:
+            value = {"$ref": "#/components/schemas/Entity"}
+        data = {"type": "object", "properties": {key or "result": value, "server_knowledge": _INT}}
+        operation: dict[str, Any] = {
+            "operationId": operation_id,
+            "tags": [tag],
+            "summary": f"{operation_id} ({tag})",
+            "description": f"Synthetic stand-in for YNAB's {operation_id} endpoint.",
+            "responses": {
+                "200": {
+                    "description": "Success",
+                    "content": {
+                        "application/json": {
+                            "schema": {
+                                "type": "object",
+                                "required": ["data"],
+                                "properties": {"data": data},
+                            }
+                        }
+                    },
+                },
+                "default": {
+                    "description": "An error occurred",
+                    "content": {
+                        "application/json": {
+                            "schema": {"$ref": "#/components/schemas/ErrorResponse"}
+                        }
+                    },
+                },
+            },
+        }
+        if method == "get" and key == "transactions":
+            operation["parameters"] = _QUERY
+        if method in ("post", "put", "patch"):
+            operation["requestBody"] = {
+                "required": True,
+                "content": {
+                    "application/json": {
+                        "schema": {
+                            "type": "object",
+                            "properties": {
+                                (key or "data").rstrip("s"): {
+                                    "$ref": "#/components/schemas/TransactionDetail"
+                                }
+                            },
+                        }
+                    }
+                },
+            }
+        item[method] = operation
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "YNAB API (benchmark stand-in)", "version": "1.0.0"},
+        "servers": [{"url": server_url}],
+        "security": [{"bearer": []}],
+        "paths": paths,
+        "components": {
+            "securitySchemes": {"bearer": {"type": "http", "scheme": "bearer"}},
+            "schemas": SCHEMAS,
+        },
+    }
+
+
+def synthetic_transactions(count: int, *, seed: int = 1) -> list[dict[str, Any]]:
+    """Realistic-looking transactions, including nulls and occasional splits."""
+    rng = random.Random(seed)
+    accounts = [(f"acct-{i}", f"Account {i}") for i in range(8)]
+    payees = [(f"payee-{i}", f"Payee {i} Store") for i in range(400)]
+    categories = [(f"cat-{i}", f"Category {i}") for i in range(60)]
+    transactions = []
+    for i in range(count):
+        account = rng.choice(accounts)
+        payee = rng.choice(payees)
+        category = rng.choice(categories)
+        txn: dict[str, Any] = {
+            "id": f"txn-{i:08d}",
+            "date": f"20{20 + i % 5}-{1 + i % 12:02d}-{1 + i % 28:02d}",
+            "amount": -rng.randrange(100, 500_000, 10),
+            "memo": rng.choice([None, "", "groceries", "monthly subscription", "split bill"]),
+            "cleared": rng.choice(["cleared", "uncleared", "reconciled"]),
+            "approved": True,
+            "flag_color": rng.choice([None, None, None, "red"]),
+            "account_id": account[0],
+            "account_name": account[1],
+            "payee_id": payee[0],
+            "payee_name": payee[1],
+            "category_id": category[0],
+            "category_name": category[1],
+            "transfer_account_id": None,
+            "transfer_transaction_id": None,
+            "matched_transaction_id": None,
+            "import_id": None,
+            "import_payee_name": None,
+            "debt_transaction_type": None,
+            "deleted": False,
+            "subtransactions": [],
+        }
+        if i % 50 == 0:
+            half = txn["amount"] // 2
+            txn["subtransactions"] = [
+                {
+                    "id": f"sub-{i}-{j}",
+                    "transaction_id": txn["id"],
+                    "amount": amount,
+                    "memo": None,
+                    "payee_id": None,
+                    "payee_name": None,
+                    "category_id": rng.choice(categories)[0],
+                    "category_name": None,
+                    "transfer_account_id": None,
+                    "deleted": False,
+                }
+                for j, amount in enumerate((half, txn["amount"] - half))
+            ]
+        transactions.append(txn)
+    return transactions
+
+
+class StandIn:
+    """A local YNAB API stand-in on 127.0.0.1 with pre-encoded responses."""
+
+    def __init__(self, *, transactions: int, spec_text: str | None = None) -> None:
+        self.requests = 0
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        host, port = self._server.server_address[:2]
+        self.url = f"http://{host}:{port}"
+        spec = spec_text or json.dumps(synthetic_spec(f"{self.url}/v1"))
+        self.spec = spec.encode("utf-8")
+        self.spec_etag = '"' + hashlib.sha256(self.spec).hexdigest()[:16] + '"'
+        knowledge = 1000 + transactions
+        entities = [
+            {"id": f"id-{i}", "name": f"Entity {i}", "deleted": False, "balance": i * 1000}
+            for i in range(50)
+        ]
+
+        def _body(data: dict[str, Any]) -> bytes:
+            return json.dumps({"data": data}).encode("utf-8")
+
+        self.transactions = _body(
+            {"transactions": synthetic_transactions(transactions), "server_knowledge": knowledge}
+        )
+        self.delta = _body({"transactions": [], "server_knowledge": knowledge})
+        self.bodies = {
+            "user": _body({"user": {"id": "bench-user"}}),
+            "budgets": _body(
+                {"budgets": [{"id": "b1", "name": "Bench"}], "default_budget": None}
+            ),
+            "list": _body({"accounts": entities, "payees": entities, "server_knowledge": 1}),
+            "object": _body({"result": {"id": "x", "name": "X"}}),
+        }
+
+    def _route(self, method: str, path: str, query: dict[str, list[str]]) -> bytes:
+        if path == "/v1/user":
+            return self.bodies["user"]
+        if path == "/v1/budgets":
+            return self.bodies["budgets"]
+        if method == "GET" and path.endswith("/transactions"):
+            return self.delta if "last_knowledge_of_server" in query else self.transactions
+        if method == "GET" and re.search(r"/(accounts|payees|categories|months)$", path):
+            return self.bodies["list"]
+        return self.bodies["object"]
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Send headers and body in one segment; avoids delayed-ACK stalls
+            disable_nagle_algorithm = True
+            wbufsize = 1 << 16
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+            def _send(self, status: int, body: bytes, headers: dict[str, str] | None = None):
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("X-Rate-Limit", f"{standin.requests % 200}/200")
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                if self.command != "HEAD":
+                    self.wfile.write(body)
+
+            def _handle(self) -> None:
+                standin.requests += 1
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    self.rfile.read(length)
+                url = urlsplit(self.path)
+                if url.path == "/openapi.json":
+                    if self.headers.get("If-None-Match") == standin.spec_etag:
+                        self._send(304, b"", {"ETag": standin.spec_etag})
+                    else:
+                        self._send(200, standin.spec, {"ETag": standin.spec_etag})
+                    return
+                self._send(200, standin._route(self.command, url.path, parse_qs(url.query)))
+
+            do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = _handle
+
+        return Handler
+
+    def start(self) -> None:
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def _median_ms(samples: list[float]) -> float:
+    return round(statistics.median(samples) * 1000, 3)
+
+
+def _p95_ms(samples: list[float]) -> float:
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 3)
+
+
+def measure_import(repeat: int = 3) -> float:
+    """Median seconds to import the server module in a fresh interpreter."""
+
+    def _run(code: str) -> float:
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True, stderr=subprocess.DEVNULL)
+        return time.perf_counter() - started
+
+    baseline = statistics.median(_run("pass") for _ in range(repeat))
+    imported = statistics.median(_run("import ynab_mcp_server.server") for _ in range(repeat))
+    return round(imported - baseline, 4)
+
+
+async def _timed(fn: Any, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+async def run(args: argparse.Namespace) -> dict[str, float]:
+    spec_text = Path(args.spec).read_text(encoding="utf-8") if args.spec else None
+    standin = StandIn(transactions=args.transactions, spec_text=spec_text)
+    standin.start()
+    tmp = tempfile.TemporaryDirectory()
+    os.environ["YNAB_MCP_SPEC_CACHE"] = str(Path(tmp.name) / "open_api_spec.json")
+    options = {
+        "token": "bench-token",
+        "spec_url": f"{standin.url}/openapi.json",
+        "base_url": f"{standin.url}/v1",
+        "enable_cache": args.cache,
+        "enable_mirror": args.mirror,
+        "lazy_tools": args.lazy_tools,
+    }
+    results: dict[str, float] = {}
+    try:
+        if not args.skip_import:
+            results["import_s"] = measure_import()
+
+        started = time.perf_counter()
+        await create_server(**options)
+        results["create_server_cold_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        started = time.perf_counter()
+        mcp = await create_server(**options)
+        results["create_server_warm_ms"] = round((time.perf_counter() - started) * 1000, 3)
+
+        async with Client(mcp) as client:
+            tools = await client.list_tools()
+            results["tools"] = len(tools)
+            samples = await _timed(client.list_tools, args.repeat)
+            results["list_tools_ms"] = _median_ms(samples)
+
+            async with httpx.AsyncClient(base_url=f"{standin.url}/v1/") as raw:
+                samples = await _timed(lambda: raw.get("user"), args.repeat)
+            raw_ms = _median_ms(samples)
+            results["raw_request_ms"] = raw_ms
+
+            async def _call_user() -> None:
+                await client.call_tool("get_user", {})
+
+            samples = await _timed(_call_user, args.repeat)
+            results["call_ms"] = _median_ms(samples)
+            results["call_p95_ms"] = _p95_ms(samples)
+            results["call_overhead_ms"] = round(results["call_ms"] - raw_ms, 3)
+
+            async def _call_transactions() -> None:
+                await client.call_tool("get_transactions", {"budget_id": "b1"})
+
+            samples = await _timed(_call_transactions, max(1, args.repeat // 10))
+            results["transactions_call_ms"] = _median_ms(samples)
+
+        # Memory in a separate pass: tracing slows every allocation down
+        tracemalloc.start()
+        mcp = await create_server(**options)
+        results["create_server_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 2)
+        async with Client(mcp) as client:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            await client.call_tool("get_transactions", {"budget_id": "b1"})
+            peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        results["transactions_call_peak_mb"] = round((peak - before) / 2**20, 2)
+    finally:
+        standin.stop()
+        tmp.cleanup()
+    return results
+
+
+# Counts, not costs; never compared against a baseline
+_INFORMATIONAL = {"tools", "raw_request_ms"}
+
+
+def compare(results: dict[str, float], baseline: dict[str, float], tolerance: float) -> list[str]:
+    """Names of metrics more than `tolerance` (relative) worse than the baseline."""
+    failures = []
+    for name, value in results.items():
+        base = baseline.get(name)
+        if name in _INFORMATIONAL or not isinstance(base, (int, float)) or base <= 0:
+            continue
+        if value > base * (1 + tolerance):
+            failures.append(f"{name}: {value} > {base} (+{tolerance:.0%})")
+    return failures
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Offline benchmarks against a local YNAB stand-in")
+    p.add_argument("--transactions", type=int, default=10_000, help="Transactions served")
+    p.add_argument("--repeat", type=int, default=50, help="Iterations per latency measurement")
+    p.add_argument("--spec", help="Serve this OpenAPI file instead of the synthetic spec")
+    p.add_argument("--cache", action="store_true", help="Benchmark with the response cache")
+    p.add_argument("--mirror", action="store_true", help="Benchmark with the local mirror")
+    p.add_argument("--lazy-tools", action="store_true", help="Benchmark with lazy tools")
+    p.add_argument("--skip-import", action="store_true", help="Skip the import-time probe")
+    p.add_argument("--json", dest="json_path", help="Write results to this JSON file")
+    p.add_argument("--baseline", help="Fail if results regress against this JSON file")
+    p.add_argument(
+        "--tolerance", type=float, default=0.25, help="Allowed relative regression (0.25 = 25%%)"
+    )
+    args = p.parse_args()
+
+    results = asyncio.run(run(args))
+    width = max(len(k) for k in results)
+    for name, value in results.items():
+        print(f"{name:<{width}}  {value}")
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        failures = compare(results, baseline, args.tolerance)
+        for failure in failures:
+            print(f"REGRESSION {failure}", file=sys.stderr)
+        if failures:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -14,15 +14,46 @@ def _parse_tags(value: str | None) -> set[str] | None:
     return tags or None
 
 
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, "").strip().lower() in {"1", "true", "yes", "on"}
+
+
 def main() -> None:
+    # Multi-tenant: no server token; each MCP request brings its caller's own
+    multi_tenant = _env_flag("YNAB_MCP_MULTI_TENANT")
     token = os.environ.get("YNAB_ACCESS_TOKEN")
-    if not token:
-        raise SystemExit("YNAB_ACCESS_TOKEN is required")
+    if not token and not multi_tenant:
+        raise SystemExit("YNAB_ACCESS_TOKEN is required (or set YNAB_MCP_MULTI_TENANT=1)")
 
     include = _parse_tags(os.environ.get("INCLUDE_TAGS"))
     exclude = _parse_tags(os.environ.get("EXCLUDE_TAGS"))
 
-    mcp = asyncio.run(create_server(token=token, include_tags=include, exclude_tags=exclude))
+    rate_limit_mode = os.environ.get("YNAB_MCP_RATE_LIMIT_MODE", "wait")
+    if rate_limit_mode not in ("wait", "shed"):
+        raise SystemExit("YNAB_MCP_RATE_LIMIT_MODE must be 'wait' or 'shed'")
+
+    keepalive = float(os.environ.get("YNAB_MCP_KEEPALIVE_EXPIRY", "30"))
+    mcp = asyncio.run(
+        create_server(
+            token=None if multi_tenant else token,
+            multi_tenant=multi_tenant,
+            max_tenants=int(os.environ.get("YNAB_MCP_MAX_TENANTS", "256")),
+            include_tags=include,
+            exclude_tags=exclude,
+            warm_up=_env_flag("YNAB_MCP_WARM_UP"),
+            # Per token, so each tenant gets its own window
+            rate_limit=int(os.environ.get("YNAB_MCP_RATE_LIMIT") or 0) or None,
+            rate_limit_mode=rate_limit_mode,
+            rate_limit_state=os.environ.get("YNAB_MCP_RATE_LIMIT_STATE"),
+            enable_metrics=_env_flag("YNAB_MCP_METRICS"),
+            trace_file=os.environ.get("YNAB_MCP_TRACE_FILE"),
+            trace_otlp_endpoint=os.environ.get("YNAB_MCP_TRACE_OTLP_ENDPOINT"),
+            trace_min_duration=float(os.environ.get("YNAB_MCP_TRACE_MIN_DURATION", "0")),
+            keepalive_expiry=keepalive,
+            # Sessions come and go; keep idle connections between them
+            idle_close_after=keepalive,
+        )
+    )
     # Default host/port with env overrides
     host = os.environ.get("HOST", "127.0.0.1")
     port = int(os.environ.get("PORT", "8000"))
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import httpx
+import pytest
+import respx
+from fastmcp import Client
+
+from ynab_mcp_server import server as server_mod
+from ynab_mcp_server.analytics import ColumnStore, TransactionColumns, rolling_sums
+
+SPEC = {
+    "openapi": "3.0.0",
+    "info": {"title": "Test YNAB", "version": "0.0.1"},
+    "servers": [{"url": "https://api.ynab.com/v1"}],
+    "paths": {},
+}
+
+TRANSACTIONS = [
+    {"id": "t1", "date": "2024-01-05", "amount": -10000, "category_id": "food",
+     "category_name": "Food", "payee_id": "p1", "account_id": "a1"},
+    {"id": "t2", "date": "2024-01-20", "amount": -30000, "category_id": None,
+     "payee_id": "p2", "account_id": "a1", "subtransactions": [
+         {"id": "s1", "amount": -20000, "category_id": "food"},
+         {"id": "s2", "amount": -10000, "category_id": "fun", "category_name": "Fun"},
+     ]},
+    {"id": "t3", "date": "2024-03-02", "amount": -5000, "category_id": "fun",
+     "payee_id": "p1", "account_id": "a1"},
+    {"id": "t4", "date": "2024-03-03", "amount": 100000, "category_id": "income",
+     "payee_id": "p3", "account_id": "a1"},
+    {"id": "t5", "date": "2024-03-04", "amount": -7000, "account_id": "a1",
+     "transfer_account_id": "a2"},
+    {"id": "t6", "date": "2024-03-05", "amount": -1000, "category_id": "food",
+     "account_id": "a1", "deleted": True},
+]
+
+
+def test_group_totals_expand_splits_and_skip_transfers():
+    cols = TransactionColumns.from_transactions(TRANSACTIONS)
+    rows = cols.select(flow="outflow")
+    totals = {
+        cols.describe_key("category", k)["category_id"]: (t, c)
+        for k, t, c in cols.group_totals("category", rows)
+    }
+    assert totals == {"food": (-30000, 2), "fun": (-15000, 2)}
+
+    by_month = [
+        (cols.describe_key("category_month", k), t)
+        for k, t, _ in cols.group_totals("category_month", rows)
+    ]
+    assert ({"category_id": "fun", "category_name": "Fun", "month": "2024-03"}, -5000) in by_month
+
+    first, monthly = cols.monthly_totals(rows)
+    assert monthly == [-40000, 0, -5000]
+    assert rolling_sums(monthly, 2) == [-40000, -40000, -5000]
+    assert cols.percentiles(rows, [0, 50, 100]) == [5000, 10000, 20000]
+    assert len(cols.select(since="2024-03-01", flow="all")) == 2
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_spending_summary_tool(monkeypatch: pytest.MonkeyPatch):
+    async def fake_fetch_openapi_spec(*_args, **_kwargs):  # type: ignore[no-redef]
+        return SPEC
+
+    monkeypatch.setattr(server_mod, "fetch_openapi_spec", fake_fetch_openapi_spec)
+
+    route = respx.get("https://api.ynab.com/v1/budgets/b1/transactions").mock(
+        return_value=httpx.Response(
+            200, json={"data": {"transactions": TRANSACTIONS, "server_knowledge": 4}}
+        )
+    )
+
+    mcp = await server_mod.create_server(token="T", enable_analytics=True)
+    client = Client(mcp)
+    async with client:
+        for _ in range(2):
+            result = await client.call_tool(
+                "spending_summary", {"budget_id": "b1", "group_by": "month", "top": 1}
+            )
+
+    # Without --mirror, analytics still reads through the mirror: one download
+    assert route.call_count == 1
+
+    summary = result.structured_content
+    assert summary["groups"] == [
+        {"month": "2024-01", "total_milliunits": -40000, "total": -40.0, "count": 3}
+    ]
+    assert summary["transactions"] == 4
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_column_store_is_keyed_by_namespace():
+    def _transactions(request: httpx.Request) -> httpx.Response:
+        txns = TRANSACTIONS if request.headers["Authorization"] == "Bearer A" else []
+        return httpx.Response(200, json={"data": {"transactions": txns, "server_knowledge": 4}})
+
+    respx.get("https://api.ynab.com/v1/budgets/last-used/transactions").mock(
+        side_effect=_transactions
+    )
+    store = ColumnStore()
+    async with httpx.AsyncClient(
+        base_url="https://api.ynab.com/v1/", headers={"Authorization": "Bearer A"}
+    ) as client:
+        a = await store.get(client, "ns-a", "last-used")
+        client.headers["Authorization"] = "Bearer B"
+        b = await store.get(client, "ns-b", "last-used")
+    assert len(a.amounts) > 0
+    assert len(b.amounts) == 0
+
+    store.forget("ns-a")
+    assert [k[0] for k in store._columns] == ["ns-b"]
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_budget_id_cannot_escape_its_path_segment():
+    route = respx.route(host="api.ynab.com").respond(
+        200, json={"data": {"transactions": [], "server_knowledge": 1}}
+    )
+    async with httpx.AsyncClient(base_url="https://api.ynab.com/v1/") as client:
+        await ColumnStore().get(client, "", "b1/accounts?x=")
+    assert route.calls.last.request.url.raw_path == (
+        b"/v1/budgets/b1%2Faccounts%3Fx%3D/transactions"
+    )
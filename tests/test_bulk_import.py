@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import json
+
+import httpx
+import pytest
+import respx
+from fastmcp import Client
+
+from ynab_mcp_server import server as server_mod
+from ynab_mcp_server.bulk_import import (
+    import_transactions,
+    normalize,
+    parse_csv,
+    parse_ofx,
+    to_milliunits,
+)
+
+SPEC = {
+    "openapi": "3.0.0",
+    "info": {"title": "Test YNAB", "version": "0.0.1"},
+    "servers": [{"url": "https://api.ynab.com/v1"}],
+    "paths": {},
+}
+
+CSV = """Date,Payee,Memo,Outflow,Inflow
+01/31/2024,Coffee Shop,latte,$4.50,
+01/31/2024,Coffee Shop,latte,$4.50,
+02/01/2024,Employer,,,"1,250.00"
+bad date,Nobody,,1.00,
+"""
+
+OFX = """<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20240131120000[-5:EST]<TRNAMT>-12.34<FITID>1<NAME>Grocer</STMTTRN>
+<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20240201<TRNAMT>100<FITID>2<NAME>Refund<MEMO>ref</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+
+def test_to_milliunits():
+    assert to_milliunits("-12.34") == -12340
+    assert to_milliunits("$1,234.5") == 1234500
+    assert to_milliunits("(5.00)") == -5000
+    assert to_milliunits(7) == 7000
+
+
+def test_csv_rows_get_ynab_import_ids():
+    transactions, skipped = normalize(parse_csv(CSV), account_id="acc")
+    assert [(t["date"], t["amount"], t["import_id"]) for t in transactions] == [
+        ("2024-01-31", -4500, "YNAB:-4500:2024-01-31:1"),
+        ("2024-01-31", -4500, "YNAB:-4500:2024-01-31:2"),
+        ("2024-02-01", 1250000, "YNAB:1250000:2024-02-01:1"),
+    ]
+    assert transactions[0]["payee_name"] == "Coffee Shop"
+    assert skipped == [{"row": 4, "error": "Unrecognized date: 'bad date'"}]
+
+
+def test_ofx_statement():
+    transactions, _ = normalize(parse_ofx(OFX), account_id="acc")
+    assert [(t["date"], t["amount"], t["payee_name"]) for t in transactions] == [
+        ("2024-01-31", -12340, "Grocer"),
+        ("2024-02-01", 100000, "Refund"),
+    ]
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_bulk_import_posts_batches(monkeypatch: pytest.MonkeyPatch):
+    async def fake_fetch_openapi_spec(*_args, **_kwargs):  # type: ignore[no-redef]
+        return SPEC
+
+    monkeypatch.setattr(server_mod, "fetch_openapi_spec", fake_fetch_openapi_spec)
+
+    batches: list[list[dict]] = []
+
+    def _create(request: httpx.Request) -> httpx.Response:
+        batch = json.loads(request.content)["transactions"]
+        batches.append(batch)
+        ids = [t["import_id"] for t in batch]
+        return httpx.Response(
+            201,
+            json={
+                "data": {
+                    "transaction_ids": [f"t-{i}" for i in ids[1:]],
+                    "duplicate_import_ids": ids[:1],
+                }
+            },
+        )
+
+    respx.post("https://api.ynab.com/v1/budgets/b1/transactions").mock(side_effect=_create)
+
+    mcp = await server_mod.create_server(token="T")
+    client = Client(mcp)
+    async with client:
+        result = await client.call_tool(
+            "bulk_import_transactions",
+            {"budget_id": "b1", "content": CSV, "account_id": "acc", "batch_size": 2},
+        )
+
+    summary = result.structured_content
+    assert [len(b) for b in batches] == [2, 1]
+    assert summary["submitted"] == 3
+    assert summary["created"] == 1
+    assert summary["duplicates"] == 2
+    assert summary["failed_batches"] == []
+    assert len(summary["skipped"]) == 1
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_non_positive_batch_size_still_sends_every_row():
+    sizes: list[int] = []
+
+    def _create(request: httpx.Request) -> httpx.Response:
+        batch = json.loads(request.content)["transactions"]
+        sizes.append(len(batch))
+        return httpx.Response(201, json={"data": {"transaction_ids": ["t"] * len(batch)}})
+
+    respx.post("https://api.ynab.com/v1/budgets/b1/transactions").mock(side_effect=_create)
+    rows = [{"import_id": f"i{n}"} for n in range(3)]
+    async with httpx.AsyncClient(base_url="https://api.ynab.com/v1/") as client:
+        summary = await import_transactions(client, "b1", rows, batch_size=0)
+
+    assert sizes == [1, 1, 1]
+    assert summary["created"] == 3
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_budget_id_cannot_escape_its_path_segment():
+    route = respx.route(host="api.ynab.com").respond(201, json={"data": {"transaction_ids": ["t"]}})
+    async with httpx.AsyncClient(base_url="https://api.ynab.com/v1/") as client:
+        await import_transactions(client, "b1/accounts?x=", [{"import_id": "i"}])
+
+    assert route.call_count == 1
+    assert route.calls.last.request.url.raw_path == (
+        b"/v1/budgets/b1%2Faccounts%3Fx%3D/transactions"
+    )
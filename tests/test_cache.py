@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import time
+
+import httpx
+import pytest
+import respx
+from fastmcp import Client
+
+from ynab_mcp_server import server as server_mod
+from ynab_mcp_server.cache import CachedResponse, ResponseCache, SqliteCacheStore
+from ynab_mcp_server.spec_index import OperationIndex
+
+SPEC = {
+    "openapi": "3.0.0",
+    "info": {"title": "Test YNAB", "version": "0.0.1"},
+    "servers": [{"url": "https://api.ynab.com/v1"}],
+    "paths": {
+        "/user": {
+            "get": {
+                "operationId": "getUser",
+                "tags": ["User"],
+                "responses": {"200": {"description": "ok"}},
+            }
+        },
+        "/budgets/{budget_id}/categories": {
+            "parameters": [
+                {"name": "budget_id", "in": "path", "required": True, "schema": {"type": "string"}}
+            ],
+            "get": {
+                "operationId": "getCategories",
+                "tags": ["Categories"],
+                "responses": {"200": {"description": "ok"}},
+            },
+        },
+        "/budgets/{budget_id}/categories/{category_id}": {
+            "parameters": [
+                {"name": "budget_id", "in": "path", "required": True, "schema": {"type": "string"}},
+                {
+                    "name": "category_id",
+                    "in": "path",
+                    "required": True,
+                    "schema": {"type": "string"},
+                },
+            ],
+            "patch": {
+                "operationId": "updateCategory",
+                "tags": ["Categories"],
+                "requestBody": {
+                    "content": {
+                        "application/json": {
+                            "schema": {
+                                "type": "object",
+                                "properties": {"category": {"type": "object"}},
+                            }
+                        }
+                    }
+                },
+                "responses": {"200": {"description": "ok"}},
+            },
+        },
+    },
+}
+
+
+def _entry(scope: str = "", expires_at: float = 100.0) -> CachedResponse:
+    return CachedResponse(200, [], b"{}", expires_at=expires_at, scope=scope)
+
+
+def test_lru_eviction_and_expiry():
+    cache = ResponseCache(max_entries=2)
+    cache.put("ns", "a", _entry())
+    cache.put("ns", "b", _entry())
+    assert cache.get("ns", "a", now=0.0) is not None  # a is now most recent
+    cache.put("ns", "c", _entry())
+    assert cache.get("ns", "b", now=0.0) is None
+    assert cache.get("ns", "a", now=0.0) is not None
+    assert cache.get("ns", "c", now=200.0) is None  # expired
+
+
+def test_sqlite_store_is_shared_and_namespaced(tmp_path):
+    path = tmp_path / "http_cache.sqlite3"
+    later = time.time() + 3600
+    first = ResponseCache(store=SqliteCacheStore(path, max_entries=2, prune_every=1))
+    first.put("ns", "a", CachedResponse(200, [("etag", "x")], b'{"a":1}', later, "b1"))
+    first.put("other", "a", _entry(expires_at=later))
+
+    # A second process opening the same file sees the entry
+    second = ResponseCache(store=SqliteCacheStore(path, max_entries=2))
+    entry = second.get("ns", "a", now=0.0)
+    assert entry is not None
+    assert entry.content == b'{"a":1}'
+    assert entry.headers == [("etag", "x")]
+    assert entry.scope == "b1"
+
+    second.invalidate("ns", {"b1"})
+    assert first.get("ns", "a", now=0.0) is None
+    assert first.get("other", "a", now=0.0) is not None
+
+    first.put("other", "b", _entry(expires_at=later))
+    first.put("other", "c", _entry(expires_at=later))
+    assert len(second) == 2
+
+
+def test_sqlite_store_prunes_every_n_puts(tmp_path):
+    store = SqliteCacheStore(tmp_path / "http_cache.sqlite3", max_entries=10, prune_every=3)
+    store.put("ns", "old", _entry(expires_at=time.time() - 1))
+    store.put("ns", "a", _entry(expires_at=time.time() + 60))
+    assert len(store) == 2
+    store.put("ns", "b", _entry(expires_at=time.time() + 60))
+    assert len(store) == 2
+    plan = store._conn.execute(
+        "EXPLAIN QUERY PLAN DELETE FROM responses WHERE expires_at <= 0"
+    ).fetchall()
+    assert "responses_expires" in str(plan)
+
+
+def test_operation_index_matches_concrete_paths():
+    index = OperationIndex.from_spec(SPEC, base_path="/v1")
+    matched = index.match("GET", "/v1/budgets/b1/categories")
+    assert matched is not None
+    op, params = matched
+    assert op.operation_id == "getCategories"
+    assert op.tags == ("Categories",)
+    assert params == {"budget_id": "b1"}
+    assert index.match("DELETE", "/v1/budgets/b1/categories") is None
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_cached_reads_and_write_invalidation(monkeypatch: pytest.MonkeyPatch):
+    async def fake_fetch_openapi_spec(*_args, **_kwargs):  # type: ignore[no-redef]
+        return SPEC
+
+    monkeypatch.setattr(server_mod, "fetch_openapi_spec", fake_fetch_openapi_spec)
+
+    user = respx.get("https://api.ynab.com/v1/user").mock(
+        return_value=httpx.Response(200, json={"data": {"user": {"id": "u"}}})
+    )
+    categories = respx.get("https://api.ynab.com/v1/budgets/b1/categories").mock(
+        return_value=httpx.Response(200, json={"data": {"category_groups": []}})
+    )
+    respx.patch("https://api.ynab.com/v1/budgets/b1/categories/c1").mock(
+        return_value=httpx.Response(200, json={"data": {"category": {"id": "c1"}}})
+    )
+
+    mcp = await server_mod.create_server(token="T", enable_cache=True, enable_mirror=False)
+    client = Client(mcp)
+    async with client:
+        for _ in range(3):
+            await client.call_tool("get_user", {})
+            await client.call_tool("get_categories", {"budget_id": "b1"})
+        await client.call_tool(
+            "update_category", {"budget_id": "b1", "category_id": "c1", "category": {}}
+        )
+        await client.call_tool("get_categories", {"budget_id": "b1"})
+
+    assert user.call_count == 1
+    assert categories.call_count == 2
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+import respx
+from fastmcp import Client
+
+from ynab_mcp_server import server as server_mod
+
+SPEC = {
+    "openapi": "3.0.0",
+    "info": {"title": "Test YNAB", "version": "0.0.1"},
+    "servers": [{"url": "https://api.ynab.com/v1"}],
+    "paths": {
+        "/budgets/{budget_id}/months/{month}": {
+            "parameters": [
+                {"name": "budget_id", "in": "path", "required": True, "schema": {"type": "string"}},
+                {"name": "month", "in": "path", "required": True, "schema": {"type": "string"}},
+            ],
+            "get": {
+                "operationId": "getBudgetMonth",
+                "tags": ["Months"],
+                "responses": {"200": {"description": "ok"}},
+            },
+        },
+    },
+}
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_fan_out_runs_operation_across_budgets(monkeypatch: pytest.MonkeyPatch):
+    async def fake_fetch_openapi_spec(*_args, **_kwargs):  # type: ignore[no-redef]
+        return SPEC
+
+    monkeypatch.setattr(server_mod, "fetch_openapi_spec", fake_fetch_openapi_spec)
+
+    respx.get("https://api.ynab.com/v1/budgets").mock(
+        return_value=httpx.Response(
+            200,
+            json={"data": {"budgets": [{"id": f"b{i}", "name": f"Budget {i}"} for i in range(4)]}},
+        )
+    )
+
+    in_flight = 0
+    peak = 0
+
+    async def _month(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        budget_id = request.url.path.split("/")[3]
+        if budget_id == "b3":
+            return httpx.Response(404, json={"error": {"id": "404", "detail": "Not found"}})
+        return httpx.Response(200, json={"data": {"month": {"budgeted": 1, "note": budget_id}}})
+
+    respx.get(url__regex=r"https://api.ynab.com/v1/budgets/b\d/months/current").mock(
+        side_effect=_month
+    )
+
+    mcp = await server_mod.create_server(token="T")
+    client = Client(mcp)
+    async with client:
+        result = await client.call_tool(
+            "fan_out_operation",
+            {
+                "operation": "get_budget_month",
+                "arguments": {"month": "current"},
+                "concurrency": 2,
+                "fields": ["month.note"],
+            },
+        )
+
+    summary = result.structured_content
+    assert summary["budgets"] == 4
+    assert summary["failed"] == 1
+    ok = {r["budget_id"]: r["result"] for r in summary["results"] if "result" in r}
+    assert ok["b0"] == {"data": {"month": {"note": "b0"}}}
+    assert summary["results"][0]["budget_name"] == "Budget 0"
+    assert "Not found" in summary["results"][3]["error"]
+    assert peak <= 2
+
+
+@pytest.mark.asyncio
+async def test_fan_out_tool_is_skipped_when_no_operation_is_allowed(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    async def fake_fetch_openapi_spec(*_args, **_kwargs):  # type: ignore[no-redef]
+        return SPEC
+
+    monkeypatch.setattr(server_mod, "fetch_openapi_spec", fake_fetch_openapi_spec)
+
+    mcp = await server_mod.create_server(token="T", include_tags={"User"})
+    assert "fan_out_operation" not in await mcp.get_tools()
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import importlib
+import json
+
+import pytest
+
+from ynab_mcp_server import jsonlib
+
+
+def test_round_trip_returns_compact_bytes():
+    payload = {"data": {"amount": -42170, "memo": "café", "cleared": True}}
+    encoded = jsonlib.dumps(payload)
+    assert isinstance(encoded, bytes)
+    assert jsonlib.loads(encoded) == payload
+    assert jsonlib.loads(encoded.decode("utf-8")) == payload
+
+
+def test_invalid_input_raises_stdlib_decode_error():
+    with pytest.raises(json.JSONDecodeError):
+        jsonlib.loads("openapi: 3.0.0")
+
+
+def test_backend_can_be_forced_to_stdlib(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv(jsonlib.BACKEND_ENV, "stdlib")
+    try:
+        reloaded = importlib.reload(jsonlib)
+        assert reloaded.BACKEND == "stdlib"
+        assert reloaded.loads(reloaded.dumps([1, None])) == [1, None]
+    finally:
+        monkeypatch.delenv(jsonlib.BACKEND_ENV)
+        importlib.reload(jsonlib)
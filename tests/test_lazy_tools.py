@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import httpx
+import pytest
+import respx
+from fastmcp import Client
+
+from ynab_mcp_server import server as server_mod
+
+SPEC = {
+    "openapi": "3.0.0",
+    "info": {"title": "Test YNAB", "version": "0.0.1"},
+    "servers": [{"url": "https://api.ynab.com/v1"}],
+    "paths": {
+        "/user": {
+            "get": {
+                "operationId": "getUser",
+                "tags": ["User"],
+                "summary": "User info",
+                "responses": {"200": {"description": "ok"}},
+            }
+        },
+        "/budgets/{budget_id}/payees": {
+            "parameters": [
+                {"name": "budget_id", "in": "path", "required": True, "schema": {"type": "string"}}
+            ],
+            "get": {
+                "operationId": "getPayees",
+                "tags": ["Payees"],
+                "summary": "List payees",
+                "responses": {
+                    "200": {
+                        "description": "ok",
+                        "content": {
+                            "application/json": {
+                                "schema": {"$ref": "#/components/schemas/PayeesResponse"}
+                            }
+                        },
+                    }
+                },
+            },
+        },
+    },
+    "components": {
+        "schemas": {
+            "PayeesResponse": {
+                "type": "object",
+                "properties": {"data": {"type": "object"}},
+            }
+        }
+    },
+}
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_lazy_tools_materialize_on_first_use(monkeypatch: pytest.MonkeyPatch):
+    async def fake_fetch_openapi_spec(*_args, **_kwargs):  # type: ignore[no-redef]
+        return SPEC
+
+    monkeypatch.setattr(server_mod, "fetch_openapi_spec", fake_fetch_openapi_spec)
+
+    payees = respx.get("https://api.ynab.com/v1/budgets/b1/payees").mock(
+        return_value=httpx.Response(200, json={"data": {"payees": [{"id": "p1"}]}})
+    )
+
+    mcp = await server_mod.create_server(token="T", lazy_tools=True, exclude_tags={"User"})
+    client = Client(mcp)
+    async with client:
+        names = {t.name for t in await client.list_tools()}
+        assert {"list_operations", "describe_operation", "call_operation"} <= names
+        assert "get_payees" not in names
+
+        listed = await client.call_tool("list_operations", {})
+        assert [op["name"] for op in listed.structured_content["result"]] == ["get_payees"]
+
+        described = await client.call_tool("describe_operation", {"name": "get_payees"})
+        assert "budget_id" in described.structured_content["input_schema"]["properties"]
+
+        result = await client.call_tool(
+            "call_operation", {"name": "get_payees", "arguments": {"budget_id": "b1"}}
+        )
+        assert result.structured_content == {"data": {"payees": [{"id": "p1"}]}}
+        assert payees.call_count == 1
+
+        # Materialized tools become directly callable
+        assert "get_payees" in {t.name for t in await client.list_tools()}
+
+        with pytest.raises(Exception):
+            await client.call_tool("describe_operation", {"name": "get_user"})
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+import respx
+from fastmcp import Client
+
+from ynab_mcp_server import server as server_mod
+from ynab_mcp_server.metrics import Histogram
+
+SPEC = {
+    "openapi": "3.0.0",
+    "info": {"title": "Test YNAB", "version": "0.0.1"},
+    "servers": [{"url": "https://api.ynab.com/v1"}],
+    "paths": {
+        "/user": {
+            "get": {
+                "operationId": "getUser",
+                "tags": ["User"],
+                "responses": {"200": {"description": "ok"}},
+            }
+        },
+    },
+}
+
+
+def test_histogram_renders_cumulative_buckets():
+    h = Histogram("x_seconds", "help", (0.1, 1.0))
+    h.observe(0.05, tool="a")
+    h.observe(0.5, tool="a")
+    h.observe(5.0, tool="a")
+    text = "\n".join(h.render())
+    assert 'x_seconds_bucket{tool="a",le="0.1"} 1' in text
+    assert 'x_seconds_bucket{tool="a",le="1"} 2' in text
+    assert 'x_seconds_bucket{tool="a",le="+Inf"} 3' in text
+    assert 'x_seconds_count{tool="a"} 3' in text
+    assert h.summary("tool")["a"]["max"] == 5000.0
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_metrics_tool_and_route(monkeypatch: pytest.MonkeyPatch):
+    async def fake_fetch_openapi_spec(*_args, **_kwargs):  # type: ignore[no-redef]
+        return SPEC
+
+    monkeypatch.setattr(server_mod, "fetch_openapi_spec", fake_fetch_openapi_spec)
+    upstream = respx.get("https://api.ynab.com/v1/user").respond(
+        200, json={"data": {"user": {"id": "u"}}}, headers={"X-Rate-Limit": "5/200"}
+    )
+
+    mcp = await server_mod.create_server(
+        token="T", enable_metrics=True, enable_cache=True, rate_limit=200
+    )
+    async with Client(mcp) as client:
+        await client.call_tool("get_user", {})
+        await client.call_tool("get_user", {})
+        snapshot = (await client.call_tool("metrics", {})).structured_content
+
+    assert upstream.call_count == 1
+    assert snapshot["tools_ms"]["get_user"]["count"] == 2
+    assert snapshot["upstream_ms"]["get_user"]["count"] == 1
+    assert snapshot["normalize_ms"]["count"] == 2
+    gauges = snapshot["gauges"]
+    assert gauges["ynab_mcp_cache_hit_ratio"] == [{"value": 0.5}]
+    assert gauges["ynab_mcp_upstream_rate_limit_remaining"][0]["value"] == 195
+    assert gauges["ynab_mcp_rate_limit_remaining"][0]["value"] <= 195
+
+    (route,) = [r for r in mcp._additional_http_routes if r.path == "/metrics"]
+    response = await route.endpoint(None)
+    body = response.body.decode()
+    assert response.media_type.startswith("text/plain")
+    assert (
+        'ynab_mcp_upstream_duration_seconds_count{method="GET",operation="get_user",status="200"} 1'
+        in body
+    )
+    assert "ynab_mcp_cache_hit_ratio 0.5" in body
+
+
+def test_metrics_does_not_import_the_rate_limiter():
+    code = "import sys, ynab_mcp_server.metrics; print('ynab_mcp_server.ratelimit' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
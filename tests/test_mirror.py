@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import httpx
+import pytest
+import respx
+from fastmcp import Client
+
+from ynab_mcp_server import server as server_mod
+from ynab_mcp_server.mirror import USE_MIRROR_EXTENSION, DeltaMirror, MirrorTransport
+
+
+def _list_spec(path: str, operation_id: str) -> dict:
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Test YNAB", "version": "0.0.1"},
+        "servers": [{"url": "https://api.ynab.com/v1"}],
+        "paths": {
+            path: {
+                "get": {
+                    "operationId": operation_id,
+                    "parameters": [
+                        {
+                            "name": "budget_id",
+                            "in": "path",
+                            "required": True,
+                            "schema": {"type": "string"},
+                        }
+                    ],
+                    "responses": {"200": {"description": "ok"}},
+                }
+            }
+        },
+    }
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_mirror_issues_delta_requests_and_merges(monkeypatch: pytest.MonkeyPatch):
+    spec = _list_spec("/budgets/{budget_id}/transactions", "getTransactions")
+
+    async def fake_fetch_openapi_spec(*_args, **_kwargs):  # type: ignore[no-redef]
+        return spec
+
+    monkeypatch.setattr(server_mod, "fetch_openapi_spec", fake_fetch_openapi_spec)
+
+    seen: list[str | None] = []
+
+    def _recorder(request: httpx.Request) -> httpx.Response:
+        knowledge = request.url.params.get("last_knowledge_of_server")
+        seen.append(knowledge)
+        if knowledge is None:
+            txs = [{"id": "t1", "amount": -1000}, {"id": "t2", "amount": -2000}]
+            return httpx.Response(200, json={"data": {"transactions": txs, "server_knowledge": 10}})
+        changes = [{"id": "t1", "deleted": True}, {"id": "t3", "amount": -3000}]
+        return httpx.Response(200, json={"data": {"transactions": changes, "server_knowledge": 11}})
+
+    respx.get("https://api.ynab.com/v1/budgets/b1/transactions").mock(side_effect=_recorder)
+
+    mcp = await server_mod.create_server(token="T", enable_mirror=True, mirror_max_age=0)
+    client = Client(mcp)
+    async with client:
+        first = await client.call_tool("get_transactions", {"budget_id": "b1"})
+        second = await client.call_tool("get_transactions", {"budget_id": "b1"})
+
+    assert seen == [None, "10"]
+    assert [t["id"] for t in first.data["data"]["transactions"]] == ["t1", "t2"]
+    ids = [t["id"] for t in second.data["data"]["transactions"]]
+    assert ids == ["t2", "t3"]
+    assert second.data["data"]["server_knowledge"] == 11
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_mirror_serves_fresh_snapshot_locally(monkeypatch: pytest.MonkeyPatch):
+    spec = _list_spec("/budgets/{budget_id}/payees", "getPayees")
+
+    async def fake_fetch_openapi_spec(*_args, **_kwargs):  # type: ignore[no-redef]
+        return spec
+
+    monkeypatch.setattr(server_mod, "fetch_openapi_spec", fake_fetch_openapi_spec)
+
+    route = respx.get("https://api.ynab.com/v1/budgets/b1/payees").mock(
+        return_value=httpx.Response(
+            200, json={"data": {"payees": [{"id": "p1", "name": "Grocer"}], "server_knowledge": 3}}
+        )
+    )
+
+    mcp = await server_mod.create_server(token="T", enable_mirror=True, mirror_max_age=60)
+    client = Client(mcp)
+    async with client:
+        await client.call_tool("get_payees", {"budget_id": "b1"})
+        res = await client.call_tool("get_payees", {"budget_id": "b1"})
+
+    assert route.call_count == 1
+    assert res.data["data"]["payees"][0]["name"] == "Grocer"
+
+
+def test_category_group_delta_merges_nested_categories():
+    mirror = DeltaMirror()
+    mirror.merge(
+        "ns",
+        "b1",
+        "categories",
+        {
+            "category_groups": [
+                {"id": "g1", "name": "Bills", "categories": [{"id": "c1"}, {"id": "c2"}]},
+                {"id": "g2", "name": "Fun", "categories": [{"id": "c3"}]},
+            ],
+            "server_knowledge": 1,
+        },
+    )
+    snap = mirror.merge(
+        "ns",
+        "b1",
+        "categories",
+        {
+            "category_groups": [
+                {"id": "g1", "name": "Bills", "categories": [{"id": "c2", "deleted": True}]},
+                {"id": "g2", "deleted": True, "categories": []},
+            ],
+            "server_knowledge": 2,
+        },
+    )
+    assert snap.server_knowledge == 2
+    assert [g["id"] for g in snap.items] == ["g1"]
+    assert [c["id"] for c in snap.items[0]["categories"]] == ["c1"]
+
+
+def test_write_to_a_budget_marks_last_used_stale():
+    mirror = DeltaMirror(max_age=60)
+    data = {"transactions": [{"id": "t1"}], "server_knowledge": 1}
+    alias = mirror.merge("ns", "last-used", "transactions", data)
+    other = mirror.merge("other", "last-used", "transactions", data)
+    assert mirror.is_fresh(alias)
+
+    mirror.invalidate("ns", "b1")
+    assert not mirror.is_fresh(alias)
+    assert mirror.is_fresh(other)
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_opt_in_mirror_only_serves_flagged_reads():
+    route = respx.get("https://api.ynab.com/v1/budgets/b1/payees").mock(
+        return_value=httpx.Response(200, json={"data": {"payees": [], "server_knowledge": 1}})
+    )
+    transport = MirrorTransport(
+        httpx.AsyncHTTPTransport(), DeltaMirror(max_age=60), opt_in=True
+    )
+    async with httpx.AsyncClient(
+        base_url="https://api.ynab.com/v1/", transport=transport
+    ) as client:
+        for _ in range(2):
+            await client.get("budgets/b1/payees", extensions={USE_MIRROR_EXTENSION: True})
+        assert route.call_count == 1
+        await client.get("budgets/b1/payees")
+        assert route.call_count == 2
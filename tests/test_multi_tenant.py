@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import httpx
+import pytest
+import respx
+from fastmcp import Client, FastMCP
+from fastmcp.client.transports import StreamableHttpTransport
+from fastmcp.exceptions import ToolError
+
+from ynab_mcp_server import server as server_mod
+from ynab_mcp_server import tenancy
+from ynab_mcp_server.tenancy import ANONYMOUS_NAMESPACE, TenantPools
+from ynab_mcp_server.transports import auth_namespace
+
+SPEC = {
+    "openapi": "3.0.0",
+    "info": {"title": "Test YNAB", "version": "0.0.1"},
+    "servers": [{"url": "https://api.ynab.com/v1"}],
+    "paths": {
+        "/user": {
+            "get": {
+                "operationId": "getUser",
+                "tags": ["User"],
+                "responses": {"200": {"description": "ok"}},
+            }
+        },
+    },
+}
+
+
+@asynccontextmanager
+async def _http_client(mcp: FastMCP, token: str | None) -> AsyncIterator[Client]:
+    """An MCP client talking to `mcp` over streamable HTTP, in process."""
+    app = mcp.http_app(stateless_http=True)
+
+    def _factory(headers=None, timeout=None, auth=None) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), headers=headers, timeout=timeout
+        )
+
+    transport = StreamableHttpTransport(
+        "http://tenant.test/mcp",
+        headers={"Authorization": f"Bearer {token}"} if token else None,
+        httpx_client_factory=_factory,
+    )
+    async with app.router.lifespan_context(app), Client(transport) as client:
+        yield client
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_each_request_uses_its_own_token_and_pool(monkeypatch: pytest.MonkeyPatch):
+    async def fake_fetch_openapi_spec(*_args, **_kwargs):  # type: ignore[no-redef]
+        return SPEC
+
+    monkeypatch.setattr(server_mod, "fetch_openapi_spec", fake_fetch_openapi_spec)
+    monkeypatch.delenv("YNAB_ACCESS_TOKEN", raising=False)
+    route = respx.get("https://api.ynab.com/v1/user").mock(
+        side_effect=lambda request: httpx.Response(
+            200, json={"data": {"user": {"id": request.headers["Authorization"]}}}
+        )
+    )
+    pools: list[TenantPools] = []
+    real_pools = tenancy.TenantPools
+
+    def _track(**kwargs):
+        pools.append(real_pools(**kwargs))
+        return pools[-1]
+
+    monkeypatch.setattr(tenancy, "TenantPools", _track)
+
+    mcp = await server_mod.create_server(
+        multi_tenant=True,
+        max_tenants=1,
+        rate_limit=10,
+        enable_cache=True,
+        # Stateless HTTP ends a session per request; keep the pools between them
+        idle_close_after=0.5,
+    )
+    for token in ("alice", "bob", "alice"):
+        async with _http_client(mcp, token) as client:
+            result = await client.call_tool("get_user", {})
+            assert result.data["data"]["user"]["id"] == f"Bearer {token}"
+            status = await client.call_tool("rate_limit_status", {})
+            assert status.data["remaining"] == 9
+            # max_tenants=1: one pool at a time
+            assert len(pools[0]) == 1
+
+    # alice's second call was a hit on her own cache entry, yet it still made her
+    # the most recent tenant
+    assert route.call_count == 2
+    assert list(pools[0]._pools) == [auth_namespace("Bearer alice")]
+
+    async with _http_client(mcp, None) as client:
+        with pytest.raises(ToolError, match="Authorization: Bearer"):
+            await client.call_tool("get_user", {})
+    assert route.call_count == 2
+
+    # Pools close once no session has been active for idle_close_after
+    await asyncio.sleep(0.6)
+    assert not pools[0].is_open
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_evicted_tenant_is_forgotten_after_its_call_finishes():
+    respx.get("https://api.ynab.com/v1/user").respond(200, json={"data": {}})
+    pools = TenantPools(max_tenants=2)
+    forgotten: list[str] = []
+    pools.add_eviction_listener(forgotten.append)
+
+    async with httpx.AsyncClient(transport=pools) as client:
+
+        async def _get(token: str) -> None:
+            await client.get(
+                "https://api.ynab.com/v1/user", headers={"Authorization": f"Bearer {token}"}
+            )
+
+        async with client.stream(
+            "GET", "https://api.ynab.com/v1/user", headers={"Authorization": "Bearer a"}
+        ):
+            first = pools._pools[auth_namespace("Bearer a")]
+            for token in ("b", "a", "c", "d"):
+                await _get(token)
+            # a was used after b, so b went first; a's pool survives its open response
+            assert forgotten == [auth_namespace("Bearer b"), auth_namespace("Bearer a")]
+            await asyncio.sleep(0)
+            assert first.is_open
+        await asyncio.sleep(0)
+        assert not first.is_open
+
+        assert list(pools._pools) == [auth_namespace("Bearer c"), auth_namespace("Bearer d")]
+        await pools.aclose()
+        assert len(pools) == 2 and not pools.is_open
+
+
+@pytest.mark.asyncio
+async def test_touch_keeps_a_tenant_warm_and_ignores_anonymous_requests():
+    pools = TenantPools(max_tenants=2)
+    forgotten: list[str] = []
+    pools.add_eviction_listener(forgotten.append)
+    a, b, c = (auth_namespace(f"Bearer {t}") for t in "abc")
+
+    pools.touch(a)
+    pools.touch(b)
+    pools.touch(ANONYMOUS_NAMESPACE)
+    pools.touch(a)
+    pools.touch(c)
+    assert forgotten == [b]
+    assert list(pools._pools) == [a, c]
+
+    # Requests without credentials get a pool without taking a tenant's slot
+    assert pools._pool(ANONYMOUS_NAMESPACE) is pools._pool(ANONYMOUS_NAMESPACE)
+    assert len(pools) == 2
+    await pools.aclose()
+
+
+@respx.mock
+def test_run_http_gives_each_tenant_its_own_rate_limit(monkeypatch: pytest.MonkeyPatch):
+    async def fake_fetch_openapi_spec(*_args, **_kwargs):  # type: ignore[no-redef]
+        return SPEC
+
+    monkeypatch.setattr(server_mod, "fetch_openapi_spec", fake_fetch_openapi_spec)
+    monkeypatch.delenv("YNAB_ACCESS_TOKEN", raising=False)
+    monkeypatch.setenv("YNAB_MCP_MULTI_TENANT", "1")
+    monkeypatch.setenv("YNAB_MCP_RATE_LIMIT", "1")
+    monkeypatch.setenv("YNAB_MCP_RATE_LIMIT_MODE", "shed")
+    route = respx.get("https://api.ynab.com/v1/user").respond(200, json={"data": {}})
+
+    path = Path(__file__).resolve().parents[1] / "scripts" / "run_http.py"
+    module_spec = importlib.util.spec_from_file_location("run_http", path)
+    assert module_spec is not None and module_spec.loader is not None
+    run_http = importlib.util.module_from_spec(module_spec)
+    module_spec.loader.exec_module(run_http)
+    servers: list[FastMCP] = []
+    monkeypatch.setattr(FastMCP, "run", lambda self, **_kwargs: servers.append(self))
+    run_http.main()
+
+    async def _call(token: str) -> bool:
+        async with _http_client(servers[0], token) as client:
+            result = await client.call_tool("get_user", {}, raise_on_error=False)
+            return not result.is_error
+
+    async def _scenario() -> list[bool]:
+        return [await _call(token) for token in ("alice", "bob", "alice")]
+
+    # bob has a window of his own; alice's second call is shed
+    assert asyncio.run(_scenario()) == [True, True, False]
+    assert route.call_count == 2
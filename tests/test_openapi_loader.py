@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import httpx
+import pytest
+import respx
+
+from ynab_mcp_server import openapi_loader as loader
+
+SPEC_URL = "https://example.test/open_api_spec.yaml"
+SPEC_YAML = "openapi: 3.0.0\ninfo:\n  title: Test\n  version: 0.0.1\npaths: {}\n"
+
+
+@pytest.fixture
+def cache_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    path = tmp_path / "open_api_spec.yaml"
+    monkeypatch.setenv(loader.CACHE_ENV, str(path))
+    return path
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_compiled_artifact_skips_parsing(cache_path: Path, monkeypatch: pytest.MonkeyPatch):
+    respx.get(SPEC_URL).mock(return_value=httpx.Response(200, text=SPEC_YAML))
+
+    spec = await loader.fetch_openapi_spec(SPEC_URL)
+    assert spec["info"]["title"] == "Test"
+    assert loader._compiled_path(cache_path).exists()
+
+    def _fail(_text: str):
+        raise AssertionError("spec should be loaded from the compiled artifact")
+
+    monkeypatch.setattr(loader, "_parse_spec", _fail)
+    again = await loader.fetch_openapi_spec(SPEC_URL)
+    assert again == spec
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_compiled_artifact_ignored_when_source_changes(cache_path: Path):
+    route = respx.get(SPEC_URL)
+    route.mock(return_value=httpx.Response(200, text=SPEC_YAML))
+    await loader.fetch_openapi_spec(SPEC_URL)
+
+    route.mock(return_value=httpx.Response(200, text=SPEC_YAML.replace("Test", "Changed")))
+    spec = await loader.fetch_openapi_spec(SPEC_URL)
+    assert spec["info"]["title"] == "Changed"
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_compile_spec_writes_artifact(cache_path: Path):
+    respx.get(SPEC_URL).mock(return_value=httpx.Response(200, text=SPEC_YAML))
+
+    path = await loader.compile_spec(SPEC_URL)
+    assert path == loader._compiled_path(cache_path)
+    digest = loader._spec_digest(SPEC_YAML)
+    assert loader._load_compiled(path, digest) == loader._parse_spec(SPEC_YAML)
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_conditional_request_reuses_cache_on_304(cache_path: Path):
+    route = respx.get(SPEC_URL)
+    route.mock(return_value=httpx.Response(200, text=SPEC_YAML, headers={"ETag": '"v1"'}))
+    first = await loader.fetch_openapi_spec(SPEC_URL)
+
+    route.mock(return_value=httpx.Response(304))
+    second = await loader.fetch_openapi_spec(SPEC_URL)
+
+    assert route.calls.last.request.headers.get("If-None-Match") == '"v1"'
+    assert second == first
+
+
+@pytest.mark.asyncio
+async def test_offline_first_returns_cache_and_refreshes_in_background(
+    cache_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    cache_path.write_text(SPEC_YAML, encoding="utf-8")
+    refreshed: list[str] = []
+    monkeypatch.setattr(
+        loader, "_refresh_in_background", lambda url, *_args: refreshed.append(url)
+    )
+
+    spec = await loader.fetch_openapi_spec(SPEC_URL, offline_first=True)
+
+    assert spec["info"]["title"] == "Test"
+    assert refreshed == [SPEC_URL]
+
+
+def test_concurrent_compiled_writes_never_share_a_temp_file(tmp_path: Path):
+    path = tmp_path / "open_api_spec.yaml.compiled"
+    spec = {"paths": {f"/p{i}": {} for i in range(2000)}}
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(loader._write_compiled, path, "d", spec) for _ in range(32)]
+        for future in futures:
+            future.result()
+
+    assert loader._load_compiled(path, "d") == spec
+    assert [p.name for p in tmp_path.iterdir()] == [path.name]
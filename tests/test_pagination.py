@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import httpx
+import pytest
+import respx
+from fastmcp import Client
+
+from ynab_mcp_server import server as server_mod
+from ynab_mcp_server.pagination import _load, decode_cursor, encode_cursor
+
+SPEC = {
+    "openapi": "3.0.0",
+    "info": {"title": "Test YNAB", "version": "0.0.1"},
+    "servers": [{"url": "https://api.ynab.com/v1"}],
+    "paths": {},
+}
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor("abc", 200)) == ("abc", 200)
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_transactions_are_paged_from_one_snapshot(monkeypatch: pytest.MonkeyPatch):
+    async def fake_fetch_openapi_spec(*_args, **_kwargs):  # type: ignore[no-redef]
+        return SPEC
+
+    monkeypatch.setattr(server_mod, "fetch_openapi_spec", fake_fetch_openapi_spec)
+
+    transactions = [{"id": f"t{i}", "amount": i} for i in range(5)]
+    route = respx.get("https://api.ynab.com/v1/budgets/b1/transactions").mock(
+        return_value=httpx.Response(
+            200, json={"data": {"transactions": transactions, "server_knowledge": 9}}
+        )
+    )
+
+    mcp = await server_mod.create_server(token="T", enable_paging=True, exclude_tags={"Payees"})
+    client = Client(mcp)
+    async with client:
+        names = {t.name for t in await client.list_tools()}
+        assert "get_transactions_page" in names
+        assert "get_payees_page" not in names
+
+        seen: list[str] = []
+        cursor = None
+        while True:
+            args = {"budget_id": "b1", "limit": 2}
+            if cursor:
+                args["cursor"] = cursor
+            page = (await client.call_tool("get_transactions_page", args)).structured_content
+            assert page["total"] == 5
+            assert page["data"]["server_knowledge"] == 9
+            seen += [t["id"] for t in page["data"]["transactions"]]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        with pytest.raises(Exception):
+            await client.call_tool(
+                "get_transactions_page",
+                {"budget_id": "other", "cursor": encode_cursor("missing", 2)},
+            )
+
+    assert seen == [t["id"] for t in transactions]
+    assert route.call_count == 1
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_budget_id_cannot_escape_its_path_segment():
+    route = respx.route(host="api.ynab.com").respond(
+        200, json={"data": {"payees": [], "server_knowledge": 1}}
+    )
+    async with httpx.AsyncClient(base_url="https://api.ynab.com/v1/") as client:
+        await _load(client, "b1/accounts?x=", "payees")
+    assert route.calls.last.request.url.raw_path == b"/v1/budgets/b1%2Faccounts%3Fx%3D/payees"
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+
+import httpx
+import pytest
+import respx
+from fastmcp import Client
+
+from ynab_mcp_server import server as server_mod
+from ynab_mcp_server.lifecycle import ClientLifecycle
+from ynab_mcp_server.transports import PooledTransport
+
+SPEC = {
+    "openapi": "3.0.0",
+    "info": {"title": "Test YNAB", "version": "0.0.1"},
+    "servers": [{"url": "https://api.ynab.com/v1"}],
+    "paths": {},
+}
+
+
+@respx.mock
+def test_pooled_transport_follows_event_loop():
+    respx.get("https://api.ynab.com/v1/user").respond(200, json={})
+    pool = PooledTransport()
+    seen: list[httpx.AsyncHTTPTransport | None] = []
+
+    async def _call() -> None:
+        async with httpx.AsyncClient(transport=pool) as client:
+            await client.get("https://api.ynab.com/v1/user")
+            seen.append(pool._transport)
+        # Closing the client drops the pool; the next request reopens it
+        async with httpx.AsyncClient(transport=pool) as client:
+            await client.get("https://api.ynab.com/v1/user")
+            seen.append(pool._transport)
+
+    asyncio.run(_call())
+    asyncio.run(_call())
+    assert all(t is not None for t in seen)
+    assert len({id(t) for t in seen}) == 4
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_spec_fetch_shares_pool_without_credentials(
+    monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+):
+    clients: list[httpx.AsyncClient] = []
+    respx.get("https://example.test/spec.json").respond(200, json=SPEC)
+
+    async def fake_fetch_openapi_spec(*_args, client=None, **_kwargs):  # type: ignore[no-redef]
+        clients.append(client)
+        await client.get("https://example.test/spec.json")
+        assert client._transport.is_open
+        return SPEC
+
+    monkeypatch.setattr(server_mod, "fetch_openapi_spec", fake_fetch_openapi_spec)
+    monkeypatch.setattr(server_mod, "_http2_available", lambda: False)
+
+    with caplog.at_level(logging.WARNING, logger=server_mod.__name__):
+        await server_mod.create_server(
+            token="T", http2=True, connect_timeout=2.0, max_connections=4
+        )
+
+    (spec_client,) = clients
+    assert "Authorization" not in spec_client.headers
+    assert isinstance(spec_client._transport, PooledTransport)
+    # The spec connection is not left open for a loop that will not serve
+    assert not spec_client._transport.is_open
+    assert spec_client.timeout.connect == 2.0
+    assert spec_client.timeout.read == 30.0
+    assert spec_client._transport._kwargs["http2"] is False
+    assert spec_client._transport._kwargs["limits"].max_connections == 4
+    assert "HTTP/2 requested" in caplog.text
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_sessions_warm_up_and_close_pool(monkeypatch: pytest.MonkeyPatch):
+    async def fake_fetch_openapi_spec(*_args, **_kwargs):  # type: ignore[no-redef]
+        return SPEC
+
+    monkeypatch.setattr(server_mod, "fetch_openapi_spec", fake_fetch_openapi_spec)
+    warm = respx.head("https://api.ynab.com/v1").respond(401)
+
+    mcp = await server_mod.create_server(token="T", warm_up=True)
+    async with Client(mcp), Client(mcp):
+        pass
+    assert warm.call_count == 1
+    async with Client(mcp):
+        pass
+    assert warm.call_count == 2
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_idle_close_is_deferred_and_cancelled_by_new_session():
+    respx.head("https://api.ynab.com/v1").respond(200)
+    pool = PooledTransport()
+    lifecycle = ClientLifecycle(
+        pool, warm_up_url="https://api.ynab.com/v1", idle_close_after=0.05
+    )
+
+    async with lifecycle.lifespan(None):
+        assert pool.is_open
+    assert pool.is_open
+    async with lifecycle.lifespan(None):
+        await asyncio.sleep(0.1)
+        assert pool.is_open
+    await asyncio.sleep(0.1)
+    assert not pool.is_open
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+import respx
+
+from ynab_mcp_server import server as server_mod
+from ynab_mcp_server.profiling import StartupProfile, laps
+
+SPEC = {
+    "openapi": "3.0.0",
+    "info": {"title": "Test YNAB", "version": "0.0.1"},
+    "servers": [{"url": "https://api.ynab.com/v1"}],
+    "paths": {},
+}
+
+
+def test_laps_are_noops_without_profile():
+    startup = laps()
+    startup.next("anything")
+    startup.stop()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_startup_phases_are_recorded(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    monkeypatch.setenv("YNAB_MCP_SPEC_CACHE", str(tmp_path / "spec.json"))
+    respx.get("https://example.test/spec.json").respond(200, text=json.dumps(SPEC))
+
+    profile = StartupProfile()
+    profile.activate()
+    await server_mod.create_server(token="T", spec_url="https://example.test/spec.json")
+
+    assert list(profile.phases) == [
+        "spec fetch",
+        "spec parse",
+        "transport setup",
+        "tool generation",
+        "route registration",
+    ]
+    assert all(seconds >= 0 for seconds in profile.phases.values())
+    report = profile.report()
+    assert "tool generation" in report and "total" in report
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import httpx
+import pytest
+import respx
+from fastmcp import Client
+
+from ynab_mcp_server import server as server_mod
+from ynab_mcp_server.projection import compact_schema, project
+
+SPEC = {
+    "openapi": "3.0.0",
+    "info": {"title": "Test YNAB", "version": "0.0.1"},
+    "servers": [{"url": "https://api.ynab.com/v1"}],
+    "paths": {
+        "/budgets/{budget_id}/transactions": {
+            "parameters": [
+                {"name": "budget_id", "in": "path", "required": True, "schema": {"type": "string"}}
+            ],
+            "get": {
+                "operationId": "getTransactions",
+                "tags": ["Transactions"],
+                "responses": {
+                    "200": {
+                        "description": "ok",
+                        "content": {
+                            "application/json": {
+                                "schema": {
+                                    "type": "object",
+                                    "required": ["data"],
+                                    "properties": {
+                                        "data": {
+                                            "type": "object",
+                                            "description": "Response data",
+                                            "required": ["transactions", "server_knowledge"],
+                                            "properties": {
+                                                "transactions": {
+                                                    "type": "array",
+                                                    "items": {
+                                                        "type": "object",
+                                                        "required": ["id", "amount", "memo"],
+                                                        "properties": {
+                                                            "id": {"type": "string"},
+                                                            "amount": {"type": "integer"},
+                                                            "memo": {
+                                                                "type": "string",
+                                                                "example": "Coffee",
+                                                            },
+                                                        },
+                                                    },
+                                                },
+                                                "server_knowledge": {"type": "integer"},
+                                            },
+                                        }
+                                    },
+                                }
+                            }
+                        },
+                    }
+                },
+            },
+        },
+    },
+}
+
+
+def test_project_traverses_lists_under_data():
+    payload = {
+        "data": {
+            "transactions": [
+                {"id": "t1", "amount": -1000, "subtransactions": [{"id": "s1", "amount": -500}]},
+                {"id": "t2", "amount": 2000, "subtransactions": []},
+            ],
+            "server_knowledge": 7,
+        }
+    }
+    assert project(payload, ["transactions.id", "transactions.subtransactions.amount"]) == {
+        "data": {
+            "transactions": [
+                {"id": "t1", "subtransactions": [{"amount": -500}]},
+                {"id": "t2", "subtransactions": []},
+            ]
+        }
+    }
+
+
+def test_compact_schema_keeps_property_names():
+    schema = {
+        "type": "object",
+        "description": "drop me",
+        "properties": {"description": {"type": "string", "title": "Description"}},
+    }
+    assert compact_schema(schema) == {
+        "type": "object",
+        "properties": {"description": {"type": "string"}},
+    }
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_fields_argument_projects_tool_result(monkeypatch: pytest.MonkeyPatch):
+    async def fake_fetch_openapi_spec(*_args, **_kwargs):  # type: ignore[no-redef]
+        return SPEC
+
+    monkeypatch.setattr(server_mod, "fetch_openapi_spec", fake_fetch_openapi_spec)
+
+    route = respx.get("https://api.ynab.com/v1/budgets/b1/transactions").mock(
+        return_value=httpx.Response(
+            200,
+            json={
+                "data": {
+                    "transactions": [{"id": "t1", "amount": -1000, "memo": "Coffee"}],
+                    "server_knowledge": 3,
+                }
+            },
+        )
+    )
+
+    mcp = await server_mod.create_server(
+        token="T", enable_projection=True, compact_schemas=True
+    )
+    client = Client(mcp)
+    async with client:
+        tools = {t.name: t for t in await client.list_tools()}
+        tool = tools["get_transactions"]
+        assert "fields" in tool.inputSchema["properties"]
+        assert "Response data" not in str(tool.outputSchema)
+
+        result = await client.call_tool(
+            "get_transactions", {"budget_id": "b1", "fields": ["transactions.amount"]}
+        )
+        assert result.structured_content == {"data": {"transactions": [{"amount": -1000}]}}
+
+        full = await client.call_tool("get_transactions", {"budget_id": "b1"})
+        assert full.structured_content["data"]["server_knowledge"] == 3
+
+    # `fields` is never forwarded upstream
+    assert all("fields" not in str(call.request.url) for call in route.calls)
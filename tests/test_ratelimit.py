@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import httpx
+import pytest
+import respx
+from fastmcp import Client
+
+from ynab_mcp_server import server as server_mod
+from ynab_mcp_server.ratelimit import RateLimiter, RateLimitExceeded
+
+
+def test_slot_opens_when_oldest_request_ages_out():
+    limiter = RateLimiter(limit=2, period=10.0)
+    assert limiter.try_acquire("k", now=0.0) == 0.0
+    assert limiter.try_acquire("k", now=4.0) == 0.0
+    # Window full: the request from t=0 frees its slot at t=10
+    assert limiter.try_acquire("k", now=5.0) == pytest.approx(5.0)
+    assert limiter.try_acquire("k", now=10.0) == 0.0
+    assert limiter.try_acquire("k", now=10.0) == pytest.approx(4.0)
+
+
+def test_burst_then_steady_waits_for_the_burst_to_age_out():
+    limiter = RateLimiter(limit=200, period=3600.0)
+    for i in range(200):
+        assert limiter.try_acquire("k", now=i * 0.01) == 0.0
+    limiter.observe("k", "200/200", now=2.0)
+    # No slot frees up until the burst is an hour old, however long we wait
+    for now in (20.0, 600.0, 3599.0):
+        assert limiter.try_acquire("k", now=now) > 0.0
+    assert limiter.try_acquire("k", now=3600.005) == 0.0
+
+
+def test_observed_header_sets_used_slots():
+    limiter = RateLimiter(limit=200)
+    limiter.observe("k", "195/200", now=0.0)
+    assert limiter.status("k", now=0.0)["remaining"] == 5
+    limiter.observe("k", "3/200", now=1.0)
+    assert limiter.status("k", now=1.0)["remaining"] == 197
+    # Requests made elsewhere are counted from when they were reported
+    assert limiter.status("k", now=3599.0)["remaining"] == 197
+    assert limiter.status("k", now=3600.5)["remaining"] == 200
+
+
+def test_status_does_not_write(tmp_path: Path):
+    limiter = RateLimiter(limit=1, state_path=tmp_path / "ratelimit.sqlite3")
+    assert limiter.status("k", now=0.0)["remaining"] == 1
+    assert limiter._windows.peek("k") == []
+    assert limiter._windows._conn.execute("SELECT COUNT(*) FROM windows").fetchone()[0] == 0
+    limiter.try_acquire("k", now=1.0)
+    assert limiter.status("k", now=2.0, cached=True)["remaining"] == 0
+
+
+def test_sqlite_state_is_shared_between_limiters(tmp_path: Path):
+    path = tmp_path / "ratelimit.sqlite3"
+    a = RateLimiter(limit=1, period=3600.0, state_path=path)
+    b = RateLimiter(limit=1, period=3600.0, state_path=path)
+    assert a.try_acquire("k", now=100.0) == 0.0
+    assert b.try_acquire("k", now=100.0) == pytest.approx(3600.0)
+    assert b.try_acquire("k", now=3700.0) == 0.0
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_shed_mode_fails_fast_and_status_tool(monkeypatch: pytest.MonkeyPatch):
+    spec = {
+        "openapi": "3.0.0",
+        "info": {"title": "Test YNAB", "version": "0.0.1"},
+        "servers": [{"url": "https://api.ynab.com/v1"}],
+        "paths": {
+            "/user": {
+                "get": {
+                    "operationId": "getUser",
+                    "responses": {"200": {"description": "ok"}},
+                }
+            }
+        },
+    }
+
+    async def fake_fetch_openapi_spec(*_args, **_kwargs):  # type: ignore[no-redef]
+        return spec
+
+    monkeypatch.setattr(server_mod, "fetch_openapi_spec", fake_fetch_openapi_spec)
+
+    route = respx.get("https://api.ynab.com/v1/user").mock(
+        return_value=httpx.Response(200, json={"data": {"user": {"id": "u"}}})
+    )
+
+    mcp = await server_mod.create_server(token="T", rate_limit=1, rate_limit_mode="shed")
+    client = Client(mcp)
+    async with client:
+        await client.call_tool("get_user", {})
+        status = await client.call_tool("rate_limit_status", {})
+        assert status.data["remaining"] == 0
+        with pytest.raises(Exception, match="rate limit"):
+            await client.call_tool("get_user", {})
+
+    assert route.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_wait_mode_gives_up_after_max_wait():
+    limiter = RateLimiter(limit=1, period=3600.0, max_wait=0.0)
+    await limiter.acquire("k")
+    with pytest.raises(RateLimitExceeded):
+        await limiter.acquire("k")
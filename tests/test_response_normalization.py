@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import json
+
+import httpx
+import pytest
+import respx
+from fastmcp import Client
+
+from ynab_mcp_server import server as server_mod
+
+
+def test_strip_nulls_inplace_removes_nested_nulls():
+    payload = {
+        "data": {
+            "default_budget": None,
+            "budgets": [{"id": "b1", "memo": None, "tags": [None, "x"]}, None],
+        }
+    }
+    budgets = payload["data"]["budgets"]
+
+    assert server_mod._strip_nulls_inplace(payload) is True
+    assert payload == {"data": {"budgets": [{"id": "b1", "tags": ["x"]}]}}
+    # Lists are edited in place rather than copied
+    assert payload["data"]["budgets"] is budgets
+
+
+def test_strip_nulls_inplace_reports_no_change():
+    payload = {"data": {"budgets": [{"id": "b1"}]}}
+    assert server_mod._strip_nulls_inplace(payload) is False
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_tool_output_has_nulls_removed(monkeypatch: pytest.MonkeyPatch):
+    spec = {
+        "openapi": "3.0.0",
+        "info": {"title": "Test YNAB", "version": "0.0.1"},
+        "servers": [{"url": "https://api.ynab.com/v1"}],
+        "paths": {
+            "/budgets": {
+                "get": {
+                    "operationId": "getBudgets",
+                    "responses": {"200": {"description": "ok"}},
+                }
+            }
+        },
+    }
+
+    async def fake_fetch_openapi_spec(*_args, **_kwargs):  # type: ignore[no-redef]
+        return spec
+
+    monkeypatch.setattr(server_mod, "fetch_openapi_spec", fake_fetch_openapi_spec)
+
+    respx.get("https://api.ynab.com/v1/budgets").mock(
+        return_value=httpx.Response(
+            200,
+            json={
+                "data": {
+                    "budgets": [{"id": "b1", "last_modified_on": None}],
+                    "default_budget": None,
+                }
+            },
+        )
+    )
+
+    mcp = await server_mod.create_server(token="T")
+    client = Client(mcp)
+    async with client:
+        res = await client.call_tool("get_budgets", {})
+
+    assert res.data == {"data": {"budgets": [{"id": "b1"}]}}
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_parsed_body_is_handed_to_json_without_reparsing(monkeypatch: pytest.MonkeyPatch):
+    spec = {
+        "openapi": "3.0.0",
+        "info": {"title": "Test YNAB", "version": "0.0.1"},
+        "servers": [{"url": "https://api.ynab.com/v1"}],
+        "paths": {
+            "/budgets": {
+                "get": {
+                    "operationId": "getBudgets",
+                    "responses": {"200": {"description": "ok"}},
+                }
+            }
+        },
+    }
+
+    async def fake_fetch_openapi_spec(*_args, **_kwargs):  # type: ignore[no-redef]
+        return spec
+
+    monkeypatch.setattr(server_mod, "fetch_openapi_spec", fake_fetch_openapi_spec)
+
+    respx.get("https://api.ynab.com/v1/budgets").mock(
+        return_value=httpx.Response(200, json={"data": {"budgets": [], "default_budget": None}})
+    )
+
+    mcp = await server_mod.create_server(token="T")
+    tool = await mcp._tool_manager.get_tool("get_budgets")
+    api_client: httpx.AsyncClient = tool._client  # type: ignore[attr-defined]
+
+    resp = await api_client.get("/budgets")
+    parsed = resp.json()
+    assert parsed == {"data": {"budgets": []}}
+    assert resp.json() is parsed
+    # Bytes are re-encoded lazily and agree with the parsed object
+    assert json.loads(resp.content) == parsed
+    assert resp.headers["Content-Length"] == str(len(resp.content))
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from ynab_mcp_server.transports import IDEMPOTENT_EXTENSION, RetryTransport
+
+
+def _transport(statuses: list[int], retry_after: str = "0") -> tuple[RetryTransport, list[str]]:
+    calls: list[str] = []
+    pending = list(statuses)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.method)
+        return httpx.Response(pending.pop(0), headers={"Retry-After": retry_after})
+
+    return RetryTransport(httpx.MockTransport(handler), max_retries=2), calls
+
+
+async def _send(transport: RetryTransport, method: str, **kwargs) -> httpx.Response:
+    async with httpx.AsyncClient(transport=transport, base_url="https://api.test") as client:
+        request = client.build_request(method, "/budgets", json={"x": 1}, **kwargs)
+        return await client.send(request)
+
+
+@pytest.mark.asyncio
+async def test_get_is_retried_on_5xx():
+    transport, calls = _transport([503, 502, 200])
+    resp = await _send(transport, "GET")
+    assert resp.status_code == 200
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status", [429, 503])
+async def test_post_without_guard_is_not_retried(status: int):
+    transport, calls = _transport([status, 200])
+    resp = await _send(transport, "POST")
+    assert resp.status_code == status
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_post_is_retried_with_idempotency_guard():
+    transport, calls = _transport([429, 200])
+    assert (await _send(transport, "POST", headers={"Idempotency-Key": "k"})).status_code == 200
+    assert len(calls) == 2
+
+    transport, calls = _transport([503, 200])
+    resp = await _send(transport, "POST", extensions={IDEMPOTENT_EXTENSION: True})
+    assert resp.status_code == 200
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_long_retry_after_is_not_waited_on():
+    transport, calls = _transport([429, 200], retry_after="3600")
+    resp = await _send(transport, "GET")
+    assert resp.status_code == 429
+    assert len(calls) == 1
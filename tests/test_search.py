@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import httpx
+import pytest
+import respx
+from fastmcp import Client
+
+from ynab_mcp_server import server as server_mod
+from ynab_mcp_server.search import TransactionIndex
+
+SPEC = {
+    "openapi": "3.0.0",
+    "info": {"title": "Test YNAB", "version": "0.0.1"},
+    "servers": [{"url": "https://api.ynab.com/v1"}],
+    "paths": {},
+}
+
+TRANSACTIONS = [
+    {"id": "t1", "date": "2024-04-02", "amount": -42170, "payee_name": "Corner Hardware",
+     "memo": "Paint", "account_id": "a1"},
+    {"id": "t2", "date": "2024-05-10", "amount": -12000, "payee_name": "Grocer",
+     "subtransactions": [{"id": "s1", "amount": -12000, "memo": "birthday cake"}]},
+    {"id": "t3", "date": "2023-04-02", "amount": 42170, "payee_name": "Refund Co"},
+]
+
+
+def test_index_text_amount_and_date_lookups():
+    index = TransactionIndex.build(TRANSACTIONS, version=1)
+    assert [d["id"] for d in index.search(query="hardw")[1]] == ["t1"]
+    assert [d["id"] for d in index.search(query="cake")[1]] == ["t2"]
+    assert [d["id"] for d in index.search(min_amount=42170, max_amount=42170)[1]] == ["t1", "t3"]
+    assert [
+        d["id"]
+        for d in index.search(min_amount=42170, max_amount=42170, since="2024-03-01")[1]
+    ] == ["t1"]
+
+    index.apply([{**TRANSACTIONS[0], "deleted": True}, {"id": "t4", "date": "2024-06-01",
+                 "amount": -1, "payee_name": "Hardware Two"}], version=2)
+    assert [d["id"] for d in index.search(query="hardware")[1]] == ["t4"]
+    assert index.search(min_amount=42170, max_amount=42170)[0] == 1
+    assert index.version == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("enable_mirror", [True, False])
+@respx.mock
+async def test_search_tool_follows_mirror_deltas(
+    monkeypatch: pytest.MonkeyPatch, enable_mirror: bool
+):
+    async def fake_fetch_openapi_spec(*_args, **_kwargs):  # type: ignore[no-redef]
+        return SPEC
+
+    monkeypatch.setattr(server_mod, "fetch_openapi_spec", fake_fetch_openapi_spec)
+
+    def _transactions(request: httpx.Request) -> httpx.Response:
+        if "last_knowledge_of_server" in request.url.params:
+            changes = [{"id": "t5", "date": "2024-07-01", "amount": -5000, "payee_name": "Cafe"}]
+            return httpx.Response(
+                200, json={"data": {"transactions": changes, "server_knowledge": 2}}
+            )
+        return httpx.Response(
+            200, json={"data": {"transactions": TRANSACTIONS, "server_knowledge": 1}}
+        )
+
+    route = respx.get("https://api.ynab.com/v1/budgets/b1/transactions").mock(
+        side_effect=_transactions
+    )
+
+    mcp = await server_mod.create_server(
+        token="T", enable_search=True, enable_mirror=enable_mirror, mirror_max_age=60.0
+    )
+    client = Client(mcp)
+    async with client:
+        found = await client.call_tool(
+            "search_transactions", {"budget_id": "b1", "amount": 42.17, "until": "2024-12-31"}
+        )
+        assert found.structured_content["total"] == 2
+
+        # Served from the fresh mirror without another request
+        await client.call_tool("search_transactions", {"budget_id": "b1", "query": "grocer"})
+        assert route.call_count == 1
+
+        # A write marks the budget stale; the next search syncs a delta into the index
+        respx.post("https://api.ynab.com/v1/budgets/b1/transactions").mock(
+            return_value=httpx.Response(201, json={"data": {"transaction_ids": ["t5"]}})
+        )
+        await client.call_tool(
+            "bulk_import_transactions",
+            {
+                "budget_id": "b1",
+                "format": "json",
+                "content": '[{"account_id": "a1", "date": "2024-07-01", "amount": -5}]',
+            },
+        )
+        found = await client.call_tool("search_transactions", {"budget_id": "b1", "query": "caf"})
+        assert [t["id"] for t in found.structured_content["transactions"]] == ["t5"]
+
+    assert route.call_count == 2
+    assert "last_knowledge_of_server" in route.calls[1].request.url.params
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_budget_id_cannot_escape_its_path_segment(monkeypatch: pytest.MonkeyPatch):
+    async def fake_fetch_openapi_spec(*_args, **_kwargs):  # type: ignore[no-redef]
+        return SPEC
+
+    monkeypatch.setattr(server_mod, "fetch_openapi_spec", fake_fetch_openapi_spec)
+    route = respx.route(host="api.ynab.com").respond(
+        200, json={"data": {"transactions": [], "payees": [], "server_knowledge": 1}}
+    )
+
+    mcp = await server_mod.create_server(token="T", enable_search=True)
+    async with Client(mcp) as client:
+        args = {"budget_id": "b1/accounts?x=", "query": "x"}
+        await client.call_tool("search_transactions", args)
+        await client.call_tool("search_payees", args)
+
+    assert [call.request.url.raw_path for call in route.calls] == [
+        b"/v1/budgets/b1%2Faccounts%3Fx%3D/transactions",
+        b"/v1/budgets/b1%2Faccounts%3Fx%3D/payees",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_search_tools_respect_tag_filters(monkeypatch: pytest.MonkeyPatch):
+    async def fake_fetch_openapi_spec(*_args, **_kwargs):  # type: ignore[no-redef]
+        return SPEC
+
+    monkeypatch.setattr(server_mod, "fetch_openapi_spec", fake_fetch_openapi_spec)
+
+    async def _names(**tags: set[str]) -> set[str]:
+        mcp = await server_mod.create_server(token="T", enable_search=True, **tags)
+        async with Client(mcp) as client:
+            return {t.name for t in await client.list_tools()} & {
+                "search_transactions",
+                "search_payees",
+            }
+
+    assert await _names(exclude_tags={"Payees"}) == {"search_transactions"}
+    assert await _names(include_tags={"Payees"}) == {"search_payees"}
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from ynab_mcp_server.transports import SingleFlightTransport
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_gets_share_one_upstream_call():
+    release = asyncio.Event()
+    calls: list[str] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(str(request.url))
+        await release.wait()
+        return httpx.Response(200, json={"data": {"categories": []}})
+
+    transport = SingleFlightTransport(httpx.MockTransport(handler))
+    async with httpx.AsyncClient(transport=transport, base_url="https://api.test") as client:
+        first = asyncio.create_task(client.get("/budgets/b1/categories"))
+        second = asyncio.create_task(client.get("/budgets/b1/categories"))
+        other = asyncio.create_task(client.get("/budgets/b2/categories"))
+        await asyncio.sleep(0.01)
+        release.set()
+        responses = await asyncio.gather(first, second, other)
+
+    assert len(calls) == 2
+    assert [r.json() for r in responses[:2]] == [{"data": {"categories": []}}] * 2
+    assert responses[0] is not responses[1]
+
+
+@pytest.mark.asyncio
+async def test_different_tokens_are_not_coalesced():
+    release = asyncio.Event()
+    calls: list[str | None] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.headers.get("Authorization"))
+        await release.wait()
+        return httpx.Response(200, json={})
+
+    transport = SingleFlightTransport(httpx.MockTransport(handler))
+    async with httpx.AsyncClient(transport=transport, base_url="https://api.test") as client:
+        tasks = [
+            asyncio.create_task(client.get("/user", headers={"Authorization": f"Bearer {t}"}))
+            for t in ("a", "b")
+        ]
+        await asyncio.sleep(0.01)
+        release.set()
+        await asyncio.gather(*tasks)
+
+    assert sorted(c or "" for c in calls) == ["Bearer a", "Bearer b"]
+
+
+@pytest.mark.asyncio
+async def test_errors_propagate_to_waiters():
+    release = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await release.wait()
+        raise httpx.ConnectError("boom", request=request)
+
+    transport = SingleFlightTransport(httpx.MockTransport(handler))
+    async with httpx.AsyncClient(transport=transport, base_url="https://api.test") as client:
+        tasks = [asyncio.create_task(client.get("/user")) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert all(isinstance(r, httpx.ConnectError) for r in results)
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+import respx
+from fastmcp import Client
+
+from ynab_mcp_server import server as server_mod
+from ynab_mcp_server.tracing import OtlpHttpExporter, Span, Tracer
+
+SPEC = {
+    "openapi": "3.0.0",
+    "info": {"title": "Test YNAB", "version": "0.0.1"},
+    "servers": [{"url": "https://api.ynab.com/v1"}],
+    "paths": {
+        "/user": {
+            "get": {
+                "operationId": "getUser",
+                "tags": ["User"],
+                "responses": {"200": {"description": "ok"}},
+            }
+        },
+    },
+}
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_tool_call_trace_has_http_and_hook_children(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+):
+    async def fake_fetch_openapi_spec(*_args, **_kwargs):  # type: ignore[no-redef]
+        return SPEC
+
+    monkeypatch.setattr(server_mod, "fetch_openapi_spec", fake_fetch_openapi_spec)
+    respx.get("https://api.ynab.com/v1/user").respond(200, json={"data": {"user": {"id": "u"}}})
+    trace_file = tmp_path / "spans.jsonl"
+
+    mcp = await server_mod.create_server(token="T", trace_file=trace_file)
+    async with Client(mcp) as client:
+        await client.call_tool("get_user", {})
+
+    spans = [json.loads(line) for line in trace_file.read_text().splitlines()]
+    by_name = {s["name"]: s for s in spans}
+    assert set(by_name) == {"tools/call get_user", "GET /user", "normalize response"}
+    root = by_name["tools/call get_user"]
+    assert root["parent_span_id"] is None
+    assert {s["trace_id"] for s in spans} == {root["trace_id"]}
+    for name in ("GET /user", "normalize response"):
+        assert by_name[name]["parent_span_id"] == root["span_id"]
+    http = by_name["GET /user"]["attributes"]
+    assert http["ynab.operation"] == "get_user"
+    assert http["http.response.status_code"] == 200
+
+
+def test_fast_traces_are_dropped_and_otlp_payload_shape():
+    exported: list[list[Span]] = []
+
+    class _Collect:
+        def export(self, spans: list[Span]) -> None:
+            exported.append(spans)
+
+    tracer = Tracer([_Collect()], min_duration=60.0)
+    with tracer.span("fast"):
+        with tracer.span("child"):
+            pass
+    assert exported == []
+
+    tracer.min_duration = 0.0
+    with pytest.raises(ValueError):
+        with tracer.span("root", attributes={"n": 1}):
+            raise ValueError("boom")
+    (spans,) = exported
+    payload = OtlpHttpExporter("http://collector:4318").payload(spans)
+    (otlp,) = payload["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert otlp["name"] == "root"
+    assert otlp["status"] == {"code": 2, "message": "ValueError: boom"}
+    assert otlp["attributes"] == [{"key": "n", "value": {"intValue": "1"}}]
+    assert len(otlp["traceId"]) == 32 and len(otlp["spanId"]) == 16
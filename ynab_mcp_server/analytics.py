@@ -0,0 +1,393 @@
+"""Columnar aggregations over a budget's transactions.
+
+Transactions are flattened once into parallel columns (day, month, milliunit
+amount, and integer codes for category, payee and account), with split
+transactions expanded into their subtransactions. Group-bys, rolling sums and
+percentiles then run over those columns. NumPy is used when installed
+(`pip install 'ynab-mcp-server[analytics]'`); otherwise the same operations run
+over `array` columns in pure Python.
+"""
+
+from __future__ import annotations
+
+import time
+from array import array
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Literal
+from urllib.parse import quote
+
+import httpx
+from fastmcp import FastMCP
+
+from .mirror import MIRROR_EXTENSION, USE_MIRROR_EXTENSION, MirrorSnapshot
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when numpy is absent
+    np = None
+
+BACKEND = "numpy" if np is not None else "python"
+
+GroupBy = Literal["category", "payee", "account", "month", "category_month"]
+_DIMENSIONS = ("category", "payee", "account")
+# Month is packed below the dimension code in combined group keys
+_MONTH_BITS = 20
+
+
+def _month_index(iso: str) -> int:
+    return int(iso[:4]) * 12 + int(iso[5:7]) - 1
+
+
+def _month_label(index: int) -> str:
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+def _day(iso: str | None) -> int | None:
+    return date.fromisoformat(iso).toordinal() if iso else None
+
+
+class _Codes:
+    """Assigns dense integer codes to ids and remembers a display name for each."""
+
+    def __init__(self) -> None:
+        self.ids: list[str | None] = []
+        self.names: list[str | None] = []
+        self._codes: dict[str | None, int] = {}
+
+    def code(self, id_: str | None, name: str | None) -> int:
+        code = self._codes.get(id_)
+        if code is None:
+            code = self._codes[id_] = len(self.ids)
+            self.ids.append(id_)
+            self.names.append(name)
+        elif name and not self.names[code]:
+            self.names[code] = name
+        return code
+
+
+@dataclass
+class TransactionColumns:
+    days: Any
+    months: Any
+    amounts: Any
+    codes: dict[str, Any]
+    labels: dict[str, _Codes]
+
+    def __len__(self) -> int:
+        return len(self.amounts)
+
+    @classmethod
+    def from_transactions(
+        cls, transactions: Sequence[dict[str, Any]], *, include_transfers: bool = False
+    ) -> TransactionColumns:
+        days, months, amounts = array("i"), array("i"), array("q")
+        codes = {d: array("i") for d in _DIMENSIONS}
+        labels = {d: _Codes() for d in _DIMENSIONS}
+
+        def _row(day: int, month: int, item: dict[str, Any], parent: dict[str, Any]) -> None:
+            days.append(day)
+            months.append(month)
+            amounts.append(int(item.get("amount") or 0))
+            for dim in _DIMENSIONS:
+                id_ = item.get(f"{dim}_id") or parent.get(f"{dim}_id")
+                name = item.get(f"{dim}_name") or parent.get(f"{dim}_name")
+                codes[dim].append(labels[dim].code(id_, name))
+
+        for txn in transactions:
+            if txn.get("deleted") or not txn.get("date"):
+                continue
+            if not include_transfers and txn.get("transfer_account_id"):
+                continue
+            day, month = date.fromisoformat(txn["date"]).toordinal(), _month_index(txn["date"])
+            subs = [s for s in txn.get("subtransactions") or [] if not s.get("deleted")]
+            if subs:
+                for sub in subs:
+                    if include_transfers or not sub.get("transfer_account_id"):
+                        _row(day, month, sub, txn)
+            else:
+                _row(day, month, txn, txn)
+
+        if np is not None:
+            return cls(
+                np.frombuffer(days, dtype=np.int32),
+                np.frombuffer(months, dtype=np.int32),
+                np.frombuffer(amounts, dtype=np.int64),
+                {d: np.frombuffer(c, dtype=np.int32) for d, c in codes.items()},
+                labels,
+            )
+        return cls(days, months, amounts, codes, labels)
+
+    def select(
+        self,
+        *,
+        since: str | None = None,
+        until: str | None = None,
+        flow: Literal["outflow", "inflow", "all"] = "outflow",
+        category_id: str | None = None,
+    ) -> Any:
+        """Row positions matching a date range, direction and optional category."""
+        lo, hi = _day(since), _day(until)
+        cat = self.labels["category"]._codes.get(category_id, -1) if category_id else None
+        if np is not None:
+            mask = np.ones(len(self), dtype=bool)
+            if lo is not None:
+                mask &= self.days >= lo
+            if hi is not None:
+                mask &= self.days <= hi
+            if flow == "outflow":
+                mask &= self.amounts < 0
+            elif flow == "inflow":
+                mask &= self.amounts > 0
+            if cat is not None:
+                mask &= self.codes["category"] == cat
+            return np.nonzero(mask)[0]
+        return [
+            i
+            for i in range(len(self))
+            if (lo is None or self.days[i] >= lo)
+            and (hi is None or self.days[i] <= hi)
+            and (
+                flow == "all"
+                or (flow == "outflow" and self.amounts[i] < 0)
+                or (flow == "inflow" and self.amounts[i] > 0)
+            )
+            and (cat is None or self.codes["category"][i] == cat)
+        ]
+
+    def _keys(self, group_by: GroupBy, rows: Any) -> Any:
+        if group_by == "month":
+            return self.months[rows] if np is not None else [self.months[i] for i in rows]
+        dim = "category" if group_by == "category_month" else group_by
+        codes = self.codes[dim]
+        if group_by == "category_month":
+            if np is not None:
+                return (codes[rows].astype(np.int64) << _MONTH_BITS) | self.months[rows]
+            return [(codes[i] << _MONTH_BITS) | self.months[i] for i in rows]
+        return codes[rows] if np is not None else [codes[i] for i in rows]
+
+    def group_totals(self, group_by: GroupBy, rows: Any) -> list[tuple[int, int, int]]:
+        """(group key, total milliunits, row count) per group, sorted by key."""
+        keys = self._keys(group_by, rows)
+        if np is not None:
+            if len(rows) == 0:
+                return []
+            uniq, inverse = np.unique(keys, return_inverse=True)
+            # float64 sums of integer milliunits are exact below 2**53
+            totals = np.bincount(inverse, weights=self.amounts[rows], minlength=len(uniq))
+            counts = np.bincount(inverse, minlength=len(uniq))
+            return [
+                (int(k), int(round(t)), int(c))
+                for k, t, c in zip(uniq.tolist(), totals.tolist(), counts.tolist())
+            ]
+        acc: dict[int, list[int]] = {}
+        for key, i in zip(keys, rows):
+            slot = acc.setdefault(key, [0, 0])
+            slot[0] += self.amounts[i]
+            slot[1] += 1
+        return [(k, t, c) for k, (t, c) in sorted(acc.items())]
+
+    def describe_key(self, group_by: GroupBy, key: int) -> dict[str, Any]:
+        if group_by == "month":
+            return {"month": _month_label(key)}
+        dim = "category" if group_by == "category_month" else group_by
+        code = key >> _MONTH_BITS if group_by == "category_month" else key
+        out = {f"{dim}_id": self.labels[dim].ids[code], f"{dim}_name": self.labels[dim].names[code]}
+        if group_by == "category_month":
+            out["month"] = _month_label(key & ((1 << _MONTH_BITS) - 1))
+        return out
+
+    def monthly_totals(self, rows: Any) -> tuple[int, list[int]]:
+        """(first month index, totals for each month through the last one)."""
+        if len(rows) == 0:
+            return 0, []
+        if np is not None:
+            months = self.months[rows]
+            first = int(months.min())
+            totals = np.bincount(
+                months - first, weights=self.amounts[rows], minlength=int(months.max()) - first + 1
+            )
+            return first, [int(round(t)) for t in totals.tolist()]
+        months = [self.months[i] for i in rows]
+        first = min(months)
+        totals = [0] * (max(months) - first + 1)
+        for month, i in zip(months, rows):
+            totals[month - first] += self.amounts[i]
+        return first, totals
+
+    def percentiles(self, rows: Any, qs: Sequence[float]) -> list[int]:
+        """Percentiles (linear interpolation) of absolute amounts."""
+        if len(rows) == 0:
+            return []
+        if np is not None:
+            values = np.abs(self.amounts[rows])
+            return [int(round(v)) for v in np.percentile(values, list(qs)).tolist()]
+        values = sorted(abs(self.amounts[i]) for i in rows)
+        out = []
+        for q in qs:
+            pos = (len(values) - 1) * q / 100
+            lo = int(pos)
+            hi = min(lo + 1, len(values) - 1)
+            out.append(int(round(values[lo] + (values[hi] - values[lo]) * (pos - lo))))
+        return out
+
+
+def rolling_sums(values: Sequence[int], window: int) -> list[int]:
+    """Trailing sums over `window` entries (shorter at the start)."""
+    out, running = [], 0
+    for i, v in enumerate(values):
+        running += v
+        if i >= window:
+            running -= values[i - window]
+        out.append(running)
+    return out
+
+
+class ColumnStore:
+    """Keeps each budget's columns until its server_knowledge moves on.
+
+    Transactions are read through the server's mirror (see
+    `MirrorTransport(opt_in=True)`), so repeated queries within the mirror's
+    `max_age` make no API call and later ones fetch only a delta. Columns are
+    keyed by credentials namespace, so tokens never share them.
+    """
+
+    def __init__(self) -> None:
+        self._columns: dict[tuple[str, str, bool], tuple[Any, TransactionColumns]] = {}
+
+    def forget(self, namespace: str) -> None:
+        """Drop every budget's columns held for a namespace."""
+        for key in [k for k in self._columns if k[0] == namespace]:
+            del self._columns[key]
+
+    async def get(
+        self,
+        client: httpx.AsyncClient,
+        namespace: str,
+        budget_id: str,
+        *,
+        include_transfers: bool = False,
+    ) -> TransactionColumns:
+        response = await client.get(
+            f"budgets/{quote(budget_id, safe='')}/transactions",
+            extensions={USE_MIRROR_EXTENSION: True},
+        )
+        mirrored = response.extensions.get(MIRROR_EXTENSION)
+        version: int | None
+        if isinstance(mirrored, MirrorSnapshot):
+            items, version = mirrored.items, mirrored.server_knowledge
+        else:
+            data = (response.json() or {}).get("data") or {}
+            items, version = data.get("transactions") or [], data.get("server_knowledge")
+        key = (namespace, budget_id, include_transfers)
+        cached = self._columns.get(key)
+        if cached is not None and version is not None and cached[0] == version:
+            return cached[1]
+        columns = TransactionColumns.from_transactions(items, include_transfers=include_transfers)
+        self._columns[key] = (version, columns)
+        return columns
+
+
+def _units(milliunits: int) -> float:
+    return milliunits / 1000
+
+
+def register_analytics_tools(
+    mcp: FastMCP,
+    client: httpx.AsyncClient,
+    store: ColumnStore,
+    namespace: Callable[[], str],
+) -> None:
+    """Register the analytics tools; `namespace` returns the caller's credentials namespace."""
+    @mcp.tool(name="spending_summary", tags={"analytics"})
+    async def spending_summary(
+        budget_id: str,
+        group_by: GroupBy = "category",
+        since: str | None = None,
+        until: str | None = None,
+        flow: Literal["outflow", "inflow", "all"] = "outflow",
+        include_transfers: bool = False,
+        top: int | None = None,
+    ) -> dict[str, Any]:
+        """Total transaction amounts per category, payee, account, month or category+month.
+
+        Computed locally over the budget's transactions (splits expanded,
+        transfers excluded by default). Dates are YYYY-MM-DD and inclusive.
+        `flow` picks outflows (default), inflows or both. Totals are in milliunits
+        and currency units. `top` keeps the largest groups by absolute total.
+        """
+        started = time.perf_counter()
+        cols = await store.get(
+            client, namespace(), budget_id, include_transfers=include_transfers
+        )
+        rows = cols.select(since=since, until=until, flow=flow)
+        groups = [
+            {
+                **cols.describe_key(group_by, k),
+                "total_milliunits": t,
+                "total": _units(t),
+                "count": c,
+            }
+            for k, t, c in cols.group_totals(group_by, rows)
+        ]
+        if top is not None:
+            groups = sorted(groups, key=lambda g: -abs(g["total_milliunits"]))[: max(0, top)]
+        return {
+            "groups": groups,
+            "transactions": len(rows),
+            "backend": BACKEND,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+
+    @mcp.tool(name="monthly_rolling_totals", tags={"analytics"})
+    async def monthly_rolling_totals(
+        budget_id: str,
+        window: int = 3,
+        category_id: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        flow: Literal["outflow", "inflow", "all"] = "outflow",
+    ) -> dict[str, Any]:
+        """Monthly totals with a trailing `window`-month rolling sum and average.
+
+        Optionally limited to one category. Amounts are in milliunits.
+        """
+        cols = await store.get(client, namespace(), budget_id)
+        rows = cols.select(since=since, until=until, flow=flow, category_id=category_id)
+        first, totals = cols.monthly_totals(rows)
+        window = max(1, window)
+        rolling = rolling_sums(totals, window)
+        return {
+            "window": window,
+            "months": [
+                {
+                    "month": _month_label(first + i),
+                    "total_milliunits": t,
+                    "rolling_milliunits": r,
+                    "rolling_average_milliunits": round(r / min(window, i + 1)),
+                }
+                for i, (t, r) in enumerate(zip(totals, rolling))
+            ],
+            "backend": BACKEND,
+        }
+
+    @mcp.tool(name="amount_percentiles", tags={"analytics"})
+    async def amount_percentiles(
+        budget_id: str,
+        percentiles: list[float] | None = None,
+        category_id: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        flow: Literal["outflow", "inflow", "all"] = "outflow",
+    ) -> dict[str, Any]:
+        """Percentiles of transaction sizes (absolute milliunits), default 50/90/99."""
+        qs = [min(100.0, max(0.0, q)) for q in (percentiles or [50.0, 90.0, 99.0])]
+        cols = await store.get(client, namespace(), budget_id)
+        rows = cols.select(since=since, until=until, flow=flow, category_id=category_id)
+        values = cols.percentiles(rows, qs)
+        return {
+            "transactions": len(rows),
+            "percentiles": [{"percentile": q, "milliunits": v} for q, v in zip(qs, values)],
+            "backend": BACKEND,
+        }
@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import asyncio
+import csv
+import io
+import re
+from collections import Counter
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, Literal
+from urllib.parse import quote
+
+import httpx
+from fastmcp import FastMCP
+
+from . import jsonlib
+from .transports import IDEMPOTENT_EXTENSION
+
+ImportFormat = Literal["csv", "ofx", "json"]
+
+DEFAULT_BATCH_SIZE = 250
+DEFAULT_CONCURRENCY = 2
+# Date formats tried in order when no explicit format is given
+DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%Y", "%Y/%m/%d", "%d.%m.%Y", "%Y%m%d")
+
+# Header aliases (lowercased) for CSV columns
+_CSV_COLUMNS: dict[str, tuple[str, ...]] = {
+    "date": ("date", "posted", "transaction date", "posting date"),
+    "amount": ("amount",),
+    "inflow": ("inflow", "credit"),
+    "outflow": ("outflow", "debit"),
+    "payee_name": ("payee", "payee_name", "payee name", "description", "name"),
+    "memo": ("memo", "notes", "note"),
+    "account_id": ("account_id",),
+    "category_id": ("category_id",),
+    "cleared": ("cleared",),
+    "approved": ("approved",),
+    "flag_color": ("flag_color",),
+    "import_id": ("import_id",),
+}
+
+# Text field limits of YNAB's SaveTransaction
+_MAX_LENGTHS = {"payee_id": 36, "payee_name": 200, "category_id": 36, "memo": 500, "flag_color": 10}
+_CLEARED_VALUES = frozenset({"cleared", "uncleared", "reconciled"})
+
+_OFX_TRANSACTION_RE = re.compile(r"<STMTTRN>(.*?)</STMTTRN>", re.S | re.I)
+_OFX_FIELD_RE = re.compile(r"<(\w+)>([^<\r\n]*)")
+
+
+def to_milliunits(value: Any) -> int:
+    """Convert a currency amount ("-12.34", "$1,234.50", "(5.00)", 12.3) to milliunits."""
+    if isinstance(value, bool):
+        raise ValueError(f"Invalid amount: {value!r}")
+    if isinstance(value, int):
+        return value * 1000
+    text = str(value).strip()
+    negative = text.startswith("(") and text.endswith(")")
+    text = re.sub(r"[^0-9.\-+]", "", text)
+    try:
+        amount = Decimal(text)
+    except InvalidOperation as e:
+        raise ValueError(f"Invalid amount: {value!r}") from e
+    milliunits = int((amount * 1000).to_integral_value())
+    return -abs(milliunits) if negative else milliunits
+
+
+def parse_date(value: Any, date_format: str | None = None) -> str:
+    """Return an ISO date (YYYY-MM-DD) for a date string in a known or given format."""
+    if isinstance(value, date):
+        return value.isoformat()
+    text = str(value).strip()
+    for fmt in (date_format,) if date_format else DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date().isoformat()
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognized date: {value!r}")
+
+
+def _truthy(value: Any) -> bool:
+    return str(value).strip().lower() in {"1", "true", "yes", "y", "cleared", "x"}
+
+
+def parse_csv(text: str) -> list[dict[str, Any]]:
+    """Parse CSV rows into raw transaction dicts keyed by YNAB field names."""
+    reader = csv.DictReader(io.StringIO(text))
+    headers = {h.strip().lower(): h for h in reader.fieldnames or []}
+    columns = {
+        field: next((headers[a] for a in aliases if a in headers), None)
+        for field, aliases in _CSV_COLUMNS.items()
+    }
+    rows: list[dict[str, Any]] = []
+    for record in reader:
+        row = {f: record[c] for f, c in columns.items() if c and (record.get(c) or "").strip()}
+        inflow, outflow = row.pop("inflow", None), row.pop("outflow", None)
+        if "amount" not in row and (inflow or outflow):
+            milliunits = to_milliunits(inflow or "0") - abs(to_milliunits(outflow or "0"))
+            row["amount"] = str(Decimal(milliunits) / 1000)
+        rows.append(row)
+    return rows
+
+
+def parse_ofx(text: str) -> list[dict[str, Any]]:
+    """Parse the STMTTRN entries of an OFX (SGML or XML) statement."""
+    rows: list[dict[str, Any]] = []
+    for block in _OFX_TRANSACTION_RE.findall(text):
+        fields = {k.upper(): v.strip() for k, v in _OFX_FIELD_RE.findall(block)}
+        if "DTPOSTED" not in fields or "TRNAMT" not in fields:
+            continue
+        row: dict[str, Any] = {"date": fields["DTPOSTED"][:8], "amount": fields["TRNAMT"]}
+        if fields.get("NAME") or fields.get("PAYEE"):
+            row["payee_name"] = fields.get("NAME") or fields.get("PAYEE")
+        if fields.get("MEMO"):
+            row["memo"] = fields["MEMO"]
+        rows.append(row)
+    return rows
+
+
+def parse_json(text: str) -> list[dict[str, Any]]:
+    """Parse a JSON list of transactions, or an object with a `transactions` list."""
+    data = jsonlib.loads(text)
+    if isinstance(data, dict):
+        data = data.get("transactions")
+    if not isinstance(data, list):
+        raise ValueError("Expected a JSON list of transactions or {\"transactions\": [...]}")
+    return [r for r in data if isinstance(r, dict)]
+
+
+_PARSERS = {"csv": parse_csv, "ofx": parse_ofx, "json": parse_json}
+
+
+def normalize(
+    rows: list[dict[str, Any]],
+    *,
+    account_id: str | None = None,
+    date_format: str | None = None,
+    amounts_in_milliunits: bool = False,
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """Turn raw rows into YNAB SaveTransaction dicts with import ids.
+
+    Rows without an `import_id` get YNAB's own format,
+    `YNAB:<milliunits>:<date>:<occurrence>`, so re-running an import (or YNAB's
+    file import of the same statement) does not create duplicates. Returns
+    (transactions, skipped rows with their errors).
+    """
+    transactions: list[dict[str, Any]] = []
+    skipped: list[dict[str, Any]] = []
+    occurrences: Counter[tuple[str, int, str]] = Counter()
+    # import_id is unique per account
+    seen_ids: set[tuple[str, str]] = set()
+    for i, row in enumerate(rows, start=1):
+        try:
+            account = row.get("account_id") or account_id
+            if not account:
+                raise ValueError("Missing account_id")
+            amount = row.get("amount")
+            if amount is None or amount == "":
+                raise ValueError("Missing amount")
+            if amounts_in_milliunits:
+                amount = int(amount)
+            else:
+                amount = to_milliunits(amount)
+            when = parse_date(row.get("date", ""), date_format)
+        except ValueError as e:
+            skipped.append({"row": i, "error": str(e)})
+            continue
+
+        txn: dict[str, Any] = {"account_id": account, "date": when, "amount": amount}
+        for key, max_length in _MAX_LENGTHS.items():
+            if row.get(key):
+                txn[key] = str(row[key])[:max_length]
+        if "cleared" in row:
+            cleared = str(row["cleared"]).strip().lower()
+            txn["cleared"] = cleared if cleared in _CLEARED_VALUES else (
+                "cleared" if _truthy(cleared) else "uncleared"
+            )
+        if "approved" in row:
+            approved = row["approved"]
+            txn["approved"] = approved if isinstance(approved, bool) else _truthy(approved)
+
+        import_id = row.get("import_id")
+        if not import_id:
+            occurrences[(account, amount, when)] += 1
+            import_id = f"YNAB:{amount}:{when}:{occurrences[(account, amount, when)]}"
+        import_id = str(import_id)[:36]
+        if (account, import_id) in seen_ids:
+            skipped.append({"row": i, "error": f"Duplicate import_id {import_id}"})
+            continue
+        seen_ids.add((account, import_id))
+        txn["import_id"] = import_id
+        transactions.append(txn)
+    return transactions, skipped
+
+
+def detect_format(filename: str) -> ImportFormat:
+    suffix = filename.lower().rsplit(".", 1)[-1]
+    if suffix in ("ofx", "qfx"):
+        return "ofx"
+    if suffix == "json":
+        return "json"
+    return "csv"
+
+
+async def import_transactions(
+    client: httpx.AsyncClient,
+    budget_id: str,
+    transactions: list[dict[str, Any]],
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> dict[str, Any]:
+    """POST transactions in batches, a few at a time, and summarize the outcome.
+
+    Every transaction carries an import_id, so YNAB ignores replays; batches are
+    marked idempotent and may be retried on 5xx responses. Rate limiting applies
+    per batch request through the client's transport.
+    """
+    batch_size = max(1, int(batch_size))
+    batches = [
+        transactions[i : i + batch_size] for i in range(0, len(transactions), batch_size)
+    ]
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def _post(batch: list[dict[str, Any]]) -> dict[str, Any]:
+        async with semaphore:
+            response = await client.post(
+                f"budgets/{quote(budget_id, safe='')}/transactions",
+                json={"transactions": batch},
+                extensions={IDEMPOTENT_EXTENSION: True},
+            )
+            return (response.json() or {}).get("data") or {}
+
+    results = await asyncio.gather(*(_post(b) for b in batches), return_exceptions=True)
+
+    created = 0
+    duplicates: list[str] = []
+    failed: list[dict[str, Any]] = []
+    for index, result in enumerate(results):
+        if isinstance(result, BaseException):
+            if not isinstance(result, (httpx.HTTPError, ValueError)):
+                raise result
+            failed.append({"batch": index, "size": len(batches[index]), "error": str(result)})
+            continue
+        created += len(result.get("transaction_ids") or [])
+        duplicates += result.get("duplicate_import_ids") or []
+    return {
+        "submitted": len(transactions),
+        "created": created,
+        "duplicates": len(duplicates),
+        "duplicate_import_ids": duplicates[:100],
+        "batches": len(batches),
+        "failed_batches": failed,
+    }
+
+
+def register_bulk_import_tool(
+    mcp: FastMCP,
+    client: httpx.AsyncClient,
+    *,
+    include_tags: set[str] | None = None,
+    exclude_tags: set[str] | None = None,
+) -> None:
+    tag = "Transactions"
+    if (exclude_tags and tag in exclude_tags) or (
+        include_tags is not None and tag not in include_tags
+    ):
+        return
+
+    @mcp.tool(name="bulk_import_transactions", tags={tag})
+    async def bulk_import_transactions(
+        budget_id: str,
+        content: str,
+        format: ImportFormat = "csv",
+        account_id: str | None = None,
+        date_format: str | None = None,
+        amounts_in_milliunits: bool = False,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        dry_run: bool = False,
+    ) -> dict[str, Any]:
+        """Import many transactions from CSV, OFX or JSON text in batched requests.
+
+        Amounts are converted to milliunits (pass `amounts_in_milliunits` if they
+        already are). Rows without an import_id get YNAB's
+        `YNAB:<milliunits>:<date>:<occurrence>` id, so importing the same file
+        twice does not duplicate transactions. `account_id` applies to rows that do
+        not name one. CSV headers recognized: date, amount or inflow/outflow,
+        payee, memo, account_id, category_id, cleared, approved, flag_color,
+        import_id. Use `dry_run` to validate without posting.
+        """
+        rows = _PARSERS[format](content)
+        transactions, skipped = normalize(
+            rows,
+            account_id=account_id,
+            date_format=date_format,
+            amounts_in_milliunits=amounts_in_milliunits,
+        )
+        summary: dict[str, Any] = {"rows": len(rows), "skipped": skipped[:100]}
+        if dry_run:
+            summary.update(submitted=0, preview=transactions[:5], valid=len(transactions))
+            return summary
+        summary.update(
+            await import_transactions(client, budget_id, transactions, batch_size=batch_size)
+        )
+        return summary
@@ -0,0 +1,349 @@
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+import httpx
+
+from . import jsonlib
+from .openapi_loader import _default_cache_dir
+from .spec_index import OperationIndex
+from .transports import WrappedTransport, budget_target, replayable_headers, request_namespace
+
+# Seconds a cached GET response stays valid, by OpenAPI tag. When an operation has
+# several tags the shortest TTL wins; untagged or unknown operations use DEFAULT_TTL.
+DEFAULT_TAG_TTLS: dict[str, float] = {
+    "User": 3600.0,
+    "Budgets": 300.0,
+    "Accounts": 60.0,
+    "Categories": 60.0,
+    "Months": 60.0,
+    "Payees": 300.0,
+    "Payee Locations": 300.0,
+    "Scheduled Transactions": 60.0,
+    "Transactions": 30.0,
+}
+DEFAULT_TTL = 30.0
+
+# Scope of cache entries that are not tied to a single budget (user, budgets list)
+GLOBAL_SCOPE = ""
+# Alias YNAB accepts in place of a budget id; it may point at any budget
+LAST_USED_BUDGET = "last-used"
+
+
+@dataclass
+class CachedResponse:
+    status_code: int
+    headers: list[tuple[str, str]]
+    content: bytes
+    expires_at: float
+    scope: str = GLOBAL_SCOPE
+
+
+class MemoryCacheStore:
+    """In-process LRU store of cached responses."""
+
+    def __init__(self, *, max_entries: int = 1024) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str], CachedResponse] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, namespace: str, url: str, now: float) -> CachedResponse | None:
+        key = (namespace, url)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= now:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, namespace: str, url: str, entry: CachedResponse) -> None:
+        key = (namespace, url)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, namespace: str, scopes: set[str] | None) -> None:
+        dead = [
+            k
+            for k, e in self._entries.items()
+            if k[0] == namespace and (scopes is None or e.scope in scopes)
+        ]
+        for k in dead:
+            del self._entries[k]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class SqliteCacheStore:
+    """On-disk LRU store shared by every server process on the machine.
+
+    Uses SQLite in WAL mode so concurrent processes can read while one writes.
+    Entries are namespaced per token (see `transports.auth_namespace`), so several
+    tokens can share one file. Defaults to `http_cache.sqlite3` in the same XDG
+    cache directory as the OpenAPI spec cache.
+
+    Expired and least recently used entries are pruned every `prune_every` puts
+    rather than on each one, so the file may briefly hold a few more than
+    `max_entries`. Calls block on SQLite; `ResponseCache` runs them in a thread.
+    """
+
+    def __init__(
+        self, path: Path | None = None, *, max_entries: int = 4096, prune_every: int = 64
+    ) -> None:
+        self.path = path or (_default_cache_dir() / "http_cache.sqlite3")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.prune_every = prune_every
+        self._puts = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=5.0, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "namespace TEXT NOT NULL, url TEXT NOT NULL, status INTEGER NOT NULL, "
+            "headers TEXT NOT NULL, content BLOB NOT NULL, expires_at REAL NOT NULL, "
+            "scope TEXT NOT NULL, accessed_at REAL NOT NULL, PRIMARY KEY (namespace, url))"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_expires ON responses (expires_at)"
+        )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0])
+
+    def get(self, namespace: str, url: str, now: float) -> CachedResponse | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, headers, content, expires_at, scope FROM responses "
+                "WHERE namespace = ? AND url = ?",
+                (namespace, url),
+            ).fetchone()
+            if row is None:
+                return None
+            if row[3] <= now:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE namespace = ? AND url = ?", (namespace, url)
+                )
+                return None
+            self._conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE namespace = ? AND url = ?",
+                (time.time(), namespace, url),
+            )
+        return CachedResponse(
+            status_code=row[0],
+            headers=[tuple(h) for h in jsonlib.loads(row[1])],
+            content=bytes(row[2]),
+            expires_at=row[3],
+            scope=row[4],
+        )
+
+    def put(self, namespace: str, url: str, entry: CachedResponse) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    namespace,
+                    url,
+                    entry.status_code,
+                    jsonlib.dumps(entry.headers).decode("utf-8"),
+                    entry.content,
+                    entry.expires_at,
+                    entry.scope,
+                    time.time(),
+                ),
+            )
+            self._puts += 1
+            if self._puts < self.prune_every:
+                return
+            self._puts = 0
+        self.prune()
+
+    def prune(self) -> None:
+        """Drop expired entries, then the least recently used beyond `max_entries`."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+                self._conn.execute(
+                    "DELETE FROM responses WHERE rowid IN (SELECT rowid FROM responses "
+                    "ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def invalidate(self, namespace: str, scopes: set[str] | None) -> None:
+        with self._lock:
+            if scopes is None:
+                self._conn.execute("DELETE FROM responses WHERE namespace = ?", (namespace,))
+                return
+            marks = ",".join("?" for _ in scopes)
+            self._conn.execute(
+                f"DELETE FROM responses WHERE namespace = ? AND scope IN ({marks})",
+                (namespace, *scopes),
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+
+
+class ResponseCache:
+    """Size-bounded LRU of GET responses with per-entry expiry.
+
+    Entries are keyed by (namespace, url) and carry a scope (the budget id they
+    belong to) so writes can invalidate everything cached for a budget. Storage is
+    in memory by default; pass a `SqliteCacheStore` to persist entries across
+    processes and restarts.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 1024,
+        store: MemoryCacheStore | SqliteCacheStore | None = None,
+    ) -> None:
+        self.store = store if store is not None else MemoryCacheStore(max_entries=max_entries)
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    def get(self, namespace: str, url: str, now: float | None = None) -> CachedResponse | None:
+        now = time.time() if now is None else now
+        entry = self.store.get(namespace, url, now)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def put(self, namespace: str, url: str, entry: CachedResponse) -> None:
+        self.store.put(namespace, url, entry)
+
+    def invalidate(self, namespace: str, scopes: set[str] | None) -> None:
+        """Drop a namespace's entries in the given scopes (all of them for None)."""
+        self.store.invalidate(namespace, scopes)
+
+    def clear(self) -> None:
+        self.store.clear()
+
+    # Async variants for the transport: SQLite calls run in a worker thread so a
+    # busy database file does not stall the event loop
+
+    async def aget(self, namespace: str, url: str) -> CachedResponse | None:
+        if isinstance(self.store, SqliteCacheStore):
+            return await asyncio.to_thread(self.get, namespace, url)
+        return self.get(namespace, url)
+
+    async def aput(self, namespace: str, url: str, entry: CachedResponse) -> None:
+        if isinstance(self.store, SqliteCacheStore):
+            await asyncio.to_thread(self.put, namespace, url, entry)
+        else:
+            self.put(namespace, url, entry)
+
+    async def ainvalidate(self, namespace: str, scopes: set[str] | None) -> None:
+        if isinstance(self.store, SqliteCacheStore):
+            await asyncio.to_thread(self.invalidate, namespace, scopes)
+        else:
+            self.invalidate(namespace, scopes)
+
+
+class CacheTransport(WrappedTransport):
+    """Serve repeated GETs from a `ResponseCache` and invalidate on writes.
+
+    TTLs are chosen per OpenAPI tag via the operation index. Delta requests
+    (`last_knowledge_of_server`) are never cached. A POST/PUT/PATCH/DELETE under
+    `/budgets/{id}` drops cached entries for that budget, the `last-used` alias and
+    unscoped entries such as the budgets list (a write through `last-used` drops
+    everything cached for the token).
+    """
+
+    def __init__(
+        self,
+        inner: httpx.AsyncBaseTransport,
+        cache: ResponseCache,
+        *,
+        index: OperationIndex | None = None,
+        tag_ttls: dict[str, float] | None = None,
+        default_ttl: float = DEFAULT_TTL,
+    ) -> None:
+        super().__init__(inner)
+        self.cache = cache
+        self.index = index
+        self.tag_ttls = DEFAULT_TAG_TTLS if tag_ttls is None else tag_ttls
+        self.default_ttl = default_ttl
+
+    def ttl_for(self, request: httpx.Request) -> float:
+        if "last_knowledge_of_server" in request.url.params:
+            return 0.0
+        matched = self.index.match(request.method, request.url.path) if self.index else None
+        if matched is None:
+            return self.default_ttl
+        ttls = [self.tag_ttls[t] for t in matched[0].tags if t in self.tag_ttls]
+        return min(ttls) if ttls else self.default_ttl
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        namespace = request_namespace(request)
+        target = budget_target(request.url)
+        scope = target[0] if target else GLOBAL_SCOPE
+
+        if request.method != "GET":
+            if scope == LAST_USED_BUDGET:
+                # The alias may resolve to any budget
+                await self.cache.ainvalidate(namespace, None)
+            else:
+                await self.cache.ainvalidate(namespace, {GLOBAL_SCOPE, LAST_USED_BUDGET, scope})
+            return await self._inner.handle_async_request(request)
+
+        ttl = self.ttl_for(request)
+        if ttl <= 0:
+            return await self._inner.handle_async_request(request)
+
+        url = str(request.url)
+        entry = await self.cache.aget(namespace, url)
+        if entry is not None:
+            return httpx.Response(
+                entry.status_code,
+                headers=entry.headers,
+                content=entry.content,
+                request=request,
+            )
+
+        response = await self._inner.handle_async_request(request)
+        if response.status_code == 200:
+            content = await response.aread()
+            await self.cache.aput(
+                namespace,
+                url,
+                CachedResponse(
+                    status_code=200,
+                    headers=replayable_headers(response),
+                    content=content,
+                    expires_at=time.time() + ttl,
+                    scope=scope,
+                ),
+            )
+        return response
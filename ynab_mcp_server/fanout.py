@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from urllib.parse import quote
+
+import httpx
+from fastmcp import FastMCP
+
+from .projection import project
+from .spec_index import Operation, OperationIndex
+
+DEFAULT_CONCURRENCY = 4
+MAX_CONCURRENCY = 16
+
+
+def budget_operations(index: OperationIndex) -> list[Operation]:
+    """GET operations scoped to a single budget (their path has `{budget_id}`)."""
+    return [op for op in index.operations if op.method == "GET" and "budget_id" in op.path_params]
+
+
+def build_request(
+    op: Operation, budget_id: str, arguments: dict[str, Any]
+) -> tuple[str, dict[str, Any]]:
+    """Return (relative path, query params) for `op` against one budget."""
+    values = {**arguments, "budget_id": budget_id}
+    path = op.path
+    for name in op.path_params:
+        if name not in values:
+            raise ValueError(f"Missing path parameter {name!r} for {op.name}")
+        path = path.replace(f"{{{name}}}", quote(str(values[name]), safe=""))
+    query_names = {p.get("name") for p in op.parameters if p.get("in") == "query"}
+    params = {k: v for k, v in arguments.items() if k in query_names and v is not None}
+    return path.lstrip("/"), params
+
+
+async def fan_out(
+    client: httpx.AsyncClient,
+    op: Operation,
+    *,
+    arguments: dict[str, Any] | None = None,
+    budget_ids: list[str] | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    fields: list[str] | None = None,
+) -> dict[str, Any]:
+    """Run one budget-scoped GET across budgets with at most `concurrency` in flight."""
+    arguments = arguments or {}
+    names: dict[str, str] = {}
+    if budget_ids is None:
+        response = await client.get("budgets")
+        budgets = ((response.json() or {}).get("data") or {}).get("budgets") or []
+        names = {b["id"]: b.get("name", "") for b in budgets if isinstance(b, dict) and "id" in b}
+        budget_ids = list(names)
+
+    semaphore = asyncio.Semaphore(max(1, min(concurrency, MAX_CONCURRENCY)))
+
+    async def _one(budget_id: str) -> dict[str, Any]:
+        entry: dict[str, Any] = {"budget_id": budget_id}
+        if budget_id in names:
+            entry["budget_name"] = names[budget_id]
+        try:
+            path, params = build_request(op, budget_id, arguments)
+            async with semaphore:
+                response = await client.get(path, params=params)
+            result = response.json()
+            entry["result"] = project(result, fields) if fields else result
+        except (httpx.HTTPError, ValueError) as e:
+            entry["error"] = str(e)
+        return entry
+
+    results = await asyncio.gather(*(_one(b) for b in budget_ids))
+    return {
+        "operation": op.name,
+        "budgets": len(results),
+        "failed": sum(1 for r in results if "error" in r),
+        "results": results,
+    }
+
+
+def register_fan_out_tool(
+    mcp: FastMCP,
+    client: httpx.AsyncClient,
+    index: OperationIndex,
+    *,
+    include_tags: set[str] | None = None,
+    exclude_tags: set[str] | None = None,
+) -> None:
+    allowed = {
+        op.name: op
+        for op in budget_operations(index)
+        if not (exclude_tags and exclude_tags & set(op.tags))
+        and (include_tags is None or include_tags & set(op.tags))
+    }
+    if not allowed:
+        return
+
+    @mcp.tool(name="fan_out_operation", tags={"system"})
+    async def fan_out_operation(
+        operation: str,
+        arguments: dict[str, Any] | None = None,
+        budget_ids: list[str] | None = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        fields: list[str] | None = None,
+    ) -> dict[str, Any]:
+        """Run a budget-scoped GET tool (e.g. get_accounts, get_month) across budgets.
+
+        Calls `operation` once per budget in parallel (at most `concurrency` at a
+        time, max 16) and returns every budget's result, or its error. Targets all
+        budgets unless `budget_ids` is given. `arguments` holds the operation's
+        other parameters (budget_id is filled in). `fields` optionally keeps only
+        these dotted paths inside each response's `data`.
+        """
+        op = allowed.get(operation)
+        if op is None:
+            raise ValueError(
+                f"{operation!r} is not a budget-scoped GET operation; "
+                f"choose one of: {', '.join(sorted(allowed))}"
+            )
+        return await fan_out(
+            client,
+            op,
+            arguments=arguments,
+            budget_ids=budget_ids,
+            concurrency=concurrency,
+            fields=fields,
+        )
@@ -0,0 +1,79 @@
+"""JSON encoding/decoding with an optional fast backend.
+
+The backend is selected once at import time: orjson if installed, then msgspec,
+then the standard library. Set YNAB_MCP_JSON_BACKEND=orjson|msgspec|stdlib to
+force a specific one. Install the fast backend with `pip install 'ynab-mcp-server[fast]'`.
+
+All backends raise `json.JSONDecodeError` (a ValueError) on invalid input, and
+`dumps` always returns compact UTF-8 bytes.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Callable
+from typing import Any
+
+BACKEND_ENV = "YNAB_MCP_JSON_BACKEND"
+
+
+def _stdlib_loads(data: bytes | str) -> Any:
+    return json.loads(data)
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _select() -> tuple[str, Callable[[bytes | str], Any], Callable[[Any], bytes]]:
+    requested = (os.environ.get(BACKEND_ENV) or "").strip().lower()
+    candidates = [requested] if requested else ["orjson", "msgspec"]
+
+    for name in candidates:
+        if name == "orjson":
+            try:
+                import orjson
+            except ImportError:
+                continue
+
+            def _orjson_dumps(obj: Any) -> bytes:
+                try:
+                    return orjson.dumps(obj)
+                except TypeError:
+                    # e.g. integers beyond 64 bits or non-str keys
+                    return _stdlib_dumps(obj)
+
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError
+            return "orjson", orjson.loads, _orjson_dumps
+
+        if name == "msgspec":
+            try:
+                import msgspec
+            except ImportError:
+                continue
+
+            decoder = msgspec.json.Decoder()
+            encoder = msgspec.json.Encoder()
+
+            def _msgspec_loads(data: bytes | str) -> Any:
+                try:
+                    return decoder.decode(data)
+                except msgspec.DecodeError as e:
+                    doc = data if isinstance(data, str) else data.decode("utf-8", "replace")
+                    raise json.JSONDecodeError(str(e), doc, 0) from e
+
+            def _msgspec_dumps(obj: Any) -> bytes:
+                try:
+                    return encoder.encode(obj)
+                except (TypeError, msgspec.EncodeError):
+                    return _stdlib_dumps(obj)
+
+            return "msgspec", _msgspec_loads, _msgspec_dumps
+
+    return "stdlib", _stdlib_loads, _stdlib_dumps
+
+
+BACKEND, loads, dumps = _select()
+
+__all__ = ["BACKEND", "BACKEND_ENV", "dumps", "loads"]
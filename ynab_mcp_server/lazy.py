@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import httpx
+from fastmcp import FastMCP
+from fastmcp.server.openapi import RouteMap
+from fastmcp.tools.tool import Tool, ToolResult
+
+from .projection import Projection
+from .spec_index import HTTP_METHODS, Operation, OperationIndex
+
+
+class LazyTools:
+    """Build OpenAPI tools one operation at a time, on first use.
+
+    `FastMCP.from_openapi` generates every tool (schemas, descriptions, callables)
+    up front. In lazy mode only the `OperationIndex` is built at startup; a tool is
+    generated from a one-path sub-spec the first time it is described or called,
+    then kept for the life of the server.
+    """
+
+    def __init__(
+        self,
+        spec: dict[str, Any],
+        index: OperationIndex,
+        *,
+        client: httpx.AsyncClient,
+        timeout: float,
+        route_maps: list[RouteMap] | None = None,
+        route_map_fn: Any | None = None,
+        mcp_component_fn: Any | None = None,
+        projection: Projection | None = None,
+        include_tags: set[str] | None = None,
+        exclude_tags: set[str] | None = None,
+    ) -> None:
+        self.spec = spec
+        self.index = index
+        self.client = client
+        self.timeout = timeout
+        self.route_maps = route_maps
+        self.route_map_fn = route_map_fn
+        self.mcp_component_fn = mcp_component_fn
+        self.projection = projection
+        self.include_tags = include_tags
+        self.exclude_tags = exclude_tags
+        self._tools: dict[str, Tool] = {}
+        self._lock = asyncio.Lock()
+
+    def operations(self, tag: str | None = None) -> list[Operation]:
+        """Operations visible under the include/exclude tag filters."""
+        ops = []
+        for op in self.index.operations:
+            tags = set(op.tags)
+            if self.exclude_tags and tags & self.exclude_tags:
+                continue
+            if self.include_tags is not None and not tags & self.include_tags:
+                continue
+            if tag is not None and tag not in tags:
+                continue
+            ops.append(op)
+        return ops
+
+    def sub_spec(self, op: Operation) -> dict[str, Any]:
+        """The spec reduced to one operation; components are kept for $ref resolution."""
+        item = self.spec["paths"][op.path]
+        path_item = {k: v for k, v in item.items() if k not in HTTP_METHODS}
+        path_item[op.method.lower()] = item[op.method.lower()]
+        spec = {k: v for k, v in self.spec.items() if k != "paths"}
+        spec["paths"] = {op.path: path_item}
+        return spec
+
+    async def materialize(self, name: str) -> Tool | None:
+        """Return the tool for an operation, generating it on first request."""
+        tool = self._tools.get(name)
+        if tool is not None:
+            return tool
+        op = self.index.get(name)
+        if op is None or op not in self.operations():
+            return None
+        async with self._lock:
+            tool = self._tools.get(name)
+            if tool is None:
+                server = FastMCP.from_openapi(
+                    openapi_spec=self.sub_spec(op),
+                    client=self.client,
+                    timeout=self.timeout,
+                    route_maps=self.route_maps,
+                    route_map_fn=self.route_map_fn,
+                    mcp_component_fn=self.mcp_component_fn,
+                    mcp_names={op.operation_id: op.name},
+                )
+                tool = (await server.get_tools()).get(op.name)
+                if tool is None:
+                    return None
+                self._tools[name] = tool
+        return tool
+
+
+def register_lazy_tools(mcp: FastMCP, lazy: LazyTools) -> None:
+    """Expose the spec through discovery tools instead of one tool per operation.
+
+    Each operation materialized through `describe_operation` or `call_operation` is
+    also added to the server, so later calls can use it directly by name.
+    """
+
+    async def _tool(name: str) -> Tool:
+        tool = await lazy.materialize(name)
+        if tool is None:
+            raise ValueError(f"Unknown operation: {name}")
+        if name not in await mcp.get_tools():
+            mcp.add_tool(tool)
+        return tool
+
+    @mcp.tool(name="list_operations", tags={"system"})
+    def list_operations(tag: str | None = None) -> list[dict[str, Any]]:
+        """List available YNAB API operations (name, method, path, tags, summary).
+
+        Use `describe_operation` for an operation's parameters and `call_operation`
+        to run it. Optionally filter by OpenAPI tag, e.g. "Transactions".
+        """
+        return [
+            {
+                "name": op.name,
+                "method": op.method,
+                "path": op.path,
+                "tags": list(op.tags),
+                "summary": op.summary,
+            }
+            for op in lazy.operations(tag)
+        ]
+
+    @mcp.tool(name="describe_operation", tags={"system"})
+    async def describe_operation(name: str) -> dict[str, Any]:
+        """Return the description and input/output JSON schemas of a YNAB API operation."""
+        tool = await _tool(name)
+        return {
+            "name": tool.name,
+            "description": tool.description,
+            "input_schema": tool.parameters,
+            "output_schema": tool.output_schema,
+        }
+
+    @mcp.tool(name="call_operation", tags={"system"})
+    async def call_operation(name: str, arguments: dict[str, Any] | None = None) -> ToolResult:
+        """Call a YNAB API operation by name with arguments matching its input schema."""
+        tool = await _tool(name)
+        if lazy.projection is None:
+            return await tool.run(arguments or {})
+        arguments, fields = lazy.projection.split(name, arguments or {})
+        return lazy.projection.apply(await tool.run(arguments), fields)
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any
+
+import httpx
+
+from .transports import PooledTransport
+
+if TYPE_CHECKING:
+    from .tenancy import TenantPools
+
+
+class ClientLifecycle:
+    """Ties the API connection pool to the server's MCP sessions.
+
+    FastMCP enters the server lifespan once per session (once per request with
+    stateless HTTP), so sessions are reference counted:
+
+    - when the first session starts and the pool holds no connections, a bare
+      `HEAD` to `warm_up_url` (no credentials, no rate-limit token) pre-opens one,
+      so the first tool call skips DNS and TLS setup
+    - when the last session ends the pool is closed, after `idle_close_after`
+      seconds if set, so back-to-back short sessions keep their connections
+
+    The pool reopens on the next request, so closing it never breaks the server.
+    """
+
+    def __init__(
+        self,
+        pool: PooledTransport | TenantPools,
+        *,
+        warm_up_url: str | None = None,
+        timeout: httpx.Timeout | None = None,
+        idle_close_after: float = 0.0,
+    ) -> None:
+        self.pool = pool
+        self.warm_up_url = warm_up_url
+        self.timeout = timeout or httpx.Timeout(10.0)
+        self.idle_close_after = idle_close_after
+        self.sessions = 0
+        self._close_task: asyncio.Task[None] | None = None
+
+    async def warm_up(self) -> bool:
+        """Open a pooled connection to `warm_up_url`; returns False if that failed."""
+        if not self.warm_up_url:
+            return False
+        request = httpx.Request(
+            "HEAD", self.warm_up_url, extensions={"timeout": self.timeout.as_dict()}
+        )
+        try:
+            response = await self.pool.handle_async_request(request)
+            await response.aclose()
+        except httpx.HTTPError:
+            # Best effort: the first tool call simply connects as usual
+            return False
+        return True
+
+    async def _close_later(self) -> None:
+        await asyncio.sleep(self.idle_close_after)
+        await self.pool.aclose()
+
+    @asynccontextmanager
+    async def lifespan(self, _server: Any) -> AsyncIterator[dict[str, Any]]:
+        self.sessions += 1
+        if self._close_task is not None:
+            self._close_task.cancel()
+            self._close_task = None
+        if self.sessions == 1 and not self.pool.is_open:
+            await self.warm_up()
+        try:
+            yield {}
+        finally:
+            self.sessions -= 1
+            if self.sessions == 0:
+                if self.idle_close_after > 0:
+                    self._close_task = asyncio.get_running_loop().create_task(
+                        self._close_later()
+                    )
+                else:
+                    with contextlib.suppress(httpx.HTTPError):
+                        await self.pool.aclose()
@@ -2,15 +2,38 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import json
 import os
 from typing import NoReturn
 
 # Ensure new OpenAPI parser is enabled for FastMCP before any FastMCP import
 os.environ.setdefault("FASTMCP_EXPERIMENTAL_ENABLE_NEW_OPENAPI_PARSER", "true")
 
-from fastmcp import Client
+# fastmcp, httpx and the server modules are imported in `cli()`, after arguments
+# are parsed, so `--help` stays fast and `--profile-startup` can time them
+from .profiling import StartupProfile, phase
 
-from .server import create_server
+
+def _env_flag(name: str) -> bool:
+    return (os.environ.get(name) or "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _env_float(name: str) -> float | None:
+    value = (os.environ.get(name) or "").strip()
+    return float(value) if value else None
+
+
+def _parse_ttls(values: list[str] | None) -> dict[str, float] | None:
+    """Parse repeated TAG=SECONDS options into a TTL mapping."""
+    if not values:
+        return None
+    ttls: dict[str, float] = {}
+    for item in values:
+        tag, sep, seconds = item.rpartition("=")
+        if not sep or not tag:
+            raise SystemExit(f"Invalid --cache-ttl value (expected TAG=SECONDS): {item}")
+        ttls[tag.strip()] = float(seconds)
+    return ttls
 
 
 def _build_parser() -> argparse.ArgumentParser:
@@ -39,11 +62,234 @@ def _build_parser() -> argparse.ArgumentParser:
         type=float,
         default=30.0,
     )
+    p.add_argument(
+        "--connect-timeout",
+        help="Connect timeout in seconds (or set YNAB_MCP_CONNECT_TIMEOUT; default --timeout)",
+        type=float,
+        default=_env_float("YNAB_MCP_CONNECT_TIMEOUT"),
+    )
+    p.add_argument(
+        "--read-timeout",
+        help="Read timeout in seconds (or set YNAB_MCP_READ_TIMEOUT; default --timeout)",
+        type=float,
+        default=_env_float("YNAB_MCP_READ_TIMEOUT"),
+    )
+    p.add_argument(
+        "--max-connections",
+        help="Maximum open connections to the API (or set YNAB_MCP_MAX_CONNECTIONS; "
+        "default 20)",
+        type=int,
+        default=int(os.environ.get("YNAB_MCP_MAX_CONNECTIONS", "20")),
+    )
+    p.add_argument(
+        "--max-keepalive",
+        help="Idle connections kept open for reuse (or set YNAB_MCP_MAX_KEEPALIVE; "
+        "default 10)",
+        type=int,
+        default=int(os.environ.get("YNAB_MCP_MAX_KEEPALIVE", "10")),
+    )
+    p.add_argument(
+        "--keepalive-expiry",
+        help="Seconds an idle connection stays open (or set YNAB_MCP_KEEPALIVE_EXPIRY; "
+        "default 30)",
+        type=float,
+        default=float(os.environ.get("YNAB_MCP_KEEPALIVE_EXPIRY", "30")),
+    )
+    p.add_argument(
+        "--http2",
+        action="store_true",
+        help="Negotiate HTTP/2 with the API; needs the `http2` extra "
+        "(or set YNAB_MCP_HTTP2=1)",
+        default=_env_flag("YNAB_MCP_HTTP2"),
+    )
+    p.add_argument(
+        "--warm-up",
+        action="store_true",
+        help="Open a connection to the API when the session starts so the first tool "
+        "call skips connection setup (or set YNAB_MCP_WARM_UP=1)",
+        default=_env_flag("YNAB_MCP_WARM_UP"),
+    )
+    p.add_argument(
+        "--trace-file",
+        help="Write a span per tool call, upstream request and response normalization to "
+        "this JSON-lines file (or set YNAB_MCP_TRACE_FILE)",
+        default=os.environ.get("YNAB_MCP_TRACE_FILE"),
+    )
+    p.add_argument(
+        "--trace-otlp",
+        metavar="ENDPOINT",
+        help="Export spans to an OTLP/HTTP collector, e.g. http://localhost:4318 "
+        "(or set YNAB_MCP_TRACE_OTLP_ENDPOINT)",
+        default=os.environ.get("YNAB_MCP_TRACE_OTLP_ENDPOINT"),
+    )
+    p.add_argument(
+        "--trace-min-duration",
+        help="Only export traces of tool calls slower than this many seconds "
+        "(or set YNAB_MCP_TRACE_MIN_DURATION; default 0)",
+        type=float,
+        default=float(os.environ.get("YNAB_MCP_TRACE_MIN_DURATION", "0")),
+    )
+    p.add_argument(
+        "--metrics",
+        action="store_true",
+        help="Collect latency/throughput metrics, exposed as a `metrics` tool and a "
+        "Prometheus /metrics route over HTTP (or set YNAB_MCP_METRICS=1)",
+        default=_env_flag("YNAB_MCP_METRICS"),
+    )
     p.add_argument(
         "--list-tools",
         action="store_true",
         help="List all generated tools and exit",
     )
+    p.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Build the server, print how long each startup phase took and exit",
+    )
+    p.add_argument(
+        "--max-retries",
+        help="Retries for 429/5xx responses with backoff, 0 to disable "
+        "(or set YNAB_MCP_MAX_RETRIES; default 2)",
+        type=int,
+        default=int(os.environ.get("YNAB_MCP_MAX_RETRIES", "2")),
+    )
+    p.add_argument(
+        "--no-coalesce",
+        action="store_true",
+        help="Disable sharing one upstream call between identical concurrent GETs",
+    )
+    p.add_argument(
+        "--lazy-tools",
+        action="store_true",
+        help="Build tools on first use behind list_operations/describe_operation/"
+        "call_operation instead of generating all at startup (or set YNAB_MCP_LAZY_TOOLS=1)",
+        default=_env_flag("YNAB_MCP_LAZY_TOOLS"),
+    )
+    p.add_argument(
+        "--projection",
+        action="store_true",
+        help="Add a `fields` argument to GET tools that trims responses to the listed "
+        "dotted paths (or set YNAB_MCP_PROJECTION=1)",
+        default=_env_flag("YNAB_MCP_PROJECTION"),
+    )
+    p.add_argument(
+        "--compact-schemas",
+        action="store_true",
+        help="Strip descriptions, titles and examples from tool output schemas "
+        "(or set YNAB_MCP_COMPACT_SCHEMAS=1)",
+        default=_env_flag("YNAB_MCP_COMPACT_SCHEMAS"),
+    )
+    p.add_argument(
+        "--paging-tools",
+        action="store_true",
+        help="Add cursor-paged tools for transactions, payees and scheduled "
+        "transactions (or set YNAB_MCP_PAGING_TOOLS=1)",
+        default=_env_flag("YNAB_MCP_PAGING_TOOLS"),
+    )
+    p.add_argument(
+        "--analytics",
+        action="store_true",
+        help="Add local spending analytics tools over a columnar copy of transactions "
+        "(or set YNAB_MCP_ANALYTICS=1; synced by delta, see --mirror-max-age)",
+        default=_env_flag("YNAB_MCP_ANALYTICS"),
+    )
+    p.add_argument(
+        "--search",
+        action="store_true",
+        help="Add local transaction/payee search tools backed by an in-memory index "
+        "(or set YNAB_MCP_SEARCH=1; synced by delta, see --mirror-max-age)",
+        default=_env_flag("YNAB_MCP_SEARCH"),
+    )
+    p.add_argument(
+        "--cache",
+        action="store_true",
+        help="Cache GET responses in memory with per-tag TTLs (or set YNAB_MCP_CACHE=1)",
+        default=_env_flag("YNAB_MCP_CACHE"),
+    )
+    p.add_argument(
+        "--cache-ttl",
+        action="append",
+        metavar="TAG=SECONDS",
+        help="Override the cache TTL for an OpenAPI tag (repeatable), e.g. Transactions=10",
+    )
+    p.add_argument(
+        "--cache-max-entries",
+        help="Maximum cached responses before least-recently-used eviction (default 1024)",
+        type=int,
+        default=1024,
+    )
+    p.add_argument(
+        "--cache-backend",
+        choices=["memory", "sqlite"],
+        help="Where cached responses live; sqlite shares them across server processes "
+        "(or set YNAB_MCP_CACHE_BACKEND; default memory)",
+        default=os.environ.get("YNAB_MCP_CACHE_BACKEND") or "memory",
+    )
+    p.add_argument(
+        "--cache-path",
+        help="SQLite file for --cache-backend sqlite (or set YNAB_MCP_CACHE_PATH; "
+        "default <XDG cache>/ynab-mcp-server/http_cache.sqlite3)",
+        default=os.environ.get("YNAB_MCP_CACHE_PATH"),
+    )
+    p.add_argument(
+        "--rate-limit",
+        help="Client-side limit of upstream requests per hour, e.g. 200 "
+        "(or set YNAB_MCP_RATE_LIMIT; disabled by default)",
+        type=int,
+        default=int(os.environ.get("YNAB_MCP_RATE_LIMIT") or 0) or None,
+    )
+    p.add_argument(
+        "--rate-limit-mode",
+        choices=["wait", "shed"],
+        help="When the local quota is exhausted: queue calls (wait) or fail fast (shed)",
+        default=os.environ.get("YNAB_MCP_RATE_LIMIT_MODE", "wait"),
+    )
+    p.add_argument(
+        "--rate-limit-state",
+        help="SQLite file to share the rate limit across processes "
+        "(or set YNAB_MCP_RATE_LIMIT_STATE)",
+        default=os.environ.get("YNAB_MCP_RATE_LIMIT_STATE"),
+    )
+    p.add_argument(
+        "--offline-first",
+        action="store_true",
+        help="Start from the cached OpenAPI spec and refresh it in the background "
+        "(or set YNAB_MCP_SPEC_OFFLINE_FIRST=1)",
+        default=_env_flag("YNAB_MCP_SPEC_OFFLINE_FIRST"),
+    )
+    p.add_argument(
+        "--compile-spec",
+        action="store_true",
+        help="Fetch the OpenAPI spec, write its compiled cache artifact and exit",
+    )
+    p.add_argument(
+        "--import-file",
+        help="Import transactions from a CSV, OFX or JSON file through the "
+        "bulk_import_transactions tool, print the summary and exit",
+    )
+    p.add_argument(
+        "--import-budget",
+        help="Budget id for --import-file (default last-used)",
+        default="last-used",
+    )
+    p.add_argument(
+        "--import-account",
+        help="Account id for imported rows that do not name one",
+    )
+    p.add_argument(
+        "--import-format",
+        choices=["csv", "ofx", "json"],
+        help="Format of --import-file (default: from the file extension)",
+    )
+    p.add_argument(
+        "--import-date-format",
+        help="strptime format of dates in --import-file, e.g. %%d/%%m/%%Y",
+    )
+    p.add_argument(
+        "--import-dry-run",
+        action="store_true",
+        help="Validate --import-file without creating transactions",
+    )
     p.add_argument(
         "--include-tags",
         help="Comma-separated list of OpenAPI tags to include (others excluded)",
@@ -59,6 +305,19 @@ def _build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Disable health tool and HTTP /health and /debug routes",
     )
+    p.add_argument(
+        "--mirror",
+        action="store_true",
+        help="Mirror budget collections locally and sync them with delta requests "
+        "(or set YNAB_MCP_MIRROR=1)",
+        default=_env_flag("YNAB_MCP_MIRROR"),
+    )
+    p.add_argument(
+        "--mirror-max-age",
+        help="Seconds a mirrored collection is served without re-syncing (default 15)",
+        type=float,
+        default=float(os.environ.get("YNAB_MCP_MIRROR_MAX_AGE", "15")),
+    )
     return p
 
 
@@ -66,6 +325,24 @@ def cli() -> NoReturn:
     parser = _build_parser()
     args = parser.parse_args()
 
+    profile = StartupProfile()
+    if args.profile_startup:
+        profile.activate()
+
+    if args.compile_spec:
+        from .openapi_loader import DEFAULT_SPEC_URL, compile_spec
+
+        path = asyncio.run(
+            compile_spec(args.spec_url or DEFAULT_SPEC_URL, timeout=args.timeout)
+        )
+        print(path)
+        raise SystemExit(0)
+
+    with phase("imports"):
+        from fastmcp import Client
+
+        from .server import create_server
+
     # Build the server outside any running event loop
     # Parse tag filters
     include_tags = set(filter(None, (args.include_tags or "").split(","))) or None
@@ -80,9 +357,43 @@ def cli() -> NoReturn:
             include_tags=include_tags,
             exclude_tags=exclude_tags,
             enable_health_routes=not args.no_health_routes,
+            enable_mirror=args.mirror,
+            mirror_max_age=args.mirror_max_age,
+            spec_offline_first=args.offline_first,
+            rate_limit=args.rate_limit,
+            rate_limit_mode=args.rate_limit_mode,
+            rate_limit_state=args.rate_limit_state,
+            max_retries=args.max_retries,
+            coalesce_requests=not args.no_coalesce,
+            enable_cache=args.cache,
+            cache_ttls=_parse_ttls(args.cache_ttl),
+            cache_max_entries=args.cache_max_entries,
+            cache_backend=args.cache_backend,
+            cache_path=args.cache_path,
+            lazy_tools=args.lazy_tools,
+            enable_projection=args.projection,
+            compact_schemas=args.compact_schemas,
+            enable_paging=args.paging_tools,
+            enable_analytics=args.analytics,
+            enable_search=args.search,
+            max_connections=args.max_connections,
+            max_keepalive_connections=args.max_keepalive,
+            keepalive_expiry=args.keepalive_expiry,
+            http2=args.http2,
+            connect_timeout=args.connect_timeout,
+            read_timeout=args.read_timeout,
+            warm_up=args.warm_up,
+            enable_metrics=args.metrics,
+            trace_file=args.trace_file,
+            trace_otlp_endpoint=args.trace_otlp,
+            trace_min_duration=args.trace_min_duration,
         )
     )
 
+    if args.profile_startup:
+        print(profile.report())
+        raise SystemExit(0)
+
     if args.list_tools:
         async def _list():
             client = Client(mcp)
@@ -93,6 +404,27 @@ def cli() -> NoReturn:
         asyncio.run(_list())
         raise SystemExit(0)
 
+    if args.import_file:
+        from .bulk_import import detect_format
+
+        async def _import():
+            with open(args.import_file, encoding="utf-8-sig") as f:
+                content = f.read()
+            arguments = {
+                "budget_id": args.import_budget,
+                "content": content,
+                "format": args.import_format or detect_format(args.import_file),
+                "account_id": args.import_account,
+                "date_format": args.import_date_format,
+                "dry_run": args.import_dry_run,
+            }
+            client = Client(mcp)
+            async with client:
+                result = await client.call_tool("bulk_import_transactions", arguments)
+                print(json.dumps(result.structured_content, indent=2))
+        asyncio.run(_import())
+        raise SystemExit(0)
+
     # Run the server using default stdio transport (blocking)
     mcp.run()
     raise SystemExit(0)
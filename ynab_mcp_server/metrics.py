@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+import mcp.types
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+from fastmcp.tools.tool import ToolResult
+
+from .spec_index import OperationIndex
+from .transports import RATE_LIMIT_HEADER, WrappedTransport, request_namespace
+
+# Upper bounds of the latency buckets, in seconds
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Upper bounds of the payload size buckets, in bytes
+SIZE_BUCKETS = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = tuple[tuple[str, str], ...]
+
+
+@dataclass
+class _Series:
+    buckets: list[int]
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+
+@dataclass
+class Histogram:
+    """A labelled Prometheus histogram (cumulative buckets, `_sum`, `_count`)."""
+
+    name: str
+    help: str
+    bounds: tuple[float, ...] = LATENCY_BUCKETS
+    series: dict[Labels, _Series] = field(default_factory=dict)
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = _Series([0] * len(self.bounds))
+        i = bisect_left(self.bounds, value)
+        if i < len(self.bounds):
+            series.buckets[i] += 1
+        series.count += 1
+        series.total += value
+        series.max = max(series.max, value)
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        for key, series in sorted(self.series.items()):
+            cumulative = 0
+            for bound, n in zip(self.bounds, series.buckets):
+                cumulative += n
+                yield f"{self.name}_bucket{_labels(key, le=_number(bound))} {cumulative}"
+            yield f'{self.name}_bucket{_labels(key, le="+Inf")} {series.count}'
+            yield f"{self.name}_sum{_labels(key)} {_number(series.total)}"
+            yield f"{self.name}_count{_labels(key)} {series.count}"
+
+    def summary(self, label: str, *, scale: float = 1000.0) -> dict[str, dict[str, Any]]:
+        """Per-`label` count, mean and max (latencies in milliseconds by default)."""
+        merged: dict[str, _Series] = {}
+        for key, series in self.series.items():
+            name = dict(key).get(label, "")
+            into = merged.setdefault(name, _Series([]))
+            into.count += series.count
+            into.total += series.total
+            into.max = max(into.max, series.max)
+        return {
+            name: {
+                "count": s.count,
+                "mean": round(s.total / s.count * scale, 3) if s.count else 0.0,
+                "max": round(s.max * scale, 3),
+            }
+            for name, s in sorted(merged.items())
+        }
+
+
+@dataclass
+class Gauge:
+    """A gauge read from `fn` at scrape time; `fn` returns (labels, value) pairs."""
+
+    name: str
+    help: str
+    fn: Callable[[], Iterable[tuple[dict[str, str], float]]]
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} gauge"
+        for labels, value in self.fn():
+            yield f"{self.name}{_labels(tuple(sorted(labels.items())))} {_number(value)}"
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _labels(key: Labels, **extra: str) -> str:
+    pairs = [*key, *extra.items()]
+    if not pairs:
+        return ""
+    escaped = (
+        (k, v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")) for k, v in pairs
+    )
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+class Metrics:
+    """In-process latency and throughput metrics, rendered in Prometheus text format.
+
+    - `tool_duration`: MCP tool calls end to end (`MetricsMiddleware`)
+    - `upstream_duration` / `upstream_bytes`: YNAB API requests that reached the
+      network, per operation (`MetricsTransport`)
+    - `normalize_duration`: time spent in the response hook (parsing and
+      normalizing JSON bodies)
+    - gauges added with `add_gauge`, e.g. cache hit ratio and rate-limit quota
+
+    Comparing the three latencies shows whether time goes to the API, to JSON
+    handling or to FastMCP dispatch.
+    """
+
+    def __init__(self) -> None:
+        self.tool_duration = Histogram(
+            "ynab_mcp_tool_duration_seconds", "MCP tool call latency."
+        )
+        self.upstream_duration = Histogram(
+            "ynab_mcp_upstream_duration_seconds",
+            "YNAB API request latency, including reading the body.",
+        )
+        self.upstream_bytes = Histogram(
+            "ynab_mcp_upstream_response_bytes", "YNAB API response body size.", SIZE_BUCKETS
+        )
+        self.normalize_duration = Histogram(
+            "ynab_mcp_normalize_duration_seconds", "Response hook (JSON normalization) time."
+        )
+        # Last `X-Rate-Limit` remaining count reported by YNAB, per credentials namespace
+        self.upstream_remaining: dict[str, float] = {}
+        self.gauges: list[Gauge] = [
+            Gauge(
+                "ynab_mcp_upstream_rate_limit_remaining",
+                "Requests remaining in the current hour as reported by YNAB.",
+                lambda: [({"namespace": k}, v) for k, v in self.upstream_remaining.items()],
+            )
+        ]
+
+    def add_gauge(
+        self, name: str, help: str, fn: Callable[[], Iterable[tuple[dict[str, str], float]]]
+    ) -> None:
+        self.gauges.append(Gauge(name, help, fn))
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for histogram in (
+            self.tool_duration,
+            self.upstream_duration,
+            self.upstream_bytes,
+            self.normalize_duration,
+        ):
+            lines.extend(histogram.render())
+        for gauge in self.gauges:
+            lines.extend(gauge.render())
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> dict[str, Any]:
+        """A compact JSON view: per-tool / per-operation count, mean and max (ms)."""
+        normalize = self.normalize_duration.summary("")
+        return {
+            "tools_ms": self.tool_duration.summary("tool"),
+            "upstream_ms": self.upstream_duration.summary("operation"),
+            "upstream_bytes": self.upstream_bytes.summary("operation", scale=1.0),
+            "normalize_ms": normalize.get("", {"count": 0, "mean": 0.0, "max": 0.0}),
+            "gauges": {
+                gauge.name: [{**labels, "value": value} for labels, value in gauge.fn()]
+                for gauge in self.gauges
+            },
+        }
+
+    def time_hook(
+        self, hook: Callable[[httpx.Response], Awaitable[None]]
+    ) -> Callable[[httpx.Response], Awaitable[None]]:
+        """Wrap an httpx response hook so its duration is recorded."""
+
+        async def timed(response: httpx.Response) -> None:
+            started = time.perf_counter()
+            try:
+                await hook(response)
+            finally:
+                self.normalize_duration.observe(time.perf_counter() - started)
+
+        return timed
+
+
+class MetricsTransport(WrappedTransport):
+    """Record latency and body size of each request sent to the YNAB API.
+
+    Sits directly above the connection pool, so cache, mirror and coalesced hits
+    are not counted and every retry attempt is. The body is read here so latency
+    covers the full download.
+    """
+
+    def __init__(
+        self,
+        inner: httpx.AsyncBaseTransport,
+        metrics: Metrics,
+        *,
+        index: OperationIndex | None = None,
+    ) -> None:
+        super().__init__(inner)
+        self.metrics = metrics
+        self.index = index
+
+    def _operation(self, request: httpx.Request) -> str:
+        matched = self.index.match(request.method, request.url.path) if self.index else None
+        return matched[0].name if matched else "unknown"
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        labels = {"operation": self._operation(request), "method": request.method}
+        started = time.perf_counter()
+        try:
+            response = await self._inner.handle_async_request(request)
+            content = await response.aread()
+        except Exception:
+            self.metrics.upstream_duration.observe(
+                time.perf_counter() - started, **labels, status="error"
+            )
+            raise
+        self.metrics.upstream_duration.observe(
+            time.perf_counter() - started, **labels, status=str(response.status_code)
+        )
+        self.metrics.upstream_bytes.observe(len(content), operation=labels["operation"])
+        header = response.headers.get(RATE_LIMIT_HEADER)
+        if header:
+            try:
+                used, limit = header.split("/", 1)
+                self.metrics.upstream_remaining[request_namespace(request)] = float(
+                    int(limit) - int(used)
+                )
+            except ValueError:
+                pass
+        return response
+
+
+class MetricsMiddleware(Middleware):
+    def __init__(self, metrics: Metrics) -> None:
+        self.metrics = metrics
+
+    async def on_call_tool(
+        self,
+        context: MiddlewareContext[mcp.types.CallToolRequestParams],
+        call_next: CallNext[mcp.types.CallToolRequestParams, ToolResult],
+    ) -> ToolResult:
+        started = time.perf_counter()
+        status = "error"
+        try:
+            result = await call_next(context)
+            status = "ok"
+            return result
+        finally:
+            self.metrics.tool_duration.observe(
+                time.perf_counter() - started, tool=context.message.name, status=status
+            )
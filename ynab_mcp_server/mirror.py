@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+from . import jsonlib
+from .transports import WrappedTransport, budget_target, request_namespace
+
+# Budget collections that support `last_knowledge_of_server` delta requests,
+# mapped to the key holding the entities inside the response `data` object.
+MIRRORED_RESOURCES: dict[str, str] = {
+    "accounts": "accounts",
+    "categories": "category_groups",
+    "payees": "payees",
+    "transactions": "transactions",
+    "scheduled_transactions": "scheduled_transactions",
+}
+
+MIRROR_EXTENSION = "ynab_mcp.mirror_snapshot"
+# Request extension asking a `MirrorTransport` in opt-in mode to mirror the GET
+USE_MIRROR_EXTENSION = "ynab_mcp.use_mirror"
+
+@dataclass(frozen=True)
+class MirrorSnapshot:
+    """An immutable view of one mirrored collection at a given server_knowledge.
+
+    Each merge produces a new snapshot (and a new `items` list), so readers holding
+    an older snapshot keep a consistent view while the mirror moves on.
+    """
+
+    namespace: str
+    budget_id: str
+    resource: str
+    items: list[dict[str, Any]]
+    server_knowledge: int
+    synced_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def data_key(self) -> str:
+        return MIRRORED_RESOURCES[self.resource]
+
+    def payload(self) -> dict[str, Any]:
+        """Return the snapshot shaped like the YNAB list response body."""
+        return {"data": {self.data_key: self.items, "server_knowledge": self.server_knowledge}}
+
+
+# Called as listener(previous, snapshot, changes) after each merge
+MirrorListener = Callable[["MirrorSnapshot | None", "MirrorSnapshot", list[dict[str, Any]]], None]
+
+
+def _merge_entities(
+    current: list[dict[str, Any]],
+    changes: list[dict[str, Any]],
+) -> list[dict[str, Any]]:
+    """Merge changed entities into a list by `id`, dropping deleted ones."""
+    by_id: dict[Any, dict[str, Any]] = {e.get("id"): e for e in current}
+    for entity in changes:
+        if not isinstance(entity, dict):
+            continue
+        if entity.get("deleted"):
+            by_id.pop(entity.get("id"), None)
+        else:
+            by_id[entity.get("id")] = entity
+    return list(by_id.values())
+
+
+def _merge_category_groups(
+    current: list[dict[str, Any]],
+    changes: list[dict[str, Any]],
+) -> list[dict[str, Any]]:
+    """Merge category groups, merging each group's nested `categories` by `id`.
+
+    Delta responses only carry the categories that changed inside a group, so the
+    nested list is merged rather than replaced.
+    """
+    by_id: dict[Any, dict[str, Any]] = {g.get("id"): g for g in current}
+    for group in changes:
+        if not isinstance(group, dict):
+            continue
+        gid = group.get("id")
+        if group.get("deleted"):
+            by_id.pop(gid, None)
+            continue
+        previous = by_id.get(gid, {})
+        merged = {**previous, **group}
+        merged["categories"] = _merge_entities(
+            previous.get("categories") or [], group.get("categories") or []
+        )
+        by_id[gid] = merged
+    return list(by_id.values())
+
+
+class DeltaMirror:
+    """Per-budget local mirror of YNAB collections kept current with delta requests.
+
+    Entries are keyed by (namespace, budget_id, resource), where namespace is derived
+    from the request credentials. A snapshot younger than `max_age` seconds is served
+    without contacting YNAB; otherwise the next read issues a
+    `last_knowledge_of_server` request and merges only the changes.
+    """
+
+    def __init__(self, *, max_age: float = 0.0) -> None:
+        self.max_age = max_age
+        self._snapshots: dict[tuple[str, str, str], MirrorSnapshot] = {}
+        self._stale: set[tuple[str, str, str]] = set()
+        self._locks: dict[tuple[str, str, str], asyncio.Lock] = {}
+        self._listeners: list[MirrorListener] = []
+
+    def get(self, namespace: str, budget_id: str, resource: str) -> MirrorSnapshot | None:
+        return self._snapshots.get((namespace, budget_id, resource))
+
+    def is_fresh(self, snapshot: MirrorSnapshot) -> bool:
+        if (snapshot.namespace, snapshot.budget_id, snapshot.resource) in self._stale:
+            return False
+        return (time.monotonic() - snapshot.synced_at) < self.max_age
+
+    def invalidate(self, namespace: str, budget_id: str) -> None:
+        """Force the next read of any collection in this budget to sync with YNAB.
+
+        The `last-used` alias may resolve to any budget: a write through it marks
+        every budget in the namespace stale, and a write to a concrete budget also
+        marks the alias's collections stale.
+        """
+        if budget_id == "last-used":
+            self._stale.update(k for k in self._snapshots if k[0] == namespace)
+        else:
+            self._stale.update((namespace, "last-used", r) for r in MIRRORED_RESOURCES)
+        self._stale.update((namespace, budget_id, r) for r in MIRRORED_RESOURCES)
+
+    def add_listener(self, listener: MirrorListener) -> None:
+        """Call `listener(previous, snapshot, changes)` after every merge.
+
+        `changes` are the raw entities of the merged response, so local indexes can
+        be updated incrementally instead of rebuilt from `snapshot.items`.
+        """
+        self._listeners.append(listener)
+
+    def lock(self, namespace: str, budget_id: str, resource: str) -> asyncio.Lock:
+        key = (namespace, budget_id, resource)
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
+
+    def merge(
+        self,
+        namespace: str,
+        budget_id: str,
+        resource: str,
+        data: dict[str, Any],
+    ) -> MirrorSnapshot:
+        """Merge a (full or delta) response `data` object and store the new snapshot."""
+        key = MIRRORED_RESOURCES[resource]
+        changes = data.get(key) or []
+        previous = self.get(namespace, budget_id, resource)
+        base = previous.items if previous is not None else []
+        if resource == "categories":
+            items = _merge_category_groups(base, changes)
+        else:
+            items = _merge_entities(base, changes)
+
+        knowledge = data.get("server_knowledge")
+        if not isinstance(knowledge, int):
+            knowledge = previous.server_knowledge if previous is not None else 0
+
+        snapshot = MirrorSnapshot(
+            namespace=namespace,
+            budget_id=budget_id,
+            resource=resource,
+            items=items,
+            server_knowledge=knowledge,
+        )
+        self._snapshots[(namespace, budget_id, resource)] = snapshot
+        self._stale.discard((namespace, budget_id, resource))
+        for listener in self._listeners:
+            listener(previous, snapshot, changes)
+        return snapshot
+
+    def forget(self, namespace: str) -> None:
+        """Drop every snapshot held for a namespace (e.g. an evicted tenant)."""
+        for key in [k for k in self._snapshots if k[0] == namespace]:
+            del self._snapshots[key]
+        self._stale = {k for k in self._stale if k[0] != namespace}
+        # A lock held by a running sync stays, so that sync is not duplicated
+        for key in [k for k, v in self._locks.items() if k[0] == namespace and not v.locked()]:
+            del self._locks[key]
+
+    def clear(self) -> None:
+        self._snapshots.clear()
+        self._stale.clear()
+
+
+class MirrorTransport(WrappedTransport):
+    """Serve full-collection GETs from a `DeltaMirror`, syncing with delta requests.
+
+    Only unfiltered list requests (no query string) are mirrored; anything else,
+    including requests that already carry `last_knowledge_of_server`, passes through.
+    Writes to a budget mark its mirrored collections stale. With `opt_in`, only
+    GETs carrying the `USE_MIRROR_EXTENSION` extension are mirrored, so local
+    tools (analytics, search) can share a mirror that tool reads bypass.
+    """
+
+    def __init__(
+        self, inner: httpx.AsyncBaseTransport, mirror: DeltaMirror, *, opt_in: bool = False
+    ) -> None:
+        super().__init__(inner)
+        self.mirror = mirror
+        self.opt_in = opt_in
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        target = budget_target(request.url)
+        if target is None:
+            return await self._inner.handle_async_request(request)
+
+        budget_id, rest = target
+        namespace = request_namespace(request)
+        if request.method != "GET":
+            self.mirror.invalidate(namespace, budget_id)
+            return await self._inner.handle_async_request(request)
+
+        resource = rest.strip("/")
+        if self.opt_in and not request.extensions.get(USE_MIRROR_EXTENSION):
+            return await self._inner.handle_async_request(request)
+        if resource not in MIRRORED_RESOURCES or request.url.query:
+            return await self._inner.handle_async_request(request)
+
+        async with self.mirror.lock(namespace, budget_id, resource):
+            snapshot = self.mirror.get(namespace, budget_id, resource)
+            if snapshot is None or not self.mirror.is_fresh(snapshot):
+                synced = await self._sync(request, namespace, budget_id, resource, snapshot)
+                if isinstance(synced, httpx.Response):
+                    # Upstream error: let the client's response hook surface it
+                    return synced
+                snapshot = synced
+
+        return httpx.Response(
+            200,
+            headers={"Content-Type": "application/json"},
+            content=jsonlib.dumps(snapshot.payload()),
+            request=request,
+            extensions={MIRROR_EXTENSION: snapshot},
+        )
+
+    async def _sync(
+        self,
+        request: httpx.Request,
+        namespace: str,
+        budget_id: str,
+        resource: str,
+        snapshot: MirrorSnapshot | None,
+    ) -> MirrorSnapshot | httpx.Response:
+        url = request.url
+        if snapshot is not None:
+            url = url.copy_merge_params({"last_knowledge_of_server": snapshot.server_knowledge})
+        upstream = httpx.Request(
+            request.method,
+            url,
+            headers=request.headers,
+            extensions=request.extensions,
+        )
+        response = await self._inner.handle_async_request(upstream)
+        if response.status_code != 200:
+            return response
+
+        try:
+            await response.aread()
+            body = jsonlib.loads(response.content)
+        except ValueError:
+            return response
+        finally:
+            await response.aclose()
+
+        data = body.get("data") if isinstance(body, dict) else None
+        if not isinstance(data, dict):
+            return response
+        return self.mirror.merge(namespace, budget_id, resource, data)
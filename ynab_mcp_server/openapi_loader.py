@@ -1,62 +1,273 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
 import os
+import pickle
+import tempfile
+import threading
+from collections.abc import Callable
 from pathlib import Path
-from typing import Any
+from typing import IO, Any
 
 import httpx
-import yaml
+
+from . import jsonlib
+from .profiling import phase
 
 DEFAULT_SPEC_URL = "https://api.ynab.com/papi/open_api_spec.yaml"
 CACHE_ENV = "YNAB_MCP_SPEC_CACHE"
+OFFLINE_FIRST_ENV = "YNAB_MCP_SPEC_OFFLINE_FIRST"
 
+# Bump when the compiled artifact layout changes so stale artifacts are ignored.
+COMPILED_FORMAT_VERSION = 1
 
-def _default_cache_path() -> Path:
+
+def _default_cache_dir() -> Path:
     base = os.environ.get("XDG_CACHE_HOME", os.path.join(Path.home(), ".cache"))
-    return Path(base) / "ynab-mcp-server" / "open_api_spec.yaml"
+    return Path(base) / "ynab-mcp-server"
+
+
+def _default_cache_path() -> Path:
+    return _default_cache_dir() / "open_api_spec.yaml"
+
+
+def _cache_path() -> Path:
+    return Path(os.environ.get(CACHE_ENV, str(_default_cache_path())))
+
+
+def _compiled_path(cache_path: Path) -> Path:
+    """Location of the compiled (pre-parsed) artifact stored next to the spec cache."""
+    return cache_path.with_name(cache_path.name + ".compiled")
+
+
+def _meta_path(cache_path: Path) -> Path:
+    """Location of the stored HTTP validators (ETag/Last-Modified) for the cache file."""
+    return cache_path.with_name(cache_path.name + ".meta.json")
+
+
+def _write_atomic(path: Path, write: Callable[[IO[bytes]], object]) -> None:
+    """Write `path` through a temp file of its own, so concurrent writers never share one."""
+    with tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=path.name + ".", suffix=".tmp", delete=False
+    ) as f:
+        tmp = Path(f.name)
+        try:
+            write(f)
+        except BaseException:
+            f.close()
+            tmp.unlink(missing_ok=True)
+            raise
+    try:
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def _write_text_atomic(path: Path, text: str) -> None:
+    _write_atomic(path, lambda f: f.write(text.encode("utf-8")))
+
+
+def _conditional_headers(cache_path: Path, spec_url: str) -> dict[str, str]:
+    """Build If-None-Match/If-Modified-Since headers from validators of the cached copy."""
+    if not cache_path.exists():
+        return {}
+    try:
+        meta = json.loads(_meta_path(cache_path).read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    if not isinstance(meta, dict) or meta.get("url") != spec_url:
+        return {}
+    headers: dict[str, str] = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+    return headers
+
+
+def _write_validators(cache_path: Path, spec_url: str, headers: httpx.Headers) -> None:
+    meta = {
+        "url": spec_url,
+        "etag": headers.get("ETag"),
+        "last_modified": headers.get("Last-Modified"),
+    }
+    _write_text_atomic(_meta_path(cache_path), json.dumps(meta))
+
+
+def _spec_digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _load_compiled(path: Path, digest: str) -> dict[str, Any] | None:
+    """Load a compiled spec if it was built from source text with the given digest.
+
+    The artifact holds two pickles: a small (version, digest) header followed by the
+    parsed spec, so a mismatch is detected without unpickling the spec itself.
+    """
+    try:
+        with path.open("rb") as f:
+            header = pickle.load(f)
+            if header != (COMPILED_FORMAT_VERSION, digest):
+                return None
+            spec = pickle.load(f)
+    except Exception:
+        return None
+    return spec if isinstance(spec, dict) else None
+
+
+def _write_compiled(path: Path, digest: str, spec: dict[str, Any]) -> None:
+    def _dump(f: IO[bytes]) -> None:
+        pickle.dump((COMPILED_FORMAT_VERSION, digest), f, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.dump(spec, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    _write_atomic(path, _dump)
+
+
+def _load_spec_text(text: str, cache_path: Path) -> dict[str, Any]:
+    """Parse spec text, reusing the compiled artifact when the source hash matches."""
+    digest = _spec_digest(text)
+    compiled_path = _compiled_path(cache_path)
+    spec = _load_compiled(compiled_path, digest)
+    if spec is not None:
+        return spec
+
+    spec = _parse_spec(text)
+    try:
+        _write_compiled(compiled_path, digest, spec)
+    except Exception:
+        # Cache failures are non-fatal
+        pass
+    return spec
 
 
 async def fetch_openapi_spec(
     spec_url: str = DEFAULT_SPEC_URL,
     *,
     timeout: float = 30.0,
+    offline_first: bool | None = None,
+    client: httpx.AsyncClient | None = None,
 ) -> dict[str, Any]:
     """Fetch the OpenAPI spec from a URL (YAML or JSON) and return it as a dict.
 
     Falls back to cached file if available and network fetch fails.
     You can override the cache location by setting YNAB_MCP_SPEC_CACHE.
+
+    The request is conditional (If-None-Match/If-Modified-Since) when validators for
+    the cached copy are known; a 304 reuses the cache without downloading the body.
+    Parsing is skipped when a compiled artifact built from identical source text
+    exists next to the cache file (see `compile_spec`).
+
+    With `offline_first` (or YNAB_MCP_SPEC_OFFLINE_FIRST=1) and an existing cache,
+    the cached spec is returned immediately and refreshed in a background thread
+    for the next start.
+
+    Pass `client` to download through an existing connection pool (its own timeout
+    applies); it is left open.
     """
-    cache_path = Path(os.environ.get(CACHE_ENV, str(_default_cache_path())))
+    cache_path = _cache_path()
     cache_path.parent.mkdir(parents=True, exist_ok=True)
 
-    try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            resp = await client.get(spec_url)
-            resp.raise_for_status()
-            text = resp.text
-    except Exception:
-        if cache_path.exists():
+    if offline_first is None:
+        offline_first = (os.environ.get(OFFLINE_FIRST_ENV) or "").strip().lower() in {
+            "1",
+            "true",
+            "yes",
+            "on",
+        }
+    if offline_first and cache_path.exists():
+        _refresh_in_background(spec_url, cache_path, timeout)
+        with phase("spec fetch"):
+            text = cache_path.read_text(encoding="utf-8")
+    else:
+        try:
+            with phase("spec fetch"):
+                text = await _download_spec(spec_url, cache_path, timeout, client=client)
+        except Exception:
+            if not cache_path.exists():
+                raise
             # Fallback to cache
-            return _parse_spec(cache_path.read_text(encoding="utf-8"))
-        raise
+            text = cache_path.read_text(encoding="utf-8")
+
+    with phase("spec parse"):
+        return _load_spec_text(text, cache_path)
+
+
+async def _download_spec(
+    spec_url: str,
+    cache_path: Path,
+    timeout: float,
+    *,
+    client: httpx.AsyncClient | None = None,
+) -> str:
+    """Conditionally GET the spec and return its text, reading the cache on 304."""
+    headers = _conditional_headers(cache_path, spec_url)
+    if client is None:
+        async with httpx.AsyncClient(timeout=timeout) as own_client:
+            resp = await own_client.get(spec_url, headers=headers)
+    else:
+        resp = await client.get(spec_url, headers=headers)
+    if resp.status_code == 304:
+        return cache_path.read_text(encoding="utf-8")
+    resp.raise_for_status()
+    text = resp.text
 
     # Write-through cache
     try:
-        cache_path.write_text(text, encoding="utf-8")
+        _write_text_atomic(cache_path, text)
+        _write_validators(cache_path, spec_url, resp.headers)
     except Exception:
         # Cache failures are non-fatal
         pass
 
-    return _parse_spec(text)
+    return text
+
+
+def _refresh_in_background(spec_url: str, cache_path: Path, timeout: float) -> threading.Thread:
+    """Refresh the spec cache (and compiled artifact) without blocking startup."""
+
+    async def _refresh() -> None:
+        text = await _download_spec(spec_url, cache_path, timeout)
+        _load_spec_text(text, cache_path)
+
+    def _run() -> None:
+        try:
+            asyncio.run(_refresh())
+        except Exception:
+            # Offline or failed refresh keeps the existing cache
+            pass
+
+    thread = threading.Thread(target=_run, name="ynab-spec-refresh", daemon=True)
+    thread.start()
+    return thread
+
+
+async def compile_spec(
+    spec_url: str = DEFAULT_SPEC_URL,
+    *,
+    timeout: float = 30.0,
+) -> Path:
+    """Fetch the spec and (re)build its compiled artifact; return the artifact path."""
+    cache_path = _cache_path()
+    spec = await fetch_openapi_spec(spec_url, timeout=timeout, offline_first=False)
+    text = cache_path.read_text(encoding="utf-8")
+    compiled_path = _compiled_path(cache_path)
+    # Write unconditionally so a failed write-through during fetch surfaces here
+    _write_compiled(compiled_path, _spec_digest(text), spec)
+    return compiled_path
 
 
 def _parse_spec(text: str) -> dict[str, Any]:
     # Try JSON first, then YAML
     try:
-        return json.loads(text)
+        return jsonlib.loads(text)
     except json.JSONDecodeError:
         pass
+    # Imported on demand: most starts parse JSON or reuse the compiled artifact
+    import yaml
+
     data = yaml.safe_load(text)
     if not isinstance(data, dict):
         raise ValueError("OpenAPI spec content is not a mapping")
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import secrets
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import quote
+
+import httpx
+from fastmcp import FastMCP
+
+from . import jsonlib
+from .mirror import MIRROR_EXTENSION, MirrorSnapshot
+from .transports import request_namespace
+
+# Heavy budget collections that get paging tools: resource path -> (tag, data key)
+PAGED_RESOURCES: dict[str, tuple[str, str]] = {
+    "transactions": ("Transactions", "transactions"),
+    "payees": ("Payees", "payees"),
+    "scheduled_transactions": ("Scheduled Transactions", "scheduled_transactions"),
+}
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class _Snapshot:
+    budget_id: str
+    resource: str
+    items: list[dict[str, Any]]
+    server_knowledge: int | None
+    created_at: float
+    namespace: str = ""
+
+
+class PageStore:
+    """Holds the full list behind a paging session so later pages are consistent.
+
+    The first page fetches the collection once; following pages read the same list
+    through their cursor, without another upstream call. Sessions expire after
+    `ttl` seconds and at most `max_snapshots` are kept (least recently used first
+    out).
+    """
+
+    def __init__(self, *, max_snapshots: int = 32, ttl: float = 600.0) -> None:
+        self.max_snapshots = max_snapshots
+        self.ttl = ttl
+        self._snapshots: OrderedDict[str, _Snapshot] = OrderedDict()
+
+    def put(self, snapshot: _Snapshot) -> str:
+        snapshot_id = secrets.token_urlsafe(12)
+        self._snapshots[snapshot_id] = snapshot
+        while len(self._snapshots) > self.max_snapshots:
+            self._snapshots.popitem(last=False)
+        return snapshot_id
+
+    def get(self, snapshot_id: str, now: float | None = None) -> _Snapshot | None:
+        now = time.monotonic() if now is None else now
+        snapshot = self._snapshots.get(snapshot_id)
+        if snapshot is None:
+            return None
+        if now - snapshot.created_at > self.ttl:
+            del self._snapshots[snapshot_id]
+            return None
+        self._snapshots.move_to_end(snapshot_id)
+        return snapshot
+
+
+def encode_cursor(snapshot_id: str, offset: int) -> str:
+    raw = jsonlib.dumps({"s": snapshot_id, "o": offset})
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = jsonlib.loads(raw)
+        return str(data["s"]), int(data["o"])
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+async def _load(client: httpx.AsyncClient, budget_id: str, resource: str) -> _Snapshot:
+    response = await client.get(f"budgets/{quote(budget_id, safe='')}/{resource}")
+    response.raise_for_status()
+    mirrored = response.extensions.get(MIRROR_EXTENSION)
+    knowledge: int | None
+    if isinstance(mirrored, MirrorSnapshot):
+        # Mirror snapshots are immutable; share their item list instead of copying
+        items, knowledge = mirrored.items, mirrored.server_knowledge
+    else:
+        data = (response.json() or {}).get("data") or {}
+        items = data.get(PAGED_RESOURCES[resource][1]) or []
+        knowledge = data.get("server_knowledge")
+    return _Snapshot(
+        budget_id, resource, items, knowledge, time.monotonic(), request_namespace(response.request)
+    )
+
+
+async def fetch_page(
+    client: httpx.AsyncClient,
+    store: PageStore,
+    resource: str,
+    budget_id: str,
+    *,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+    namespace: str | None = None,
+) -> dict[str, Any]:
+    """Return one page of a budget collection plus the cursor for the next one.
+
+    With `namespace` (the caller's credentials namespace), a cursor is only
+    honored for the credentials that took its snapshot.
+    """
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    if cursor:
+        snapshot_id, offset = decode_cursor(cursor)
+        snapshot = store.get(snapshot_id)
+        if snapshot is None or (namespace is not None and snapshot.namespace != namespace):
+            raise ValueError("Cursor expired; request the first page again")
+        if (snapshot.budget_id, snapshot.resource) != (budget_id, resource):
+            raise ValueError("Cursor belongs to a different budget or collection")
+    else:
+        snapshot = await _load(client, budget_id, resource)
+        snapshot_id, offset = store.put(snapshot), 0
+
+    items = snapshot.items[offset : offset + limit]
+    end = offset + len(items)
+    data: dict[str, Any] = {PAGED_RESOURCES[resource][1]: items}
+    if snapshot.server_knowledge is not None:
+        data["server_knowledge"] = snapshot.server_knowledge
+    return {
+        "data": data,
+        "total": len(snapshot.items),
+        "next_cursor": encode_cursor(snapshot_id, end) if end < len(snapshot.items) else None,
+    }
+
+
+def register_paging_tools(
+    mcp: FastMCP,
+    client: httpx.AsyncClient,
+    store: PageStore,
+    *,
+    include_tags: set[str] | None = None,
+    exclude_tags: set[str] | None = None,
+    namespace: Callable[[], str] | None = None,
+) -> None:
+    """Register `<resource>_page` tools for the collections in PAGED_RESOURCES.
+
+    `namespace` returns the caller's credentials namespace when one server
+    serves several tokens, so cursors cannot be replayed across them.
+    """
+    for resource, (tag, _key) in PAGED_RESOURCES.items():
+        if exclude_tags and tag in exclude_tags:
+            continue
+        if include_tags is not None and tag not in include_tags:
+            continue
+
+        def _make(resource: str = resource):
+            async def page(
+                budget_id: str,
+                limit: int = DEFAULT_PAGE_SIZE,
+                cursor: str | None = None,
+            ) -> dict[str, Any]:
+                return await fetch_page(
+                    client,
+                    store,
+                    resource,
+                    budget_id,
+                    limit=limit,
+                    cursor=cursor,
+                    namespace=namespace() if namespace is not None else None,
+                )
+
+            return page
+
+        label = resource.replace("_", " ")
+        mcp.tool(
+            _make(),
+            name=f"get_{resource}_page",
+            description=(
+                f"List a budget's {label} one page at a time. Omit `cursor` for the first "
+                f"page; pass the returned `next_cursor` to get the next one (null when "
+                f"done). Pages come from one consistent snapshot taken on the first page. "
+                f"`limit` is 1-{MAX_PAGE_SIZE} (default {DEFAULT_PAGE_SIZE})."
+            ),
+            tags={tag},
+        )
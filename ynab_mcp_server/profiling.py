@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+
+_active: ContextVar[StartupProfile | None] = ContextVar("ynab_mcp_startup_profile", default=None)
+
+
+class StartupProfile:
+    """Wall-clock breakdown of server startup into named phases.
+
+    Code marks phases with the module-level `phase(name)` / `laps()`, which do
+    nothing unless a profile is active (see `activate`), so the markers cost
+    nothing in normal runs. Repeated phases are summed.
+    """
+
+    def __init__(self) -> None:
+        self.phases: dict[str, float] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def activate(self) -> Token[StartupProfile | None]:
+        """Make this the profile for the current context (and tasks started from it)."""
+        return _active.set(self)
+
+    def report(self) -> str:
+        total = sum(self.phases.values()) or 1.0
+        width = max([len(name) for name in self.phases] + [5])
+        lines = [f"{'phase':<{width}}  {'ms':>9}  {'share':>6}"]
+        for name, seconds in self.phases.items():
+            lines.append(f"{name:<{width}}  {seconds * 1000:>9.1f}  {seconds / total:>6.1%}")
+        lines.append(f"{'total':<{width}}  {sum(self.phases.values()) * 1000:>9.1f}")
+        return "\n".join(lines)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time the enclosed block as `name` in the active profile, if any."""
+    profile = _active.get()
+    if profile is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add(name, time.perf_counter() - started)
+
+
+class Laps:
+    """Consecutive phases: `next(name)` ends the running phase and starts another."""
+
+    def __init__(self, profile: StartupProfile | None) -> None:
+        self._profile = profile
+        self._name: str | None = None
+        self._started = 0.0
+
+    def next(self, name: str | None) -> None:
+        if self._profile is None:
+            return
+        now = time.perf_counter()
+        if self._name is not None:
+            self._profile.add(self._name, now - self._started)
+        self._name, self._started = name, now
+
+    def stop(self) -> None:
+        self.next(None)
+
+
+def laps() -> Laps:
+    return Laps(_active.get())
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from typing import Any
+
+import mcp.types
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+from fastmcp.tools.tool import Tool, ToolResult
+
+FIELDS_PARAM = "fields"
+
+FIELDS_SCHEMA: dict[str, Any] = {
+    "type": "array",
+    "items": {"type": "string"},
+    "description": (
+        "Only return these fields, as dotted paths inside the response `data` "
+        "(lists are traversed), e.g. [\"transactions.id\", \"transactions.amount\", "
+        "\"server_knowledge\"]. Omit to return the full response."
+    ),
+}
+
+# Schema keywords that only document a schema; dropped in compact mode
+_ANNOTATION_KEYS = frozenset({"description", "title", "example", "examples"})
+# Keywords whose value is a mapping of names to subschemas
+_SCHEMA_MAPS = ("properties", "patternProperties", "$defs", "definitions")
+# Keywords whose value is a subschema or a list of subschemas
+_SCHEMA_ITEMS = ("items", "additionalProperties", "not", "allOf", "anyOf", "oneOf", "prefixItems")
+
+
+def _walk_schema(schema: Any, drop: frozenset[str]) -> Any:
+    """Copy a JSON schema without the given keywords at any schema level."""
+    if isinstance(schema, list):
+        return [_walk_schema(s, drop) for s in schema]
+    if not isinstance(schema, dict):
+        return schema
+    out: dict[str, Any] = {}
+    for key, value in schema.items():
+        if key in drop:
+            continue
+        if key in _SCHEMA_MAPS and isinstance(value, dict):
+            out[key] = {name: _walk_schema(sub, drop) for name, sub in value.items()}
+        elif key in _SCHEMA_ITEMS:
+            out[key] = _walk_schema(value, drop)
+        else:
+            out[key] = value
+    return out
+
+
+def compact_schema(schema: dict[str, Any]) -> dict[str, Any]:
+    """Strip descriptions, titles and examples from a JSON schema."""
+    return _walk_schema(schema, _ANNOTATION_KEYS)
+
+
+def compact_component(_route: Any, component: Any) -> None:
+    """`mcp_component_fn` that compacts a generated tool's output schema."""
+    if isinstance(component, Tool) and component.output_schema is not None:
+        component.output_schema = compact_schema(component.output_schema)
+
+
+def _relax_schema(schema: dict[str, Any]) -> dict[str, Any]:
+    """Drop `required` so projected (partial) results still validate."""
+    return _walk_schema(schema, frozenset({"required"}))
+
+
+def _field_tree(fields: list[str]) -> dict[str, Any]:
+    tree: dict[str, Any] = {}
+    for path in fields:
+        node = tree
+        for part in path.split("."):
+            if not part:
+                continue
+            node = node.setdefault(part, {})
+    return tree
+
+
+def _apply_tree(value: Any, tree: dict[str, Any]) -> Any:
+    if not tree:
+        return value
+    if isinstance(value, list):
+        return [_apply_tree(v, tree) for v in value]
+    if isinstance(value, dict):
+        return {k: _apply_tree(value[k], sub) for k, sub in tree.items() if k in value}
+    return value
+
+
+def project(payload: Any, fields: list[str]) -> Any:
+    """Keep only `fields` (dotted paths, rooted inside `data` when present)."""
+    tree = _field_tree(fields)
+    if isinstance(payload, dict) and isinstance(payload.get("data"), dict):
+        return {**payload, "data": _apply_tree(payload["data"], tree)}
+    return _apply_tree(payload, tree)
+
+
+class Projection:
+    """Adds a `fields` argument to GET tools and trims their results to it.
+
+    `component_fn` is passed to `FastMCP.from_openapi` as `mcp_component_fn`; it
+    records which tools accept `fields`. `ProjectionMiddleware` removes the argument
+    before the request is built and projects the structured result afterwards.
+    """
+
+    def __init__(self) -> None:
+        self.tools: set[str] = set()
+
+    def component_fn(self, route: Any, component: Any) -> None:
+        if not isinstance(component, Tool) or str(route.method).upper() != "GET":
+            return
+        properties = component.parameters.setdefault("properties", {})
+        if FIELDS_PARAM in properties:
+            # The operation has its own `fields` parameter; leave it alone
+            return
+        properties[FIELDS_PARAM] = FIELDS_SCHEMA
+        if component.output_schema is not None:
+            component.output_schema = _relax_schema(component.output_schema)
+        self.tools.add(component.name)
+
+    def split(self, name: str, arguments: dict[str, Any]) -> tuple[dict[str, Any], list[str]]:
+        """Separate the projection fields from the tool's own arguments."""
+        if name not in self.tools or FIELDS_PARAM not in arguments:
+            return arguments, []
+        arguments = dict(arguments)
+        fields = arguments.pop(FIELDS_PARAM) or []
+        if isinstance(fields, str):
+            fields = fields.split(",")
+        return arguments, [f.strip() for f in fields if f and f.strip()]
+
+    def apply(self, result: ToolResult, fields: list[str]) -> ToolResult:
+        if not fields or result.structured_content is None:
+            return result
+        return ToolResult(structured_content=project(result.structured_content, fields))
+
+
+class ProjectionMiddleware(Middleware):
+    def __init__(self, projection: Projection) -> None:
+        self.projection = projection
+
+    async def on_call_tool(
+        self,
+        context: MiddlewareContext[mcp.types.CallToolRequestParams],
+        call_next: CallNext[mcp.types.CallToolRequestParams, ToolResult],
+    ) -> ToolResult:
+        message = context.message
+        arguments, fields = self.projection.split(message.name, message.arguments or {})
+        if arguments is message.arguments or not message.arguments:
+            return await call_next(context)
+        context = context.copy(message=message.model_copy(update={"arguments": arguments}))
+        return self.projection.apply(await call_next(context), fields)
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+import time
+from bisect import bisect_right
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, Literal
+
+import httpx
+
+from . import jsonlib
+from .transports import RATE_LIMIT_HEADER, WrappedTransport, request_namespace
+
+# YNAB allows 200 requests per access token in a rolling one-hour window.
+YNAB_HOURLY_LIMIT = 200
+
+# Admit timestamps of one key inside the current window, oldest first
+_Window = list[float]
+_Update = Callable[[_Window], tuple[_Window, Any]]
+
+
+class RateLimitExceeded(httpx.TransportError):
+    """Raised instead of sending a request when the local quota is exhausted."""
+
+
+class _MemoryWindows:
+    """Sliding-window logs held in process memory.
+
+    At most `max_keys` logs are kept; the least recently used is dropped first,
+    so only a token idle for longer than every other tracked one forgets its
+    recent requests.
+    """
+
+    def __init__(self, max_keys: int = 4096) -> None:
+        self.max_keys = max_keys
+        self._state: OrderedDict[str, _Window] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def update(self, key: str, fn: _Update) -> Any:
+        with self._lock:
+            window, result = fn(list(self._state.get(key, ())))
+            self._state[key] = window
+            self._state.move_to_end(key)
+            while len(self._state) > self.max_keys:
+                self._state.popitem(last=False)
+            return result
+
+    def peek(self, key: str, *, cached: bool = False) -> _Window:
+        with self._lock:
+            return list(self._state.get(key, ()))
+
+
+class _SqliteWindows:
+    """Sliding-window logs shared between processes through a SQLite file.
+
+    Each update runs in a `BEGIN IMMEDIATE` transaction, so concurrent server
+    processes using the same token share one log. Updates block while another
+    process holds the file, so `RateLimiter` runs them in a thread.
+    """
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(path), timeout=5.0, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS windows (key TEXT PRIMARY KEY, admits TEXT NOT NULL)"
+        )
+        self._lock = threading.Lock()
+        # The last window read or written per key, for callers that must not block
+        self._seen: dict[str, _Window] = {}
+
+    def _read(self, key: str) -> _Window:
+        row = self._conn.execute("SELECT admits FROM windows WHERE key = ?", (key,)).fetchone()
+        window = self._seen[key] = list(jsonlib.loads(row[0])) if row else []
+        return list(window)
+
+    def update(self, key: str, fn: _Update) -> Any:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                window, result = fn(self._read(key))
+                self._seen[key] = window
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO windows (key, admits) VALUES (?, ?)",
+                    (key, jsonlib.dumps(window).decode("utf-8")),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            return result
+
+    def peek(self, key: str, *, cached: bool = False) -> _Window:
+        if cached:
+            return list(self._seen.get(key, ()))
+        with self._lock:
+            return self._read(key)
+
+
+class RateLimiter:
+    """Client-side sliding window matching YNAB's rolling hourly quota.
+
+    Every admitted request is logged with its timestamp, and at most `limit`
+    requests are admitted in any `period` seconds. A new slot opens only when
+    the oldest request in the window ages out, exactly as on YNAB's side. When
+    the window is full, `mode="wait"` queues the call until a slot opens (up to
+    `max_wait` seconds) and `mode="shed"` fails immediately with
+    `RateLimitExceeded`. The `X-Rate-Limit: used/limit` header YNAB returns
+    sets the number of used slots.
+
+    Pass `state_path` to share the window across processes via SQLite.
+    """
+
+    def __init__(
+        self,
+        *,
+        limit: int = YNAB_HOURLY_LIMIT,
+        period: float = 3600.0,
+        mode: Literal["wait", "shed"] = "wait",
+        max_wait: float = 60.0,
+        state_path: Path | None = None,
+    ) -> None:
+        if limit <= 0:
+            raise ValueError("limit must be positive")
+        self.limit = limit
+        self.period = period
+        self.mode = mode
+        self.max_wait = max_wait
+        self._windows: _MemoryWindows | _SqliteWindows = (
+            _SqliteWindows(state_path) if state_path is not None else _MemoryWindows()
+        )
+
+    def _live(self, window: _Window, now: float) -> _Window:
+        """The admits of `window` that still count against the quota at `now`."""
+        return window[bisect_right(window, now - self.period) :]
+
+    def try_acquire(self, key: str, now: float | None = None) -> float:
+        """Take a slot if one is free; return 0.0, or the seconds until one will be."""
+        now = time.time() if now is None else now
+
+        def _take(window: _Window) -> tuple[_Window, float]:
+            window = self._live(window, now)
+            if len(window) < self.limit:
+                return [*window, now], 0.0
+            return window, window[-self.limit] + self.period - now
+
+        return self._windows.update(key, _take)
+
+    async def acquire(self, key: str, request: httpx.Request | None = None) -> None:
+        deadline = time.monotonic() + self.max_wait
+        while True:
+            wait = await self._offload(self.try_acquire, key)
+            if wait <= 0:
+                return
+            if self.mode == "shed" or time.monotonic() + wait > deadline:
+                raise RateLimitExceeded(
+                    f"Local YNAB rate limit reached ({self.limit} requests per "
+                    f"{int(self.period)}s); next request allowed in {wait:.0f}s",
+                    request=request,
+                )
+            await asyncio.sleep(wait)
+
+    async def _offload(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run a window read or update off the event loop when it may block on SQLite."""
+        if isinstance(self._windows, _SqliteWindows):
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+    def observe(self, key: str, header: str | None, now: float | None = None) -> None:
+        """Set the number of used slots to what YNAB reports (`used/limit`).
+
+        Requests YNAB counts but this log has not seen (made elsewhere with the
+        same token) are assumed to have been made just now; the oldest logged
+        requests are dropped when YNAB counts fewer than the log holds.
+        """
+        if not header:
+            return
+        try:
+            used_s, _limit_s = header.split("/", 1)
+            used = int(used_s)
+        except ValueError:
+            return
+        now = time.time() if now is None else now
+
+        def _set(window: _Window) -> tuple[_Window, None]:
+            window = self._live(window, now)
+            if used > len(window):
+                return [*window, *[now] * (used - len(window))], None
+            return window[len(window) - max(0, used) :], None
+
+        self._windows.update(key, _set)
+
+    def status(
+        self, key: str, now: float | None = None, *, cached: bool = False
+    ) -> dict[str, Any]:
+        """Current quota for `key`; reads the window without modifying it.
+
+        With `cached=True` a shared SQLite window is not read; the answer comes
+        from what this process last read or wrote, so it never blocks.
+        """
+        now = time.time() if now is None else now
+        window = self._live(self._windows.peek(key, cached=cached), now)
+        remaining = max(0, self.limit - len(window))
+        next_slot = 0.0 if remaining else window[-self.limit] + self.period - now
+        return {
+            "limit": self.limit,
+            "period_seconds": self.period,
+            "remaining": remaining,
+            "seconds_until_next_slot": round(next_slot, 1),
+            "seconds_until_full": round(window[-1] + self.period - now, 1) if window else 0.0,
+            "mode": self.mode,
+        }
+
+
+class RateLimitTransport(WrappedTransport):
+    """Take a token from a `RateLimiter` before each upstream request."""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport, limiter: RateLimiter) -> None:
+        super().__init__(inner)
+        self.limiter = limiter
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        key = request_namespace(request)
+        await self.limiter.acquire(key, request)
+        response = await self._inner.handle_async_request(request)
+        await self.limiter._offload(
+            self.limiter.observe, key, response.headers.get(RATE_LIMIT_HEADER)
+        )
+        return response
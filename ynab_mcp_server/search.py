@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+import re
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Callable, Iterable
+from datetime import date
+from typing import Any
+from urllib.parse import quote
+
+import httpx
+from fastmcp import FastMCP
+
+from .mirror import MIRROR_EXTENSION, USE_MIRROR_EXTENSION, DeltaMirror, MirrorSnapshot
+
+_TOKEN_RE = re.compile(r"\w+")
+# Text fields of a transaction (and its subtransactions) that are searchable
+_TEXT_FIELDS = ("payee_name", "memo", "category_name", "account_name")
+# Fields kept per indexed transaction and returned in results
+_RESULT_FIELDS = (
+    "id", "date", "amount", "payee_name", "memo", "category_name", "account_name", "account_id",
+)
+
+
+def _tokens(text: str) -> set[str]:
+    return set(_TOKEN_RE.findall(text.casefold()))
+
+
+class TransactionIndex:
+    """In-memory search index over one budget's transactions.
+
+    - an inverted index from lowercase word to transaction ids (payee, memo,
+      category and account names, including those of subtransactions)
+    - sorted (absolute amount, id) and (date, id) lists for range lookups
+
+    `apply` upserts/deletes changed transactions one at a time, so a delta sync
+    touches only the changed entries.
+    """
+
+    def __init__(self, version: int | None = None) -> None:
+        self.version = version
+        self.docs: dict[str, dict[str, Any]] = {}
+        self._terms: dict[str, set[str]] = {}
+        self._doc_terms: dict[str, set[str]] = {}
+        self._by_amount: list[tuple[int, str]] = []
+        self._by_date: list[tuple[str, str]] = []
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    @classmethod
+    def build(
+        cls, transactions: Iterable[dict[str, Any]], version: int | None
+    ) -> TransactionIndex:
+        index = cls(version)
+        for txn in transactions:
+            index._add(txn, sort=False)
+        index._by_amount.sort()
+        index._by_date.sort()
+        return index
+
+    def apply(self, changes: Iterable[dict[str, Any]], version: int | None) -> None:
+        for txn in changes:
+            if not isinstance(txn, dict) or "id" not in txn:
+                continue
+            self._remove(txn["id"])
+            if not txn.get("deleted"):
+                self._add(txn, sort=True)
+        self.version = version
+
+    def _add(self, txn: dict[str, Any], *, sort: bool) -> None:
+        if txn.get("deleted") or "id" not in txn:
+            return
+        txn_id = txn["id"]
+        doc = {k: txn[k] for k in _RESULT_FIELDS if txn.get(k) is not None}
+        self.docs[txn_id] = doc
+
+        text = " ".join(
+            str(item.get(f) or "")
+            for item in (txn, *(txn.get("subtransactions") or []))
+            for f in _TEXT_FIELDS
+        )
+        terms = _tokens(text)
+        self._doc_terms[txn_id] = terms
+        for term in terms:
+            self._terms.setdefault(term, set()).add(txn_id)
+
+        amount_key = (abs(int(doc.get("amount") or 0)), txn_id)
+        date_key = (str(doc.get("date") or ""), txn_id)
+        if sort:
+            insort(self._by_amount, amount_key)
+            insort(self._by_date, date_key)
+        else:
+            self._by_amount.append(amount_key)
+            self._by_date.append(date_key)
+
+    def _remove(self, txn_id: str) -> None:
+        doc = self.docs.pop(txn_id, None)
+        if doc is None:
+            return
+        for term in self._doc_terms.pop(txn_id, ()):
+            postings = self._terms.get(term)
+            if postings is not None:
+                postings.discard(txn_id)
+                if not postings:
+                    del self._terms[term]
+        for keys, key in (
+            (self._by_amount, (abs(int(doc.get("amount") or 0)), txn_id)),
+            (self._by_date, (str(doc.get("date") or ""), txn_id)),
+        ):
+            i = bisect_left(keys, key)
+            if i < len(keys) and keys[i] == key:
+                del keys[i]
+
+    def _text_ids(self, query: str) -> set[str]:
+        """Ids whose words contain every query word as a substring."""
+        result: set[str] | None = None
+        for word in _tokens(query):
+            ids: set[str] = set()
+            for term, postings in self._terms.items():
+                if word in term:
+                    ids |= postings
+            result = ids if result is None else result & ids
+            if not result:
+                return set()
+        return result or set()
+
+    @staticmethod
+    def _range_ids(keys: list[tuple[Any, str]], lo: Any, hi: Any) -> set[str]:
+        start = 0 if lo is None else bisect_left(keys, (lo, ""))
+        # U+FFFF sorts after any id, so ties on `hi` are included
+        end = len(keys) if hi is None else bisect_right(keys, (hi, "\uffff"))
+        return {txn_id for _, txn_id in keys[start:end]}
+
+    def search(
+        self,
+        *,
+        query: str | None = None,
+        min_amount: int | None = None,
+        max_amount: int | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        account_id: str | None = None,
+        limit: int = 25,
+    ) -> tuple[int, list[dict[str, Any]]]:
+        """Return (match count, newest `limit` matches). Amounts are absolute milliunits."""
+        candidates: list[set[str]] = []
+        if min_amount is not None or max_amount is not None:
+            candidates.append(self._range_ids(self._by_amount, min_amount, max_amount))
+        if since is not None or until is not None:
+            candidates.append(self._range_ids(self._by_date, since, until))
+        if query:
+            candidates.append(self._text_ids(query))
+
+        if candidates:
+            candidates.sort(key=len)
+            ids = set.intersection(*candidates)
+        else:
+            ids = set(self.docs)
+        docs = [self.docs[i] for i in ids]
+        if account_id is not None:
+            docs = [d for d in docs if d.get("account_id") == account_id]
+        docs.sort(key=lambda d: (d.get("date") or "", d["id"]), reverse=True)
+        return len(docs), docs[: max(0, limit)]
+
+
+class SearchIndexes:
+    """Transaction indexes per (credentials namespace, budget), kept current.
+
+    Registered as a `DeltaMirror` listener, each delta sync is applied to the
+    matching index in place. Reads are flagged for the server's mirror (see
+    `MirrorTransport(opt_in=True)`), which the server installs with search.
+    When the mirror holds a fresh snapshot that the index already reflects, a
+    search makes no upstream request at all.
+    """
+
+    def __init__(self, mirror: DeltaMirror | None = None) -> None:
+        self.mirror = mirror
+        self._indexes: dict[tuple[str, str], TransactionIndex] = {}
+        if mirror is not None:
+            mirror.add_listener(self._on_merge)
+
+    def forget(self, namespace: str) -> None:
+        """Drop every budget's index held for a namespace."""
+        for key in [k for k in self._indexes if k[0] == namespace]:
+            del self._indexes[key]
+
+    def _on_merge(
+        self,
+        previous: MirrorSnapshot | None,
+        snapshot: MirrorSnapshot,
+        changes: list[dict[str, Any]],
+    ) -> None:
+        if snapshot.resource != "transactions":
+            return
+        key = (snapshot.namespace, snapshot.budget_id)
+        index = self._indexes.get(key)
+        if index is None:
+            return
+        if previous is not None and index.version == previous.server_knowledge:
+            index.apply(changes, snapshot.server_knowledge)
+        else:
+            # Missed a step; rebuild from the snapshot on the next search
+            del self._indexes[key]
+
+    async def get(
+        self, client: httpx.AsyncClient, namespace: str, budget_id: str
+    ) -> TransactionIndex:
+        key = (namespace, budget_id)
+        index = self._indexes.get(key)
+        if self.mirror is not None and index is not None:
+            snapshot = self.mirror.get(namespace, budget_id, "transactions")
+            if (
+                snapshot is not None
+                and self.mirror.is_fresh(snapshot)
+                and snapshot.server_knowledge == index.version
+            ):
+                return index
+
+        response = await client.get(
+            f"budgets/{quote(budget_id, safe='')}/transactions",
+            extensions={USE_MIRROR_EXTENSION: True},
+        )
+        mirrored = response.extensions.get(MIRROR_EXTENSION)
+        version: int | None
+        if isinstance(mirrored, MirrorSnapshot):
+            items, version = mirrored.items, mirrored.server_knowledge
+        else:
+            data = (response.json() or {}).get("data") or {}
+            items, version = data.get("transactions") or [], data.get("server_knowledge")
+        # The listener may have already brought the index up to date
+        index = self._indexes.get(key)
+        if index is None or version is None or index.version != version:
+            index = self._indexes[key] = TransactionIndex.build(items, version)
+        return index
+
+
+def _milliunits(value: float | None) -> int | None:
+    return None if value is None else round(abs(value) * 1000)
+
+
+def register_search_tools(
+    mcp: FastMCP,
+    client: httpx.AsyncClient,
+    indexes: SearchIndexes,
+    namespace: Callable[[], str],
+    *,
+    include_tags: set[str] | None = None,
+    exclude_tags: set[str] | None = None,
+) -> None:
+    """Register the search tools; `namespace` returns the caller's credentials namespace.
+
+    Each tool carries the tag of the collection it searches and is skipped when
+    that tag is filtered out.
+    """
+
+    async def search_transactions(
+        budget_id: str,
+        query: str | None = None,
+        amount: float | None = None,
+        min_amount: float | None = None,
+        max_amount: float | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        account_id: str | None = None,
+        limit: int = 25,
+    ) -> dict[str, Any]:
+        """Search a budget's transactions locally by text, amount and date.
+
+        `query` matches words in payee, memo, category and account names
+        (substrings allowed; all words must match). Amounts are in currency units
+        and compared by absolute value, so `amount=42.17` finds a $42.17 charge or
+        refund. Dates are inclusive YYYY-MM-DD. Newest matches first.
+        """
+        if amount is not None:
+            min_amount = max_amount = amount
+        for value in (since, until):
+            if value is not None:
+                date.fromisoformat(value)
+        index = await indexes.get(client, namespace(), budget_id)
+        total, results = index.search(
+            query=query,
+            min_amount=_milliunits(min_amount),
+            max_amount=_milliunits(max_amount),
+            since=since,
+            until=until,
+            account_id=account_id,
+            limit=limit,
+        )
+        return {"total": total, "transactions": results}
+
+    async def search_payees(budget_id: str, query: str, limit: int = 25) -> dict[str, Any]:
+        """Find payees whose name contains `query` (case-insensitive)."""
+        response = await client.get(
+            f"budgets/{quote(budget_id, safe='')}/payees",
+            extensions={USE_MIRROR_EXTENSION: True},
+        )
+        mirrored = response.extensions.get(MIRROR_EXTENSION)
+        if isinstance(mirrored, MirrorSnapshot):
+            payees = mirrored.items
+        else:
+            payees = ((response.json() or {}).get("data") or {}).get("payees") or []
+        needle = query.casefold()
+        matches = [
+            {"id": p.get("id"), "name": p.get("name")}
+            for p in payees
+            if not p.get("deleted") and needle in str(p.get("name") or "").casefold()
+        ]
+        return {"total": len(matches), "payees": matches[: max(0, limit)]}
+
+    for name, fn, tag in (
+        ("search_transactions", search_transactions, "Transactions"),
+        ("search_payees", search_payees, "Payees"),
+    ):
+        if exclude_tags and tag in exclude_tags:
+            continue
+        if include_tags is not None and tag not in include_tags:
+            continue
+        mcp.tool(name=name, tags={tag})(fn)
@@ -5,16 +5,35 @@ import os
 os.environ["FASTMCP_EXPERIMENTAL_ENABLE_NEW_OPENAPI_PARSER"] = os.environ.get(
     "FASTMCP_EXPERIMENTAL_ENABLE_NEW_OPENAPI_PARSER", "true"
 )
+import importlib.util
+import logging
 import re
-import json
-from collections.abc import Iterable
-from typing import Any
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal
 
 import httpx
 from fastmcp import FastMCP
 from fastmcp.server.openapi import MCPType, RouteMap
 
+from . import jsonlib
+from .bulk_import import register_bulk_import_tool
+from .fanout import register_fan_out_tool
+from .lifecycle import ClientLifecycle
 from .openapi_loader import DEFAULT_SPEC_URL, fetch_openapi_spec
+from .profiling import laps
+from .projection import Projection, ProjectionMiddleware, compact_component
+from .spec_index import OperationIndex
+from .transports import PooledTransport, RetryTransport, SingleFlightTransport, auth_namespace
+
+# Opt-in features (cache, metrics, mirror, rate limit, tracing, multi-tenancy and
+# the tool sets below) are imported in `create_server` only when enabled
+if TYPE_CHECKING:
+    from .metrics import Metrics
+    from .mirror import DeltaMirror
+    from .ratelimit import RateLimiter
+    from .tenancy import TenantPools
+    from .tracing import Exporter, Tracer
 
 
 def _snake_case(name: str) -> str:
@@ -47,12 +66,92 @@ def _build_mcp_names_from_spec(spec: dict[str, Any]) -> dict[str, str]:
                 names[op_id] = snake
     return names
 
+def _strip_nulls_inplace(obj: Any) -> bool:
+    """Remove null-valued keys from mappings and None items from lists, in place.
+
+    This is a defensive normalization for YNAB endpoints that sometimes
+    return `null` for optional objects (e.g., `default_budget: null`),
+    while the OpenAPI schema describes those as object types without
+    explicit `nullable: true`. Removing nulls allows output validation
+    to pass while preserving all real data.
+
+    Walks the parsed payload once with an explicit stack (no recursion limit, no
+    copy of the tree) and returns True if anything was removed.
+    """
+    changed = False
+    stack = [obj]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            dead = [k for k, v in node.items() if v is None]
+            if dead:
+                changed = True
+                for k in dead:
+                    del node[k]
+            stack.extend(v for v in node.values() if isinstance(v, (dict, list)))
+        elif isinstance(node, list):
+            if any(v is None for v in node):
+                changed = True
+                node[:] = [v for v in node if v is not None]
+            stack.extend(v for v in node if isinstance(v, (dict, list)))
+    return changed
+
+
+class _ParsedResponse(httpx.Response):
+    """Response carrying its already-parsed, normalized JSON body.
+
+    FastMCP's OpenAPI tools call `response.json()` to build tool output. Serving the
+    object parsed by the response hook avoids decoding the body a second time, and
+    the body bytes are re-encoded lazily, only if something actually reads them.
+    """
+
+    _parsed: Any
+    _content_stale: bool
+
+    @property
+    def content(self) -> bytes:
+        if self._content_stale:
+            self._content = jsonlib.dumps(self._parsed)
+            self.headers["Content-Length"] = str(len(self._content))
+            self._content_stale = False
+        return self._content
+
+    def json(self, **kwargs: Any) -> Any:
+        if kwargs:
+            return super().json(**kwargs)
+        return self._parsed
+
+    def iter_bytes(self, chunk_size: int | None = None) -> Iterator[bytes]:
+        self.content  # materialize a stale body before httpx reads _content directly
+        return super().iter_bytes(chunk_size)
+
+    async def aiter_bytes(self, chunk_size: int | None = None) -> AsyncIterator[bytes]:
+        self.content
+        async for chunk in super().aiter_bytes(chunk_size):
+            yield chunk
+
+
+def _attach_parsed(response: httpx.Response, data: Any, *, changed: bool) -> None:
+    """Stash a parsed body on a fully-read response; `changed` marks the bytes stale."""
+    response.__class__ = _ParsedResponse
+    response._parsed = data  # type: ignore[attr-defined]
+    response._content_stale = changed  # type: ignore[attr-defined]
+    if changed:
+        response.headers.pop("Content-Length", None)
+
+
+logger = logging.getLogger(__name__)
+
 YNAB_BASE_URL = "https://api.ynab.com/v1"
 ENV_TOKEN = "YNAB_ACCESS_TOKEN"
 ENV_SPEC_URL = "YNAB_OPENAPI_SPEC_URL"
 ENV_BASE_URL = "YNAB_BASE_URL"
 
 
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
 def _get_env(name: str, default: str | None = None) -> str | None:
     value = os.environ.get(name, default)
     return value
@@ -105,20 +204,107 @@ async def create_server(
     route_maps: Iterable[RouteMap] | None = None,
     route_map_fn: Any | None = None,
     enable_health_routes: bool = True,
+    enable_mirror: bool = False,
+    mirror_max_age: float = 15.0,
+    spec_offline_first: bool | None = None,
+    rate_limit: int | None = None,
+    rate_limit_mode: Literal["wait", "shed"] = "wait",
+    rate_limit_max_wait: float = 60.0,
+    rate_limit_state: str | Path | None = None,
+    max_retries: int = 2,
+    coalesce_requests: bool = True,
+    enable_cache: bool = False,
+    cache_ttls: dict[str, float] | None = None,
+    cache_max_entries: int = 1024,
+    cache_backend: Literal["memory", "sqlite"] = "memory",
+    cache_path: str | Path | None = None,
+    lazy_tools: bool = False,
+    enable_projection: bool = False,
+    compact_schemas: bool = False,
+    enable_paging: bool = False,
+    enable_analytics: bool = False,
+    enable_search: bool = False,
+    max_connections: int = 20,
+    max_keepalive_connections: int = 10,
+    keepalive_expiry: float = 30.0,
+    http2: bool = False,
+    connect_timeout: float | None = None,
+    read_timeout: float | None = None,
+    warm_up: bool = False,
+    idle_close_after: float = 0.0,
+    enable_metrics: bool = False,
+    trace_file: str | Path | None = None,
+    trace_otlp_endpoint: str | None = None,
+    trace_min_duration: float = 0.0,
+    multi_tenant: bool = False,
+    max_tenants: int = 256,
 ) -> FastMCP:
     """Create a FastMCP server from the YNAB OpenAPI spec.
 
     - Loads the OpenAPI spec from YNAB (YAML) and parses it.
     - Configures an httpx AsyncClient with Bearer token auth.
     - Generates MCP tools/resources from OpenAPI with optional tag filtering.
+    - Optionally mirrors budget collections locally (`enable_mirror`), answering
+      list reads from the mirror and keeping it current via delta requests.
+    - Optionally throttles upstream calls with a client-side sliding window
+      (`rate_limit` requests per hour, shared across processes via
+      `rate_limit_state`) and exposes the remaining quota as a tool.
+    - Retries 429/5xx responses up to `max_retries` times, honoring Retry-After
+      (non-idempotent requests only with an idempotency guard).
+    - Coalesces identical concurrent GETs into one upstream call
+      (`coalesce_requests`).
+    - Optionally caches GET responses in memory (`enable_cache`) with per-tag TTLs
+      (`cache_ttls` overrides `cache.DEFAULT_TAG_TTLS`), LRU eviction and
+      invalidation of a budget's entries on writes. `cache_backend="sqlite"`
+      persists entries to `cache_path` so several server processes share them.
+    - With `lazy_tools`, skips generating a tool per operation at startup and
+      exposes `list_operations` / `describe_operation` / `call_operation` instead;
+      each operation's tool is built the first time it is described or called.
+    - With `enable_projection`, GET tools accept a `fields` list and return only
+      those (dotted) paths of the response. `compact_schemas` strips descriptions,
+      titles and examples from generated output schemas.
+    - Adds a `bulk_import_transactions` tool (CSV/OFX/JSON, batched POSTs with
+      deduplicating import ids).
+    - Adds a `fan_out_operation` tool that runs a budget-scoped GET across all
+      budgets concurrently.
+    - With `enable_paging`, adds `get_<collection>_page` tools that page over
+      transactions, payees and scheduled transactions with cursors.
+    - With `enable_analytics`, adds local aggregation tools (group-by totals,
+      rolling monthly sums, percentiles) over a columnar copy of transactions.
+      That copy is read through a delta mirror (`mirror_max_age`) even without
+      `enable_mirror`, so repeated queries skip the full download.
+    - With `enable_search`, adds `search_transactions` / `search_payees` backed by
+      a local index that the mirror keeps current with each delta sync (the
+      mirror is installed for search even without `enable_mirror`).
+    - Keeps one connection pool (`max_connections`, `max_keepalive_connections`
+      idle connections kept for `keepalive_expiry` seconds, optionally `http2`)
+      for API calls. The spec download's connection is closed before returning,
+      since the server is normally served from another event loop.
+      `connect_timeout` / `read_timeout` override `timeout` for those phases.
+    - Closes the pool when the last MCP session ends (after `idle_close_after`
+      seconds if set); with `warm_up`, pre-opens a connection to the API when the
+      first session starts.
+    - With `enable_metrics`, records tool, upstream and response-hook latency,
+      payload sizes, cache hit ratio and rate-limit quota; served as Prometheus
+      text on `/metrics` and as a `metrics` tool.
+    - With `trace_file` (JSON lines) and/or `trace_otlp_endpoint` (OTLP/HTTP),
+      traces each tool call with child spans for its upstream requests and
+      response normalization; traces faster than `trace_min_duration` seconds
+      are dropped.
+    - With `multi_tenant`, no server token is used: each MCP HTTP request must
+      carry its caller's YNAB token as `Authorization: Bearer <token>`. Tools are
+      generated once and shared; every tenant gets its own connection pool (at
+      most `max_tenants`, least recently used closed first), rate-limit window,
+      cache, mirror and search entries.
 
     Environment variables (optional):
     - YNAB_ACCESS_TOKEN: Bearer token for API access
     - YNAB_OPENAPI_SPEC_URL: Override the OpenAPI spec URL
     - YNAB_BASE_URL: Override API base URL (default https://api.ynab.com/v1)
+    - YNAB_MCP_SPEC_OFFLINE_FIRST: Start from the cached spec, refresh in background
     """
     token = token or _get_env(ENV_TOKEN)
-    if not token:
+    if not token and not multi_tenant:
         raise RuntimeError(
             "YNAB access token is required. Set YNAB_ACCESS_TOKEN or pass token explicitly."
         )
@@ -126,39 +312,54 @@ async def create_server(
     spec_url = spec_url or _get_env(ENV_SPEC_URL, DEFAULT_SPEC_URL) or DEFAULT_SPEC_URL
     base_url = base_url or _get_env(ENV_BASE_URL, YNAB_BASE_URL) or YNAB_BASE_URL
 
-    spec: dict[str, Any] = await fetch_openapi_spec(spec_url, timeout=timeout)
+    if http2 and not _http2_available():
+        logger.warning("HTTP/2 requested but the 'h2' package is not installed; using HTTP/1.1")
+        http2 = False
+    http_timeout = httpx.Timeout(
+        timeout,
+        connect=timeout if connect_timeout is None else connect_timeout,
+        read=timeout if read_timeout is None else read_timeout,
+    )
+    pool_kwargs: dict[str, Any] = {
+        "limits": httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        ),
+        "http1": True,
+        "http2": http2,
+    }
+    pool: PooledTransport | TenantPools
+    # Set in multi-tenant mode; per-tenant state registers to be dropped on eviction
+    tenants: TenantPools | None = None
+    auth: httpx.Auth | None = None
+    if multi_tenant:
+        from .tenancy import TenantAuth, TenantPools, current_namespace
+
+        pool = tenants = TenantPools(max_tenants=max_tenants, **pool_kwargs)
+        # The caller's token is attached per request
+        auth = TenantAuth()
+    else:
+        pool = PooledTransport(**pool_kwargs)
+
+    # The spec host may be overridden, so the spec client shares the pool but not
+    # the credentials
+    spec: dict[str, Any] = await fetch_openapi_spec(
+        spec_url,
+        timeout=timeout,
+        offline_first=spec_offline_first,
+        client=httpx.AsyncClient(timeout=http_timeout, transport=pool),
+    )
 
     headers = {
-        "Authorization": f"Bearer {token}",
         "User-Agent": "ynab-mcp-server/0.1 (+https://github.com/troylar/ynab-mcp-server)",
         "Accept": "application/json",
     }
+    if not multi_tenant:
+        headers["Authorization"] = f"Bearer {token}"
 
-    def _deep_clean_nulls(obj: Any) -> Any:
-        """Recursively remove keys with value None from mappings and
-        filter None items from lists. Leaves other values intact.
-
-        This is a defensive normalization for YNAB endpoints that sometimes
-        return `null` for optional objects (e.g., `default_budget: null`),
-        while the OpenAPI schema describes those as object types without
-        explicit `nullable: true`. Removing nulls allows output validation
-        to pass while preserving all real data.
-        """
-        if isinstance(obj, dict):
-            cleaned: dict[str, Any] = {}
-            for k, v in obj.items():
-                if v is None:
-                    # Drop null keys entirely
-                    continue
-                cleaned[k] = _deep_clean_nulls(v)
-            return cleaned
-        if isinstance(obj, list):
-            return [
-                _deep_clean_nulls(v)
-                for v in obj
-                if v is not None
-            ]
-        return obj
+    def _caller_namespace() -> str:
+        return current_namespace() if multi_tenant else auth_namespace(headers["Authorization"])
 
     async def _response_hook(response: httpx.Response) -> None:
         """Normalize successful empty/None JSON payloads and surface YNAB errors clearly.
@@ -169,6 +370,9 @@ async def create_server(
         - If 2xx and body is empty, JSON null, or 204 → coerce to '{}' so schemas expecting
           an object won't fail client-side validation.
         - If 2xx and JSON has top-level data: null → coerce to {"data": {}}.
+        - If 2xx and JSON contains nulls → drop them in place.
+        - 2xx JSON bodies are parsed exactly once here; the parsed object is served by
+          `response.json()` to the generated tool (see `_ParsedResponse`).
         - If non-2xx and JSON body has an 'error' field → raise with that context.
         """
         try:
@@ -184,24 +388,22 @@ async def create_server(
                     response.headers["Content-Length"] = str(len(response._content))
                 else:
                     try:
-                        data = response.json()
+                        data = jsonlib.loads(content)
                         if data is None:
                             # Entire payload null → {}
                             response._content = b"{}"  # type: ignore[attr-defined]
                             response.headers["Content-Length"] = str(len(response._content))
-                        elif isinstance(data, dict) and data.get("data", ... ) is None:
-                            # Coerce {"data": null} → {"data": {}}
-                            data = {**data, "data": {}}
-                            new = json.dumps(data).encode("utf-8")
-                            response._content = new  # type: ignore[attr-defined]
-                            response.headers["Content-Length"] = str(len(new))
                         elif isinstance(data, (dict, list)):
-                            # Drop null-valued fields recursively to satisfy schemas
-                            cleaned = _deep_clean_nulls(data)
-                            if cleaned is not data:
-                                new = json.dumps(cleaned).encode("utf-8")
-                                response._content = new  # type: ignore[attr-defined]
-                                response.headers["Content-Length"] = str(len(new))
+                            coerced = False
+                            if isinstance(data, dict) and data.get("data", ...) is None:
+                                # Coerce {"data": null} → {"data": {}}
+                                data["data"] = {}
+                                coerced = True
+                            # Drop null-valued fields in place to satisfy schemas; a body
+                            # without a `null` token is not walked at all
+                            changed = b"null" in content and _strip_nulls_inplace(data)
+                            # Hand the parsed object to the tool instead of re-encoding it
+                            _attach_parsed(response, data, changed=changed or coerced)
                     except Exception:
                         # Non-JSON success bodies pass through as-is
                         pass
@@ -215,7 +417,7 @@ async def create_server(
                     "request_id": response.headers.get("x-request-id"),
                 }
                 try:
-                    j = response.json()
+                    j = jsonlib.loads(response.content)
                     if isinstance(j, dict):
                         # YNAB typically returns { error: { id, name, detail } } or similar
                         e = j.get("error")
@@ -232,7 +434,7 @@ async def create_server(
                 # Attach a uniform error JSON body for clients/inspectors
                 try:
                     payload = {"error": {k: v for k, v in err.items() if v is not None}}
-                    response._content = json.dumps(payload).encode("utf-8")  # type: ignore[attr-defined]
+                    response._content = jsonlib.dumps(payload)  # type: ignore[attr-defined]
                     response.headers["Content-Length"] = str(len(response._content))
                     response.headers["Content-Type"] = "application/json"
                 except Exception:
@@ -263,11 +465,112 @@ async def create_server(
             # Never crash in hook; surface as HTTPError with context
             raise httpx.HTTPError(f"Response handling failed: {ex}")
 
+    startup = laps()
+    startup.next("transport setup")
+
+    # Normalize tool names to snake_case via mcp_names mapping
+    mcp_names = _build_mcp_names_from_spec(spec)
+    index = OperationIndex.from_spec(spec, names=mcp_names, base_path=httpx.URL(base_url).path)
+
+    tracer: Tracer | None = None
+    if trace_file or trace_otlp_endpoint:
+        from .tracing import JsonlExporter, OtlpHttpExporter, Tracer
+
+        exporters: list[Exporter] = []
+        if trace_file:
+            exporters.append(JsonlExporter(trace_file))
+        if trace_otlp_endpoint:
+            exporters.append(OtlpHttpExporter(trace_otlp_endpoint))
+        tracer = Tracer(exporters, min_duration=trace_min_duration)
+
+    # Transport stack, innermost first: pool → metrics → tracing → rate limit
+    # → retry → single-flight → response cache → mirror
+    transport: httpx.AsyncBaseTransport = pool
+    metrics: Metrics | None = None
+    if enable_metrics:
+        from .metrics import Metrics, MetricsTransport
+
+        metrics = Metrics()
+        transport = MetricsTransport(transport, metrics, index=index)
+    if tracer is not None:
+        from .tracing import TracingTransport
+
+        transport = TracingTransport(transport, tracer, index=index)
+    limiter: RateLimiter | None = None
+    if rate_limit:
+        from .ratelimit import RateLimiter, RateLimitTransport
+
+        limiter = RateLimiter(
+            limit=rate_limit,
+            mode=rate_limit_mode,
+            max_wait=rate_limit_max_wait,
+            state_path=Path(rate_limit_state) if rate_limit_state else None,
+        )
+        transport = RateLimitTransport(transport, limiter)
+    if max_retries > 0:
+        transport = RetryTransport(transport, max_retries=max_retries)
+    if coalesce_requests:
+        transport = SingleFlightTransport(transport)
+    if enable_cache:
+        from .cache import DEFAULT_TAG_TTLS, CacheTransport, ResponseCache, SqliteCacheStore
+
+        tag_ttls = {**DEFAULT_TAG_TTLS, **(cache_ttls or {})}
+        response_cache = ResponseCache(
+            max_entries=cache_max_entries,
+            store=SqliteCacheStore(
+                Path(cache_path) if cache_path else None, max_entries=cache_max_entries
+            )
+            if cache_backend == "sqlite"
+            else None,
+        )
+        transport = CacheTransport(transport, response_cache, index=index, tag_ttls=tag_ttls)
+        if metrics is not None:
+
+            def _hit_ratio() -> list[tuple[dict[str, str], float]]:
+                lookups = response_cache.hits + response_cache.misses
+                return [({}, response_cache.hits / lookups)] if lookups else []
+
+            metrics.add_gauge(
+                "ynab_mcp_cache_hit_ratio",
+                "Share of cacheable GETs served from the response cache.",
+                _hit_ratio,
+            )
+            metrics.add_gauge(
+                "ynab_mcp_cache_entries",
+                "Responses held in the response cache.",
+                lambda: [({}, float(len(response_cache)))],
+            )
+    mirror: DeltaMirror | None = None
+    # Analytics and search read through the mirror even when tool reads do not
+    if enable_mirror or enable_analytics or enable_search:
+        from .mirror import DeltaMirror, MirrorTransport
+
+        mirror = DeltaMirror(max_age=mirror_max_age)
+        transport = MirrorTransport(transport, mirror, opt_in=not enable_mirror)
+        if tenants is not None:
+            tenants.add_eviction_listener(mirror.forget)
+
+    response_hook: Callable[[httpx.Response], Awaitable[None]] = _response_hook
+    if metrics is not None:
+        response_hook = metrics.time_hook(response_hook)
+    if tracer is not None:
+        response_hook = tracer.wrap_hook(response_hook)
+
     api_client = httpx.AsyncClient(
         base_url=base_url,
         headers=headers,
-        timeout=timeout,
-        event_hooks={"response": [_response_hook]},
+        timeout=http_timeout,
+        event_hooks={"response": [response_hook]},
+        transport=transport,
+        auth=auth,
+    )
+
+    lifecycle = ClientLifecycle(
+        pool,
+        # There is no single tenant's pool to warm up
+        warm_up_url=base_url if warm_up and not multi_tenant else None,
+        timeout=http_timeout,
+        idle_close_after=idle_close_after,
     )
 
     maps = _build_route_maps(include_tags, exclude_tags, route_maps)
@@ -275,19 +578,145 @@ async def create_server(
     # Force-enable the new OpenAPI parser so users don't need to set an env var
     os.environ.setdefault("FASTMCP_EXPERIMENTAL_ENABLE_NEW_OPENAPI_PARSER", "true")
 
-    # Create the MCP server directly from the OpenAPI specification
-    # Normalize tool names to snake_case via mcp_names mapping
-    mcp_names = _build_mcp_names_from_spec(spec)
+    projection = Projection() if enable_projection else None
+
+    def _component_fn(route: Any, component: Any) -> None:
+        if projection is not None:
+            projection.component_fn(route, component)
+        if compact_schemas:
+            compact_component(route, component)
+
+    component_fn = _component_fn if projection is not None or compact_schemas else None
+
+    startup.next("tool generation")
+    if lazy_tools:
+        from .lazy import LazyTools, register_lazy_tools
+
+        # Only the operation index exists up front; tools are built on first use
+        mcp = FastMCP(name="YNAB MCP Server", lifespan=lifecycle.lifespan)
+        register_lazy_tools(
+            mcp,
+            LazyTools(
+                spec,
+                index,
+                client=api_client,
+                timeout=timeout,
+                route_maps=maps,
+                route_map_fn=route_map_fn,
+                mcp_component_fn=component_fn,
+                projection=projection,
+                include_tags=include_tags,
+                exclude_tags=exclude_tags,
+            ),
+        )
+    else:
+        # Create the MCP server directly from the OpenAPI specification
+        mcp = FastMCP.from_openapi(
+            openapi_spec=spec,
+            client=api_client,
+            name="YNAB MCP Server",
+            timeout=timeout,
+            route_maps=maps,
+            route_map_fn=route_map_fn,
+            mcp_component_fn=component_fn,
+            mcp_names=mcp_names,
+            lifespan=lifecycle.lifespan,
+        )
 
-    mcp = FastMCP.from_openapi(
-        openapi_spec=spec,
-        client=api_client,
-        name="YNAB MCP Server",
-        timeout=timeout,
-        route_maps=maps,
-        route_map_fn=route_map_fn,
-        mcp_names=mcp_names,
+    startup.next("route registration")
+    # Middleware added first is outermost and sees the whole call
+    if tenants is not None:
+        from .tenancy import TenantMiddleware
+
+        mcp.add_middleware(TenantMiddleware(tenants))
+    if tracer is not None:
+        from .tracing import TracingMiddleware
+
+        mcp.add_middleware(TracingMiddleware(tracer))
+    if metrics is not None:
+        from .metrics import MetricsMiddleware
+
+        mcp.add_middleware(MetricsMiddleware(metrics))
+    if projection is not None:
+        mcp.add_middleware(ProjectionMiddleware(projection))
+
+    # Opt-in tool sets are imported only when enabled
+    if enable_paging:
+        from .pagination import PageStore, register_paging_tools
+
+        register_paging_tools(
+            mcp,
+            api_client,
+            PageStore(),
+            include_tags=include_tags,
+            exclude_tags=exclude_tags,
+            namespace=_caller_namespace if multi_tenant else None,
+        )
+
+    if enable_analytics:
+        from .analytics import ColumnStore, register_analytics_tools
+
+        column_store = ColumnStore()
+        if tenants is not None:
+            tenants.add_eviction_listener(column_store.forget)
+        register_analytics_tools(mcp, api_client, column_store, _caller_namespace)
+
+    if enable_search:
+        from .search import SearchIndexes, register_search_tools
+
+        search_indexes = SearchIndexes(mirror)
+        if tenants is not None:
+            tenants.add_eviction_listener(search_indexes.forget)
+        register_search_tools(
+            mcp,
+            api_client,
+            search_indexes,
+            _caller_namespace,
+            include_tags=include_tags,
+            exclude_tags=exclude_tags,
+        )
+
+    register_bulk_import_tool(
+        mcp, api_client, include_tags=include_tags, exclude_tags=exclude_tags
     )
+    register_fan_out_tool(
+        mcp, api_client, index, include_tags=include_tags, exclude_tags=exclude_tags
+    )
+
+    if limiter is not None:
+
+        @mcp.tool(name="rate_limit_status", tags={"system"})
+        async def rate_limit_status() -> dict[str, Any]:
+            """Remaining YNAB API quota as tracked by the client-side rate limiter."""
+            status: dict[str, Any] = await limiter._offload(limiter.status, _caller_namespace())
+            return status
+
+        if metrics is not None and not multi_tenant:
+            quota_key = _caller_namespace()
+            metrics.add_gauge(
+                "ynab_mcp_rate_limit_remaining",
+                "Requests left in the client-side rate limiter's window.",
+                lambda: [({}, float(limiter.status(quota_key, cached=True)["remaining"]))],
+            )
+
+    if metrics is not None:
+
+        @mcp.tool(name="metrics", tags={"system"})
+        def metrics_tool() -> dict[str, Any]:
+            """Latency (ms), payload size and quota metrics collected since startup."""
+            return metrics.snapshot()
+
+        from .metrics import CONTENT_TYPE
+
+        try:
+            from starlette.requests import Request
+            from starlette.responses import Response
+
+            @mcp.custom_route("/metrics", methods=["GET"])
+            async def metrics_route(_request: Request) -> Response:
+                return Response(metrics.render(), media_type=CONTENT_TYPE)
+        except Exception:
+            pass
 
     if enable_health_routes:
         # Health tool
@@ -317,4 +746,9 @@ async def create_server(
             # If Starlette is not available, just skip HTTP routes
             pass
 
+    # Callers usually serve from another event loop (`asyncio.run` here, then
+    # `mcp.run`), where the spec download's connection cannot be reused or closed;
+    # close it now and let the first API call open the pool in the serving loop
+    await pool.aclose()
+    startup.stop()
     return mcp
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Any
+
+HTTP_METHODS = ("get", "put", "post", "delete", "options", "head", "patch", "trace")
+
+
+@dataclass(frozen=True)
+class Operation:
+    """Lightweight description of one OpenAPI operation."""
+
+    name: str
+    operation_id: str
+    method: str
+    path: str
+    tags: tuple[str, ...] = ()
+    summary: str = ""
+    parameters: tuple[dict[str, Any], ...] = ()
+    pattern: re.Pattern[str] = field(default=re.compile(""), compare=False, repr=False)
+
+    @property
+    def path_params(self) -> list[str]:
+        return re.findall(r"{([^}/]+)}", self.path)
+
+
+def _path_pattern(template: str) -> re.Pattern[str]:
+    parts = re.split(r"({[^}/]+})", template)
+    regex = "".join(
+        f"(?P<{_group_name(p[1:-1])}>[^/]+)" if p.startswith("{") else re.escape(p)
+        for p in parts
+    )
+    return re.compile(f"^{regex}$")
+
+
+def _group_name(param: str) -> str:
+    return re.sub(r"\W", "_", param)
+
+
+class OperationIndex:
+    """Index of spec operations by tool name and by concrete request path.
+
+    Built once from the spec without generating any tools, so it is cheap enough to
+    use from transports (per-tag cache TTLs, metrics labels) and lazy tool loading.
+    """
+
+    def __init__(self, operations: list[Operation], *, base_path: str = "") -> None:
+        self.operations = operations
+        self.base_path = base_path.rstrip("/")
+        self._by_name = {op.name: op for op in operations}
+        # Prefer templates with more literal segments (e.g. /months/current over /months/{month})
+        self._by_specificity = sorted(
+            operations, key=lambda op: -sum(1 for s in op.path.split("/") if s and "{" not in s)
+        )
+
+    @classmethod
+    def from_spec(
+        cls,
+        spec: dict[str, Any],
+        *,
+        names: dict[str, str] | None = None,
+        base_path: str = "",
+    ) -> OperationIndex:
+        names = names or {}
+        operations: list[Operation] = []
+        for path, item in (spec.get("paths") or {}).items():
+            if not isinstance(item, dict):
+                continue
+            shared = [p for p in item.get("parameters") or [] if isinstance(p, dict)]
+            for method, op in item.items():
+                if method not in HTTP_METHODS or not isinstance(op, dict):
+                    continue
+                op_id = op.get("operationId") or f"{method}_{path}"
+                own = [p for p in op.get("parameters") or [] if isinstance(p, dict)]
+                operations.append(
+                    Operation(
+                        name=names.get(op_id, op_id),
+                        operation_id=op_id,
+                        method=method.upper(),
+                        path=path,
+                        tags=tuple(op.get("tags") or ()),
+                        summary=(op.get("summary") or op.get("description") or "").strip(),
+                        parameters=tuple(shared + own),
+                        pattern=_path_pattern(path),
+                    )
+                )
+        return cls(operations, base_path=base_path)
+
+    def get(self, name: str) -> Operation | None:
+        return self._by_name.get(name)
+
+    def match(self, method: str, path: str) -> tuple[Operation, dict[str, str]] | None:
+        """Find the operation serving `method path`, with its extracted path params."""
+        if self.base_path and path.startswith(self.base_path):
+            path = path[len(self.base_path) :]
+        method = method.upper()
+        for op in self._by_specificity:
+            if op.method != method:
+                continue
+            m = op.pattern.match(path)
+            if m:
+                return op, {name: m.group(_group_name(name)) for name in op.path_params}
+        return None
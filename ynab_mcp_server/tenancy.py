@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import Callable, Generator
+from typing import Any
+
+import httpx
+import mcp.types
+from fastmcp.server.dependencies import get_http_headers
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+from fastmcp.tools.tool import ToolResult
+
+from .transports import PooledTransport, auth_namespace, request_namespace
+
+# Namespace of requests without credentials (e.g. the OpenAPI spec download)
+ANONYMOUS_NAMESPACE = auth_namespace("")
+
+
+class MissingTenantToken(httpx.TransportError):
+    """Raised instead of sending a request when the MCP request carried no token."""
+
+
+def request_token() -> str | None:
+    """The bearer token of the MCP HTTP request being served, if any."""
+    header = get_http_headers(include_all=True).get("authorization", "")
+    scheme, _, token = header.partition(" ")
+    token = token.strip()
+    return token if scheme.lower() == "bearer" and token else None
+
+
+def current_namespace() -> str:
+    """Credentials namespace (see `auth_namespace`) of the MCP request being served."""
+    token = request_token()
+    return auth_namespace(f"Bearer {token}" if token else "")
+
+
+class TenantAuth(httpx.Auth):
+    """Authenticate each upstream request with the caller's own YNAB token.
+
+    The token is read from the `Authorization: Bearer ...` header of the MCP
+    HTTP request being served, so one client serves every tenant. Requests made
+    outside an HTTP request, or without a token, fail before reaching the API;
+    there is no server-wide fallback token.
+    """
+
+    def auth_flow(self, request: httpx.Request) -> Generator[httpx.Request, httpx.Response, None]:
+        token = request_token()
+        if token is None:
+            raise MissingTenantToken(
+                "Multi-tenant mode: send your YNAB access token as "
+                "'Authorization: Bearer <token>' on the MCP HTTP request",
+                request=request,
+            )
+        request.headers["Authorization"] = f"Bearer {token}"
+        yield request
+
+
+class TenantPools(httpx.AsyncBaseTransport):
+    """A connection pool per tenant, tracking at most `max_tenants` tenants.
+
+    Pools are keyed by the request's credentials namespace, so one busy tenant
+    cannot take every connection from the others. A tenant counts as seen on
+    each upstream request and on each tool call (`touch`, via
+    `TenantMiddleware`), so one answered from local state stays warm. When a new
+    tenant would exceed `max_tenants`, the least recently seen one is evicted.
+    Its pool is closed once its in-flight responses finish, and eviction
+    listeners drop the rest of its local state (mirror, search, analytics). That
+    tenant simply reconnects and re-syncs on its next call. Requests without
+    credentials share one pool that is not tracked as a tenant.
+    `transport_kwargs` configure each pool.
+    """
+
+    def __init__(self, *, max_tenants: int = 256, **transport_kwargs: Any) -> None:
+        self.max_tenants = max_tenants
+        self._kwargs = transport_kwargs
+        self._pools: OrderedDict[str, PooledTransport] = OrderedDict()
+        self._anonymous: PooledTransport | None = None
+        self._listeners: list[Callable[[str], None]] = []
+        self._closing: set[asyncio.Task[None]] = set()
+
+    def __len__(self) -> int:
+        return len(self._pools)
+
+    @property
+    def is_open(self) -> bool:
+        pools = [*self._pools.values(), self._anonymous]
+        return any(pool is not None and pool.is_open for pool in pools)
+
+    def add_eviction_listener(self, listener: Callable[[str], None]) -> None:
+        """Call `listener(namespace)` when a tenant is evicted."""
+        self._listeners.append(listener)
+
+    def touch(self, namespace: str) -> None:
+        """Mark `namespace` as the most recently seen tenant."""
+        if namespace != ANONYMOUS_NAMESPACE:
+            self._pool(namespace)
+
+    def _pool(self, key: str) -> PooledTransport:
+        if key == ANONYMOUS_NAMESPACE:
+            if self._anonymous is None:
+                self._anonymous = PooledTransport(**self._kwargs)
+            return self._anonymous
+        pool = self._pools.get(key)
+        if pool is not None:
+            self._pools.move_to_end(key)
+            return pool
+        pool = self._pools[key] = PooledTransport(**self._kwargs)
+        while len(self._pools) > self.max_tenants:
+            namespace, evicted = self._pools.popitem(last=False)
+            # Closed in the background so this request is not delayed
+            task = asyncio.get_running_loop().create_task(evicted.aclose_when_idle())
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+            for listener in self._listeners:
+                listener(namespace)
+        return pool
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._pool(request_namespace(request)).handle_async_request(request)
+
+    async def aclose(self) -> None:
+        """Close every tenant's connections; the tenants themselves stay tracked."""
+        for pool in [*self._pools.values(), self._anonymous]:
+            if pool is not None:
+                await pool.aclose()
+
+
+class TenantMiddleware(Middleware):
+    """Count every tool call as activity of the calling tenant in `TenantPools`."""
+
+    def __init__(self, pools: TenantPools) -> None:
+        self.pools = pools
+
+    async def on_call_tool(
+        self,
+        context: MiddlewareContext[mcp.types.CallToolRequestParams],
+        call_next: CallNext[mcp.types.CallToolRequestParams, ToolResult],
+    ) -> ToolResult:
+        self.pools.touch(current_namespace())
+        return await call_next(context)
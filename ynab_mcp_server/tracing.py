@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Protocol
+
+import httpx
+import mcp.types
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+from fastmcp.tools.tool import ToolResult
+
+from . import jsonlib
+from .spec_index import OperationIndex
+from .transports import PooledTransport, WrappedTransport
+
+SERVICE_NAME = "ynab-mcp-server"
+
+# OTLP span kinds and status codes
+KIND_INTERNAL = 1
+KIND_SERVER = 2
+KIND_CLIENT = 3
+STATUS_UNSET = 0
+STATUS_ERROR = 2
+
+
+@dataclass
+class Span:
+    """A finished or running span, using OpenTelemetry's data model."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_span_id: str | None
+    kind: int
+    start_ns: int
+    end_ns: int = 0
+    attributes: dict[str, Any] = field(default_factory=dict)
+    status: int = STATUS_UNSET
+    status_message: str | None = None
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def to_dict(self) -> dict[str, Any]:
+        """Flat JSON form written by `JsonlExporter`."""
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "status": {"code": self.status, "message": self.status_message},
+        }
+
+    def to_otlp(self) -> dict[str, Any]:
+        span: dict[str, Any] = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [
+                {"key": k, "value": _otlp_value(v)} for k, v in self.attributes.items()
+            ],
+            "status": {"code": self.status},
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        if self.status_message:
+            span["status"]["message"] = self.status_message
+        return span
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class Exporter(Protocol):
+    def export(self, spans: list[Span]) -> None: ...
+
+
+class JsonlExporter:
+    """Append each span as one JSON line to a local file."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def export(self, spans: list[Span]) -> None:
+        data = b"".join(jsonlib.dumps(span.to_dict()) + b"\n" for span in spans)
+        with self._lock, self.path.open("ab") as f:
+            f.write(data)
+
+
+class OtlpHttpExporter:
+    """POST spans as OTLP/HTTP JSON to `<endpoint>/v1/traces` without blocking.
+
+    Uses its own client and connection pool, never the API client. Export
+    failures are dropped: tracing must not affect tool calls.
+    """
+
+    def __init__(self, endpoint: str, *, timeout: float = 5.0) -> None:
+        endpoint = endpoint.rstrip("/")
+        self.url = endpoint if endpoint.endswith("/v1/traces") else f"{endpoint}/v1/traces"
+        self._client = httpx.AsyncClient(timeout=timeout, transport=PooledTransport())
+        self._pending: set[asyncio.Task[None]] = set()
+
+    def payload(self, spans: list[Span]) -> dict[str, Any]:
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            {"key": "service.name", "value": {"stringValue": SERVICE_NAME}}
+                        ]
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "ynab_mcp_server"},
+                            "spans": [span.to_otlp() for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+
+    async def _post(self, body: bytes) -> None:
+        try:
+            await self._client.post(
+                self.url, content=body, headers={"Content-Type": "application/json"}
+            )
+        except httpx.HTTPError:
+            pass
+
+    def export(self, spans: list[Span]) -> None:
+        body = jsonlib.dumps(self.payload(spans))
+        task = asyncio.get_running_loop().create_task(self._post(body))
+        # Keep a reference until done so the task is not garbage collected
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+
+_current: ContextVar[Span | None] = ContextVar("ynab_mcp_current_span", default=None)
+
+
+class Tracer:
+    """Creates spans linked through a context variable and exports whole traces.
+
+    Spans of a trace are buffered until its root span ends, then exported
+    together. Traces whose root took less than `min_duration` seconds are
+    dropped, which keeps only the slow calls when hunting tail latency.
+    """
+
+    def __init__(self, exporters: list[Exporter], *, min_duration: float = 0.0) -> None:
+        self.exporters = exporters
+        self.min_duration = min_duration
+        self._traces: dict[str, list[Span]] = {}
+
+    @contextmanager
+    def span(
+        self, name: str, *, kind: int = KIND_INTERNAL, attributes: dict[str, Any] | None = None
+    ) -> Iterator[Span]:
+        parent = _current.get()
+        span = Span(
+            name=name,
+            trace_id=parent.trace_id if parent else os.urandom(16).hex(),
+            span_id=os.urandom(8).hex(),
+            parent_span_id=parent.span_id if parent else None,
+            kind=kind,
+            start_ns=time.time_ns(),
+            attributes=dict(attributes or {}),
+        )
+        if parent is None:
+            self._traces[span.trace_id] = []
+        token = _current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = STATUS_ERROR
+            span.status_message = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current.reset(token)
+            span.end_ns = time.time_ns()
+            self._finish(span)
+
+    def _finish(self, span: Span) -> None:
+        if span.parent_span_id is not None:
+            pending = self._traces.get(span.trace_id)
+            if pending is not None:
+                pending.append(span)
+                return
+            # Outlived its root (e.g. a detached task); export it on its own
+            spans = [span]
+        else:
+            spans = [*self._traces.pop(span.trace_id, []), span]
+            if span.duration_ms / 1000 < self.min_duration:
+                return
+        self._export(spans)
+
+    def _export(self, spans: list[Span]) -> None:
+        for exporter in self.exporters:
+            try:
+                exporter.export(spans)
+            except Exception:
+                pass
+
+    def wrap_hook(
+        self, hook: Callable[[httpx.Response], Awaitable[None]]
+    ) -> Callable[[httpx.Response], Awaitable[None]]:
+        """Wrap an httpx response hook in a `normalize response` span."""
+
+        async def traced(response: httpx.Response) -> None:
+            with self.span("normalize response"):
+                await hook(response)
+
+        return traced
+
+
+class TracingTransport(WrappedTransport):
+    """Open a client span for each request sent to the YNAB API.
+
+    Sits directly above the connection pool: each retry attempt gets its own
+    span, and calls answered by the cache or mirror have none.
+    """
+
+    def __init__(
+        self,
+        inner: httpx.AsyncBaseTransport,
+        tracer: Tracer,
+        *,
+        index: OperationIndex | None = None,
+    ) -> None:
+        super().__init__(inner)
+        self.tracer = tracer
+        self.index = index
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        matched = self.index.match(request.method, request.url.path) if self.index else None
+        attributes: dict[str, Any] = {
+            "http.request.method": request.method,
+            "url.path": request.url.path,
+            "server.address": request.url.host,
+        }
+        if matched:
+            attributes["ynab.operation"] = matched[0].name
+        with self.tracer.span(
+            f"{request.method} {matched[0].path if matched else request.url.path}",
+            kind=KIND_CLIENT,
+            attributes=attributes,
+        ) as span:
+            response = await self._inner.handle_async_request(request)
+            content = await response.aread()
+            span.attributes["http.response.status_code"] = response.status_code
+            span.attributes["http.response.body.size"] = len(content)
+            if response.status_code >= 500:
+                span.status = STATUS_ERROR
+            return response
+
+
+class TracingMiddleware(Middleware):
+    def __init__(self, tracer: Tracer) -> None:
+        self.tracer = tracer
+
+    async def on_call_tool(
+        self,
+        context: MiddlewareContext[mcp.types.CallToolRequestParams],
+        call_next: CallNext[mcp.types.CallToolRequestParams, ToolResult],
+    ) -> ToolResult:
+        name = context.message.name
+        with self.tracer.span(
+            f"tools/call {name}", kind=KIND_SERVER, attributes={"mcp.tool.name": name}
+        ):
+            return await call_next(context)
@@ -0,0 +1,307 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import random
+import re
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+import httpx
+
+
+def auth_namespace(authorization: str) -> str:
+    """Return a short, stable namespace for an Authorization header value.
+
+    Local state (mirrors, caches, in-flight calls, rate limits) is keyed by this
+    value so that data fetched with one token is never served to a request carrying
+    another. The raw token is never stored.
+    """
+    return hashlib.sha256(authorization.encode("utf-8")).hexdigest()[:16]
+
+
+def request_namespace(request: httpx.Request) -> str:
+    """Return the credentials namespace (see `auth_namespace`) of a request."""
+    return auth_namespace(request.headers.get("Authorization", ""))
+
+
+# Headers that describe the wire encoding of the original body, not its decoded bytes
+_HOP_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding"})
+
+_BUDGET_PATH_RE = re.compile(r"/budgets/(?P<budget_id>[^/]+)(?P<rest>/.*)?$")
+
+
+def budget_target(url: httpx.URL) -> tuple[str, str] | None:
+    """Return (budget_id, remainder) if the URL targets a budget-scoped path."""
+    m = _BUDGET_PATH_RE.search(url.path)
+    if not m:
+        return None
+    return m.group("budget_id"), (m.group("rest") or "")
+
+
+def replayable_headers(response: httpx.Response) -> list[tuple[str, str]]:
+    """Headers of a read response that remain valid for a copy built from its bytes."""
+    return [(k, v) for k, v in response.headers.items() if k.lower() not in _HOP_HEADERS]
+
+
+class WrappedTransport(httpx.AsyncBaseTransport):
+    """Base class for transports that decorate another transport.
+
+    Subclasses override `handle_async_request` and delegate to `self._inner`.
+    Closing the wrapper closes the wrapped transport.
+    """
+
+    def __init__(self, inner: httpx.AsyncBaseTransport) -> None:
+        self._inner = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._inner.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """A response body that calls `release` once, when it is closed."""
+
+    def __init__(
+        self, stream: httpx.AsyncByteStream, release: Callable[[], Awaitable[None]]
+    ) -> None:
+        self._stream = stream
+        self._release: Callable[[], Awaitable[None]] | None = release
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            release, self._release = self._release, None
+            if release is not None:
+                await release()
+
+
+class PooledTransport(httpx.AsyncBaseTransport):
+    """An `httpx.AsyncHTTPTransport` connection pool that follows the event loop.
+
+    Pooled connections belong to the loop that opened them. The server is built
+    under one `asyncio.run` and served under another, so the underlying transport
+    is created lazily in the running loop and replaced when the loop changes.
+    `aclose` drops the current pool; the next request opens a new one.
+    `aclose_when_idle` waits for responses still being read.
+    """
+
+    def __init__(self, **transport_kwargs: Any) -> None:
+        self._kwargs = transport_kwargs
+        self._transport: httpx.AsyncHTTPTransport | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._active = 0
+        self._close_when_idle = False
+
+    def _current(self) -> httpx.AsyncHTTPTransport:
+        loop = asyncio.get_running_loop()
+        if self._transport is None or self._loop is not loop:
+            # Connections of a previous loop cannot be reused (or closed) here
+            self._transport = httpx.AsyncHTTPTransport(**self._kwargs)
+            self._loop = loop
+        return self._transport
+
+    @property
+    def is_open(self) -> bool:
+        """Whether a pool exists for the running event loop."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        return self._transport is not None and self._loop is loop
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        transport = self._current()
+        self._active += 1
+        try:
+            response = await transport.handle_async_request(request)
+        except BaseException:
+            await self._release()
+            raise
+        if isinstance(response.stream, httpx.AsyncByteStream):
+            response.stream = _ReleasingStream(response.stream, self._release)
+        else:
+            await self._release()
+        return response
+
+    async def _release(self) -> None:
+        self._active -= 1
+        if self._active == 0 and self._close_when_idle:
+            self._close_when_idle = False
+            await self.aclose()
+
+    async def aclose(self) -> None:
+        transport, self._transport = self._transport, None
+        if transport is not None and self._loop is asyncio.get_running_loop():
+            await transport.aclose()
+
+    async def aclose_when_idle(self) -> None:
+        """Close now if no response is open, otherwise once the last one is closed."""
+        if self._active:
+            self._close_when_idle = True
+        else:
+            await self.aclose()
+
+
+# Methods whose repetition has no additional effect on the server
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+# Request extension that marks a non-idempotent request as safe to replay (e.g. a
+# transactions POST whose every entry carries an import_id)
+IDEMPOTENT_EXTENSION = "ynab_mcp.idempotent"
+# Response header in which YNAB reports quota use as `used/limit`
+RATE_LIMIT_HEADER = "X-Rate-Limit"
+
+
+def _retry_after_seconds(response: httpx.Response) -> float | None:
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+class RetryTransport(WrappedTransport):
+    """Retry transient upstream failures with jittered exponential backoff.
+
+    - 429/5xx responses and read-side transport errors are retried only for
+      idempotent methods, or when the request carries an `Idempotency-Key` header
+      or the `IDEMPOTENT_EXTENSION` extension.
+    - Connection failures are retried for any method, since nothing was sent.
+
+    `Retry-After` is honored when present; a wait longer than `max_retry_after`
+    returns the response instead of blocking on it.
+    """
+
+    def __init__(
+        self,
+        inner: httpx.AsyncBaseTransport,
+        *,
+        max_retries: int = 2,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        max_retry_after: float = 60.0,
+    ) -> None:
+        super().__init__(inner)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_retry_after = max_retry_after
+
+    @staticmethod
+    def _replayable(request: httpx.Request) -> bool:
+        return (
+            request.method in IDEMPOTENT_METHODS
+            or "Idempotency-Key" in request.headers
+            or bool(request.extensions.get(IDEMPOTENT_EXTENSION))
+        )
+
+    def _backoff(self, attempt: int) -> float:
+        # "Full jitter": spreads retries from concurrent callers apart
+        return random.uniform(0.0, min(self.backoff_max, self.backoff_base * (2**attempt)))
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        while True:
+            try:
+                response = await self._inner.handle_async_request(request)
+            except (httpx.ConnectError, httpx.ConnectTimeout):
+                if attempt >= self.max_retries:
+                    raise
+            except (httpx.ReadTimeout, httpx.ReadError, httpx.RemoteProtocolError):
+                if attempt >= self.max_retries or not self._replayable(request):
+                    raise
+            else:
+                status = response.status_code
+                if (
+                    attempt >= self.max_retries
+                    or status not in RETRYABLE_STATUS
+                    or not self._replayable(request)
+                ):
+                    return response
+                delay = _retry_after_seconds(response)
+                if delay is None:
+                    delay = self._backoff(attempt)
+                if delay > self.max_retry_after:
+                    return response
+                await response.aclose()
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+
+            await asyncio.sleep(self._backoff(attempt))
+            attempt += 1
+
+_Flight = tuple[int, list[tuple[str, str]], bytes, dict[str, Any]]
+
+
+class SingleFlightTransport(WrappedTransport):
+    """Coalesce identical concurrent GETs into one upstream request.
+
+    Requests are keyed on credentials namespace + method + full URL (including the
+    query string). The first caller performs the request; callers arriving while
+    it is in flight wait for it and receive their own copy of the response.
+    """
+
+    def __init__(self, inner: httpx.AsyncBaseTransport) -> None:
+        super().__init__(inner)
+        self._flights: dict[tuple[str, str, str], asyncio.Future[_Flight]] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method != "GET":
+            return await self._inner.handle_async_request(request)
+
+        key = (request_namespace(request), request.method, str(request.url))
+        flight = self._flights.get(key)
+        if flight is not None:
+            try:
+                status, headers, content, extensions = await asyncio.shield(flight)
+            except asyncio.CancelledError:
+                if flight.cancelled():
+                    # The leading caller was cancelled; make the request ourselves
+                    return await self.handle_async_request(request)
+                raise
+            return httpx.Response(
+                status,
+                headers=headers,
+                content=content,
+                request=request,
+                extensions=extensions,
+            )
+
+        flight = asyncio.get_running_loop().create_future()
+        self._flights[key] = flight
+        try:
+            response = await self._inner.handle_async_request(request)
+            content = await response.aread()
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except BaseException as exc:
+            flight.set_exception(exc)
+            # Mark retrieved so a flight without followers does not log a warning
+            flight.exception()
+            raise
+        finally:
+            self._flights.pop(key, None)
+
+        flight.set_result(
+            (response.status_code, replayable_headers(response), content, dict(response.extensions))
+        )
+        return response